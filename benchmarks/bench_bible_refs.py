@@ -0,0 +1,83 @@
+"""
+Links/second of biblehub_link over every bible ref in the data/ corpus (edge refs and [[bible:...]]
+links in descriptions and footnotes), against the previous split-based implementation.
+
+    uv run -m benchmarks.bench_bible_refs [--data-dir data] [--repeat 20]
+"""
+import argparse
+import time
+from whitetreebible.connections.md_generator import LINK_RE
+from whitetreebible.connections.models import bible_ref
+from whitetreebible.connections.models.edge_model import EdgeModel
+from whitetreebible.connections.models.node_model import NodeModelCollection
+from whitetreebible.connections.settings import DATA_DIR
+from benchmarks.common import print_table
+
+
+def legacy_biblehub_link(ref: str) -> str:
+    """MdFormatters.biblehub_link as it was: split on the first space and rebuild the url per call."""
+    try:
+        book, chapterverse = ref.split(' ', 1)
+        book_url = book.lower().replace(' ', '_')
+        if book_url == 'psalm':
+            book_url = 'psalms'
+        if ':' in chapterverse:
+            chapter, verse = chapterverse.split(':')
+            verse = '' if '-' in verse else f"-{verse}"
+        else:
+            chapter = chapterverse
+            verse = ''
+        url = f"https://biblehub.com/context/{book_url}/{chapter}{verse}.htm"
+        return f"[{ref}]({url}){{:target=\"_blank\"}}"
+    except Exception:
+        return ref
+
+
+def corpus_refs(data_dir):
+    refs = []
+    for node in NodeModelCollection(data_dir).get_nodes():
+        for edge in node.edges:
+            refs.extend(ref[len("bible:"):] for ref in EdgeModel.parse_refs(edge.refs)["bible"])
+        texts = list(node.description.values()) + list((node.footnotes or {}).values())
+        for text in texts:
+            if isinstance(text, str):
+                refs.extend(m.group(1) for m in LINK_RE.finditer(text) if m.group(1))
+    return refs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    refs = corpus_refs(args.data_dir)
+    changed = [ref for ref in refs if legacy_biblehub_link(ref) != bible_ref.biblehub_link(ref)]
+    unparsed = [ref for ref in set(refs) if bible_ref.parse_bible_ref(ref) is None]
+
+    def uncached(ref):
+        parsed = bible_ref.parse_bible_ref.__wrapped__(ref)
+        return ref if parsed is None else f"[{ref}]({parsed.url}){{:target=\"_blank\"}}"
+
+    rows = []
+    for label, fn in (
+        ("split per call (legacy)", legacy_biblehub_link),
+        ("parser, no cache", uncached),
+        ("parser, cached links", bible_ref.biblehub_link),
+    ):
+        for ref in refs:
+            fn(ref)
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            for ref in refs:
+                fn(ref)
+        elapsed = time.perf_counter() - t0
+        rows.append([label, len(refs), f"{elapsed / (args.repeat * len(refs)) * 1e6:.2f}", f"{len(refs) * args.repeat / elapsed:,.0f}"])
+    print_table(["implementation", "refs", "us/ref", "links/s"], rows)
+    print(f"\n{len(set(refs))} distinct refs, {len(unparsed)} unparseable, {len(changed)} rendered differently from legacy")
+    for ref in sorted(set(changed))[:10]:
+        print(f"  {ref!r}: {legacy_biblehub_link(ref)} -> {bible_ref.biblehub_link(ref)}")
+
+
+if __name__ == "__main__":
+    main()
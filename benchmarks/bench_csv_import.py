@@ -0,0 +1,136 @@
+"""
+import_external_to_yml.main on a large synthetic CSV: the NodeStore write-back (each node parsed
+once, dirty nodes written at the end) against the importer's I/O before it, replayed by PerRowStore
+(every lookup parses the node's file again, every row rewrites its source and target files).
+Rows link nodes of a synthetic corpus (benchmarks.synthetic) with a heavy tail, so a few nodes
+appear in hundreds of rows. Both runs start from a copy of the same corpus and must leave
+byte-identical YAML files behind.
+
+    uv run -m benchmarks.bench_csv_import [--nodes 2000] [--rows 5000] [--flush-every 0 1000]
+"""
+import argparse
+import filecmp
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from whitetreebible.connections import import_external_to_yml
+from whitetreebible.connections.import_external_to_yml import NodeDirectory, NodeStore, get_node_yaml_path
+from whitetreebible.connections.logger import log
+from whitetreebible.connections.models.edge_type import EdgeType
+from whitetreebible.connections.models.node_model import NodeModel, NodeModelCollection
+from benchmarks.common import build_db, print_table
+from benchmarks.synthetic import write_corpus
+
+EDGE_TYPES = [EdgeType.PARENT_OF, EdgeType.CHILD_OF, EdgeType.MARRIED_TO, EdgeType.ASSOCIATED_WITH, EdgeType.RESIDENT_OF]
+REFS = ["Genesis 4:26", "Genesis 5:6", "1 Chronicles 1:1", "Luke 3:38"]
+
+
+class PerRowStore(NodeStore):
+    """The importer's I/O before NodeStore."""
+    def get(self, node_type, node_id):
+        path = get_node_yaml_path(node_type, node_id)
+        if os.path.exists(path):
+            self.nodes[path] = NodeModel.from_yaml_file(path)
+        return self.nodes.get(path), path
+
+    def add(self, node, path):
+        self.nodes[path] = node
+
+    def mark_dirty(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.nodes[path].to_yaml())
+
+    def flush(self):
+        return 0
+
+
+def write_csv(path: str, nodes: list[NodeModel], n_rows: int, seed: int = 0):
+    rng = random.Random(seed)
+    # 1/rank weights: the first nodes show up in hundreds of rows, most in a few
+    weights = [1 / (rank + 1) for rank in range(len(nodes))]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("source,edge_type,target,ref_bible,ref_footnote_anchor,ref_footnote_text\n")
+        for _ in range(n_rows):
+            source, target = rng.choices(nodes, weights=weights, k=2)
+            if source is target:
+                continue
+            f.write(f"{source.link},{rng.choice(EDGE_TYPES).value},{target.link},{rng.choice(REFS)},,\n")
+
+
+def run_import(data_dir: str, db_path: str, csv_path: str, store: NodeStore, flush_every: int) -> tuple[float, int, int]:
+    """Seconds, YAML parses and YAML writes of one import."""
+    import_external_to_yml.DATA_DIR = data_dir
+    import_external_to_yml._node_directory = NodeDirectory.load(db_path=db_path, data_dir=data_dir)
+    import_external_to_yml._node_store = store
+    import_external_to_yml._disambig_cache.clear()
+    import_external_to_yml._name_matches_to_add.clear()
+    counts = Counter()
+    from_yaml_file, to_yaml = NodeModel.from_yaml_file.__func__, NodeModel.to_yaml
+
+    def counted_from_yaml_file(cls, path):
+        counts["parse"] += 1
+        return from_yaml_file(cls, path)
+
+    def counted_to_yaml(self, file_path=None):
+        counts["write"] += 1
+        return to_yaml(self, file_path)
+
+    NodeModel.from_yaml_file, NodeModel.to_yaml = classmethod(counted_from_yaml_file), counted_to_yaml
+    sys.argv = ["import_external_to_yml", csv_path] + (["--flush-every", str(flush_every)] if flush_every else [])
+    try:
+        t0 = time.perf_counter()
+        import_external_to_yml.main()
+        return time.perf_counter() - t0, counts["parse"], counts["write"]
+    finally:
+        NodeModel.from_yaml_file, NodeModel.to_yaml = classmethod(from_yaml_file), to_yaml
+
+
+def same_files(a: str, b: str) -> bool:
+    cmp = filecmp.dircmp(a, b)
+    if cmp.left_only or cmp.right_only:
+        return False
+    _, mismatch, errors = filecmp.cmpfiles(a, b, cmp.common_files, shallow=False)
+    return not mismatch and not errors and all(same_files(os.path.join(a, d), os.path.join(b, d)) for d in cmp.common_dirs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--flush-every", type=int, nargs="+", default=[0, 1000])
+    args = parser.parse_args()
+    log.setLevel(logging.WARNING)
+    # rows name nodes that exist, the importer asks which one is meant: take the existing node
+    import_external_to_yml.inquirer.list_input = lambda message, choices, default: choices[0][1]
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_csv_import_")
+    corpus = os.path.join(tmp_dir, "corpus")
+    db_path = os.path.join(tmp_dir, "atlas.db")
+    write_corpus(corpus, args.nodes)
+    build_db(corpus, db_path).close()
+    nodes = NodeModelCollection(corpus).get_nodes()
+    csv_path = os.path.join(tmp_dir, "edges.csv")
+    write_csv(csv_path, nodes, args.rows)
+
+    rows = []
+    runs = [("per row (before)", PerRowStore, 0)] + [(f"NodeStore, flush every {n} rows" if n else "NodeStore, flush at end", NodeStore, n) for n in args.flush_every]
+    results = {}
+    for label, store_cls, flush_every in runs:
+        data_dir = os.path.join(tmp_dir, f"data_{len(results)}")
+        shutil.copytree(corpus, data_dir)
+        seconds, parses, writes = run_import(data_dir, db_path, csv_path, store_cls(), flush_every)
+        results[label] = (data_dir, seconds)
+        rows.append([label, args.rows, parses, writes, f"{seconds:.2f}", f"{results['per row (before)'][1] / seconds:.1f}x"])
+    before_dir = results["per row (before)"][0]
+    for label, (data_dir, _) in results.items():
+        assert same_files(before_dir, data_dir), f"{label} wrote different YAML"
+    print_table(["store", "csv rows", "yaml parses", "yaml writes", "s", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Size of the edges table and row decode throughput with edge types stored as integer codes
+(schema version 3) against the previous layout with the hyphenated type string in every row.
+Both databases hold the data/ corpus and are vacuumed before measuring.
+
+    uv run -m benchmarks.bench_edge_codes [--data-dir data] [--repeat 50]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from whitetreebible.connections.models.edge_model import EdgeModel
+from whitetreebible.connections.models.edge_type import EdgeType
+from whitetreebible.connections.sqlite_db import INDEXES
+from whitetreebible.connections.settings import DATA_DIR
+from benchmarks.common import build_db, print_table
+
+
+def legacy_from_row(row: tuple) -> EdgeModel:
+    """EdgeModel.from_row as it was: a dict per row and an EdgeType(value) lookup."""
+    source, target, etype = row
+    return EdgeModel({"source": source, "target": target, "type": EdgeType(etype), "refs": []})
+
+
+def build_legacy_copy(db, path: str):
+    """Text typed edges table with the same indexes, the layout before the edge_types table."""
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE edges (id INTEGER PRIMARY KEY AUTOINCREMENT, source TEXT, target TEXT, type TEXT)")
+    conn.executemany("INSERT INTO edges (id, source, target, type) VALUES (?, ?, ?, ?)",
+                     db.conn.execute("SELECT id, source, target, type FROM edges_named"))
+    for statement in INDEXES.values():
+        conn.execute(statement)
+    conn.commit()
+    return conn
+
+
+def edges_bytes(conn) -> int:
+    """Bytes used by the edges table and its indexes (dbstat), or the whole file if dbstat is not compiled in."""
+    conn.execute("VACUUM")
+    try:
+        return conn.execute(
+            "SELECT SUM(pgsize) FROM dbstat WHERE name = 'edges' OR name IN ({})".format(",".join("?" * len(INDEXES))),
+            list(INDEXES),
+        ).fetchone()[0]
+    except sqlite3.OperationalError:
+        return conn.execute("PRAGMA page_count").fetchone()[0] * conn.execute("PRAGMA page_size").fetchone()[0]
+
+
+def decode_rate(conn, decode, repeat: int) -> tuple[float, float]:
+    """(fetch rows/s, fetch + decode rows/s) over every edge row."""
+    query = "SELECT source, target, type FROM edges"
+    rows = conn.execute(query).fetchall()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        conn.execute(query).fetchall()
+    fetch = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for row in conn.execute(query):
+            decode(row)
+    both = time.perf_counter() - t0
+    return len(rows) * repeat / fetch, len(rows) * repeat / both
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = build_db(args.data_dir, os.path.join(tmp, "codes.db"))
+        legacy = build_legacy_copy(db, os.path.join(tmp, "legacy.db"))
+        n_edges = db.conn.execute("SELECT COUNT(*) FROM edges").fetchone()[0]
+        assert sorted(map(legacy_from_row, legacy.execute("SELECT source, target, type FROM edges")), key=repr) == \
+            sorted(map(EdgeModel.from_row, db.conn.execute("SELECT source, target, type FROM edges")), key=repr)
+
+        rows = []
+        for label, conn, decode in (
+            ("type string, EdgeType(value)", legacy, legacy_from_row),
+            ("type string, from_row", legacy, EdgeModel.from_row),
+            ("integer code, from_row", db.conn, EdgeModel.from_row),
+        ):
+            size = edges_bytes(conn)
+            fetch, decoded = decode_rate(conn, decode, args.repeat)
+            rows.append([label, n_edges, f"{size / 1024:.0f}", f"{size / n_edges:.1f}", f"{fetch:,.0f}", f"{decoded:,.0f}"])
+        legacy.close()
+        db.close()
+    print_table(["layout / decode", "edges", "KiB", "bytes/edge", "fetch rows/s", "decoded rows/s"], rows)
+
+
+if __name__ == "__main__":
+    main()
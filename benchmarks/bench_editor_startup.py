@@ -0,0 +1,111 @@
+"""
+Startup of the interactive editor: a fresh ManualEditor up to the results of its first search, on a
+synthetic corpus (benchmarks.synthetic) imported into a file-backed db. Compares the node catalogue
+as get_all_nodes used to build it (SELECT DISTINCT id, type, then select_name and a parse of the
+node's YAML file for name_disambiguous, per node) against SqliteDB.select_nodes, and times the first
+search for a substring query (answered by search_nodes alone) and a typo (which also needs get_all_nodes
+and a NodeSearchIndex).
+
+    uv run -m benchmarks.bench_editor_startup [--nodes 1000 10000 50000] [--repeat 3]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from whitetreebible.connections import import_external_to_yml
+from whitetreebible.connections.import_external_to_yml import get_node_yaml_path
+from whitetreebible.connections.manual_editor import ManualEditor, NodeInfo
+from whitetreebible.connections.models.node_model import NodeModel
+from whitetreebible.connections.node_search import NodeSearchIndex
+from benchmarks.common import QueryCounter, build_db, print_table
+from benchmarks.synthetic import write_corpus
+
+
+def legacy_get_all_nodes(editor: ManualEditor) -> list[NodeInfo]:
+    """ManualEditor.get_all_nodes before select_nodes."""
+    nodes = []
+    cur = editor.db.conn.cursor()
+    cur.execute("SELECT DISTINCT id, type FROM nodes")
+    for node_id, node_type in cur.fetchall():
+        name = editor.db.select_name(node_type, node_id, "en") or node_id
+        yaml_path = get_node_yaml_path(node_type, node_id)
+        name_disamb = ""
+        if os.path.exists(yaml_path):
+            node = NodeModel.from_yaml_file(yaml_path)
+            name_disamb = node.name_disambiguous.get('en', '')
+        nodes.append(NodeInfo(type=node_type, id=node_id, name=name, name_disambiguous=name_disamb or name))
+    return sorted(nodes, key=lambda x: x.name.lower())
+
+
+def legacy_catalogue(db_path: str) -> list[NodeInfo]:
+    with ManualEditor(db_path=db_path) as editor:
+        return legacy_get_all_nodes(editor)
+
+
+def catalogue(db_path: str) -> list[NodeInfo]:
+    with ManualEditor(db_path=db_path) as editor:
+        return editor.get_all_nodes()
+
+
+def legacy_first_search(db_path: str, query: str) -> list[NodeInfo]:
+    with ManualEditor(db_path=db_path) as editor:
+        return NodeSearchIndex(legacy_get_all_nodes(editor)).search(query)
+
+
+def first_search(db_path: str, query: str) -> list[NodeInfo]:
+    with ManualEditor(db_path=db_path) as editor:
+        return editor.fuzzy_search_nodes(query)
+
+
+def median_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = []
+    for n_nodes in args.nodes:
+        tmp_dir = tempfile.mkdtemp(prefix="bench_editor_startup_")
+        data_dir = os.path.join(tmp_dir, "data")
+        db_path = os.path.join(tmp_dir, "atlas.db")
+        write_corpus(data_dir, n_nodes)
+        build_db(data_dir, db_path).close()
+        # get_node_yaml_path looks the files up under this module level directory
+        import_external_to_yml.DATA_DIR = data_dir
+
+        with ManualEditor(db_path=db_path) as editor:
+            with QueryCounter(editor.db.conn) as legacy_queries:
+                legacy = legacy_get_all_nodes(editor)
+            with QueryCounter(editor.db.conn) as queries:
+                nodes = editor.get_all_nodes()
+            assert nodes == legacy, "select_nodes catalogue differs from the YAML one"
+            # digits that more than a page of names contain, and a name with a letter dropped
+            substring = str(n_nodes // 20)
+            typo = f"Nde {n_nodes // 3}"
+            for query in (substring, typo):
+                assert editor.fuzzy_search_nodes(query) == NodeSearchIndex(legacy).search(query), query
+
+        catalogue_legacy = median_ms(lambda: legacy_catalogue(db_path), args.repeat)
+        catalogue_new = median_ms(lambda: catalogue(db_path), args.repeat)
+        rows.append(["get_all_nodes", n_nodes, "", f"{legacy_queries.count}", f"{queries.count}",
+                     f"{catalogue_legacy:.1f}", f"{catalogue_new:.1f}", f"{catalogue_legacy / catalogue_new:.0f}x"])
+        for kind, query in (("substring", substring), ("typo", typo)):
+            legacy_ms = median_ms(lambda: legacy_first_search(db_path, query), args.repeat)
+            new_ms = median_ms(lambda: first_search(db_path, query), args.repeat)
+            rows.append(["first search", n_nodes, f"{kind} {query!r}", "", "",
+                         f"{legacy_ms:.1f}", f"{new_ms:.1f}", f"{legacy_ms / new_ms:.0f}x"])
+    print_table(["step", "nodes", "query", "legacy queries", "queries", "legacy ms", "ms", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Stress test for MdFormatters.filter_edges on synthetic hubs: one node with N neighbours and a mix of
+reciprocal pairs (parent-of/child-of), symmetric pairs (married-to both ways), one-sided reciprocals,
+types without a reciprocal in both directions, and plain edges. Compared against the previous
+implementation, which looked up priorities with list.index and rebuilt a lookup dict per node pair.
+Both must keep the same edges in the same order.
+
+    uv run -m benchmarks.bench_filter_edges [--edges 1000 10000 50000] [--repeat 5]
+"""
+import argparse
+import logging
+import time
+from whitetreebible.connections.logger import log
+from whitetreebible.connections.md_generator import MdFormatters
+from whitetreebible.connections.models.edge_model import EdgeModel
+from whitetreebible.connections.models.edge_type import EdgeType, RECIPROCALS
+from benchmarks.common import print_table
+
+HUB = "person/hub"
+# per neighbour: (type, hub is source) for each edge between the hub and that neighbour
+PATTERNS = [
+    [(EdgeType.PARENT_OF, True), (EdgeType.CHILD_OF, False)],
+    [(EdgeType.MARRIED_TO, True), (EdgeType.MARRIED_TO, False)],
+    [(EdgeType.LED_BY, True)],
+    [(EdgeType.RELATED_TO, True), (EdgeType.RELATED_TO, False)],
+    [(EdgeType.MEMBER_OF, True), (EdgeType.RESIDENT_OF, False), (EdgeType.ANCESTOR_OF, True), (EdgeType.DESCENDANT_OF, False)],
+]
+
+
+def synthetic_hub(n_edges: int) -> set[EdgeModel]:
+    edges = set()
+    i = 0
+    while len(edges) < n_edges:
+        other = f"person/n{i:06d}"
+        for etype, outgoing in PATTERNS[i % len(PATTERNS)]:
+            source, target = (HUB, other) if outgoing else (other, HUB)
+            edges.add(EdgeModel({"source": source, "target": target, "type": etype.value}))
+        i += 1
+    return edges
+
+
+def legacy_filter_edges(formatters: MdFormatters, edges):
+    """filter_edges as it was, minus the per-edge log lines."""
+    edge_map = {}
+    for edge in edges:
+        key = tuple(sorted([edge.source, edge.target]))
+        if key not in edge_map:
+            edge_map[key] = []
+        edge_map[key].append(edge)
+    filtered_edges = []
+    arrows = []
+    reciprocal_priority_order = list(RECIPROCALS.keys())
+    for key, group in edge_map.items():
+        edge_lookup = {(e.type, e.source, e.target): e for e in group}
+        used = set()
+        for edge in group:
+            etype = edge.type
+            if etype in used:
+                continue
+            has_reciprocal = etype in RECIPROCALS
+            is_symmetric = RECIPROCALS.get(etype, None) == etype
+            if is_symmetric:
+                used.add(etype)
+                filtered_edges.append(edge)
+                arrows.append(formatters.get_arrow_for_edge(edge, symmetrical=True))
+            elif has_reciprocal:
+                reciprocal_edge = edge_lookup.get((RECIPROCALS.get(etype, None), edge.target, edge.source))
+                if reciprocal_edge:
+                    if reciprocal_priority_order.index(etype) < reciprocal_priority_order.index(reciprocal_edge.type):
+                        used.add(etype)
+                        used.add(reciprocal_edge.type)
+                        filtered_edges.append(edge)
+                        arrows.append(formatters.get_arrow_for_edge(edge, symmetrical=False))
+                    else:
+                        continue
+                else:
+                    used.add(etype)
+                    filtered_edges.append(edge)
+                    arrows.append(formatters.get_arrow_for_edge(edge, symmetrical=False))
+            elif edge_lookup.get((etype, edge.target, edge.source), None):
+                used.add(etype)
+                filtered_edges.append(edge)
+                arrows.append(formatters.get_arrow_for_edge(edge, symmetrical=True))
+            else:
+                used.add(etype)
+                filtered_edges.append(edge)
+                arrows.append(formatters.get_arrow_for_edge(edge, symmetrical=False))
+    return filtered_edges, arrows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--edges", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # the per-edge log lines are debug level now; keep both runs quiet
+    log.setLevel(logging.WARNING)
+    formatters = MdFormatters()
+    rows = []
+    for n_edges in args.edges:
+        # same order for both implementations, as format_graph_connections sorts before filtering
+        edges = sorted(synthetic_hub(n_edges), key=lambda e: (e.source, e.type.value, e.target))
+        expected = legacy_filter_edges(formatters, edges)
+        assert formatters.filter_edges(edges) == expected, "filter_edges output differs from the legacy implementation"
+        for label, fn in (
+            ("legacy", lambda: legacy_filter_edges(formatters, edges)),
+            ("priority table", lambda: formatters.filter_edges(edges)),
+        ):
+            t0 = time.perf_counter()
+            for _ in range(args.repeat):
+                fn()
+            elapsed = (time.perf_counter() - t0) / args.repeat
+            rows.append([label, len(edges), len(expected[0]), f"{elapsed * 1000:.2f}", f"{len(edges) / elapsed:,.0f}"])
+    print_table(["implementation", "edges", "kept", "ms", "edges/s"], rows)
+
+
+if __name__ == "__main__":
+    main()
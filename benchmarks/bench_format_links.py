@@ -0,0 +1,78 @@
+"""
+Rewrites/second of MdFormatters.format_links on the largest node pages of the data/ corpus,
+against the previous two-pass re.sub implementation with one name query per link.
+
+    uv run -m benchmarks.bench_format_links [--data-dir data] [--pages 20] [--repeat 50]
+"""
+import argparse
+import os
+import re
+import tempfile
+import time
+from whitetreebible.connections.md_generator import MdFormatters, LINK_RE
+from whitetreebible.connections.models.node_model import NodeModelCollection
+from whitetreebible.connections.profiling import profiler
+from whitetreebible.connections.settings import DATA_DIR
+from benchmarks.common import build_db, print_table
+
+
+def legacy_format_links(formatters: MdFormatters, db, md, lang="en"):
+    """format_links as it was: a re.sub per link kind and a select_name per internal link."""
+    def id_link(match):
+        page_id = match.group(1)
+        node_type, node_id = page_id.split('/')
+        name = db.conn.execute(
+            "SELECT name FROM nodes WHERE id = ? AND type = ? AND lang = ?", (node_id, node_type, lang)
+        ).fetchone()
+        return f"[{name[0] if name else page_id}](../../{page_id}/)"
+    response = re.sub(r"\[\[bible:([^\]]+)\]\]", lambda m: formatters.biblehub_link(m.group(1)), md)
+    return re.sub(r"\[\[([^\]:]+)\]\]", id_link, response)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = build_db(args.data_dir, os.path.join(tmp, "bench.db"))
+        formatters = MdFormatters()
+        nodes = sorted(NodeModelCollection(args.data_dir).get_nodes(), key=lambda n: len(n.edges), reverse=True)[:args.pages]
+        # the page text format_links sees in the formatter chain
+        pages = []
+        for node in nodes:
+            md = ""
+            for formatter in (formatters.format_header, formatters.format_description, formatters.format_associations):
+                md = formatter(db, node, md, "en")
+            pages.append((node, md))
+        links = sum(len(LINK_RE.findall(md)) for _, md in pages)
+
+        rows = []
+        for label, fn in (
+            ("two-pass, per-link query", lambda node, md: legacy_format_links(formatters, db, md)),
+            ("single pass, batched names", lambda node, md: formatters.format_links(db=db, node=node, md=md, lang="en")),
+        ):
+            for node, md in pages:
+                fn(node, md)  # warm the name cache
+            t0 = time.perf_counter()
+            for _ in range(args.repeat):
+                for node, md in pages:
+                    fn(node, md)
+            elapsed = time.perf_counter() - t0
+            rows.append([label, len(pages), links, f"{elapsed / (args.repeat * len(pages)) * 1e6:.0f}", f"{links * args.repeat / elapsed:,.0f}"])
+        # one more pass for the per-page counters, format_links keeps them while profiling only
+        profiler.enable()
+        for node, md in pages:
+            formatters.format_links(db=db, node=node, md=md, lang="en")
+        profiler.disable()
+        db.close()
+    print_table(["implementation", "pages", "links/pass", "us/page", "rewrites/s"], rows)
+    slowest = sorted(formatters.link_timings.items(), key=lambda kv: kv[1][1], reverse=True)[:5]
+    print("\nformat_links per-page counters (slowest pages):")
+    print_table(["page", "rewrites", "ms"], [[link, count, f"{seconds * 1000:.2f}"] for link, (count, seconds) in slowest])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Per query latency of ManualEditor.fuzzy_search_nodes at scale: the legacy linear scan (lowercase every
+field of every node, then sort) against NodeSearchIndex and SqliteDB.search_nodes (the FTS5 node_search
+table), on synthetic nodes named like data/'s.
+Queries cover each tier: exact names, short and long prefixes, substrings, typos and misses.
+The index must return the legacy results first, in the same order; search_nodes exactly the legacy results.
+
+    uv run -m benchmarks.bench_fuzzy_search [--nodes 1000 10000 100000] [--limit 10] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from whitetreebible.connections.manual_editor import NodeInfo
+from whitetreebible.connections.models.node_model import NodeModel
+from whitetreebible.connections.node_search import NodeSearchIndex, linear_search
+from whitetreebible.connections.sqlite_db import SqliteDB
+from benchmarks.common import print_table
+
+SYLLABLES = ["ab", "ra", "ham", "el", "i", "jah", "be", "th", "le", "hem", "na", "o", "mi", "ru", "ze", "ka", "dok", "sa", "mu", "yo", "ash", "ur"]
+TYPES = ["person", "place", "group", "object", "role", "concept"]
+
+
+def synthetic_nodes(n_nodes: int, seed: int = 0) -> list[NodeInfo]:
+    rng = random.Random(seed)
+    nodes = []
+    for i in range(n_nodes):
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        # about a third need disambiguating, like the son-of / of-place names in data/
+        disamb = f"{name} son of {rng.choice(SYLLABLES).capitalize()}{rng.choice(SYLLABLES)}" if rng.random() < 0.3 else name
+        nodes.append(NodeInfo(type=rng.choice(TYPES), id=f"{name.lower()}_{i}", name=name, name_disambiguous=disamb))
+    # get_all_nodes order
+    return sorted(nodes, key=lambda x: x.name.lower())
+
+
+def queries(nodes: list[NodeInfo]) -> dict[str, list[str]]:
+    rng = random.Random(1)
+    sample = rng.sample(nodes, 20)
+    return {
+        "exact": [n.name for n in sample[:5]],
+        "prefix 1-2": ["a", "z", "ab", "mu"],
+        "prefix 4+": [n.name[:4] for n in sample[5:10]],
+        "contains": [n.name[2:6] for n in sample[10:15]] + ["son of ka"],
+        "typo": [n.name[:3] + n.name[4:] for n in sample[15:20] if len(n.name) > 5],
+        "miss": ["qqq", "xylophone"],
+    }
+
+
+def load_db(db_path: str, nodes: list[NodeInfo]) -> SqliteDB:
+    db = SqliteDB(db_path)
+    with db.bulk_load():
+        db.insert_nodes_many(
+            NodeModel({"id": n.id, "type": n.type, "name": {"en": n.name}, "name_disambiguous": {"en": n.name_disambiguous}})
+            for n in nodes
+        )
+    return db
+
+
+def time_queries(fn, query_list: list[str], repeat: int) -> list[float]:
+    times = []
+    for query in query_list:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn(query)
+            times.append(time.perf_counter() - t0)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = []
+    tmp_dir = tempfile.mkdtemp(prefix="bench_fuzzy_search_")
+    for n_nodes in args.nodes:
+        nodes = synthetic_nodes(n_nodes)
+        t0 = time.perf_counter()
+        index = NodeSearchIndex(nodes)
+        build = time.perf_counter() - t0
+        rows.append(["index build", n_nodes, "", f"{build * 1000:.1f}", "", ""])
+        t0 = time.perf_counter()
+        db = load_db(os.path.join(tmp_dir, f"nodes_{n_nodes}.db"), nodes)
+        build = time.perf_counter() - t0
+        rows.append(["search_nodes load", n_nodes, "", f"{build * 1000:.1f}", "", ""])
+        for kind, query_list in queries(nodes).items():
+            for query in query_list:
+                expected = linear_search(nodes, query, args.limit)
+                assert index.search(query, args.limit)[:len(expected)] == expected, f"results differ for {query!r}"
+                found = [(row["type"], row["id"]) for row in db.search_nodes(query, limit=args.limit)]
+                assert found == [(n.type, n.id) for n in expected], f"search_nodes results differ for {query!r}"
+            legacy = time_queries(lambda q: linear_search(nodes, q, args.limit), query_list, args.repeat)
+            indexed = time_queries(lambda q: index.search(q, args.limit), query_list, args.repeat)
+            fts = time_queries(lambda q: db.search_nodes(q, limit=args.limit), query_list, args.repeat)
+            for label, times in (("legacy scan", legacy), ("index", indexed), ("search_nodes", fts)):
+                rows.append([label, n_nodes, kind, f"{statistics.median(times) * 1000:.3f}", f"{max(times) * 1000:.3f}",
+                             f"{statistics.median(legacy) / statistics.median(times):.0f}x" if label != "legacy scan" else ""])
+        db.close()
+    print_table(["implementation", "nodes", "queries", "median ms", "max ms", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
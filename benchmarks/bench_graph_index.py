@@ -0,0 +1,73 @@
+"""
+Traversal latency per backend on the data/ corpus: SqliteDB in bfs and recursive mode, and
+GraphIndex built from the db and from the parsed YAML. Every backend must return the same edges.
+
+    uv run -m benchmarks.bench_graph_index [--data-dir data] [--repeat 20]
+"""
+import argparse
+import os
+import tempfile
+import time
+from whitetreebible.connections.graph_index import GraphIndex
+from whitetreebible.connections.models.edge_type import EDGE_GROUPS_ASSOCIATIONS, EdgeGroups
+from whitetreebible.connections.models.node_model import NodeModelCollection
+from whitetreebible.connections.settings import DATA_DIR
+from benchmarks.common import build_db, print_table
+
+
+CASES = [
+    ("all, depth=1", dict(direction="both", types=None, max_depth=1)),
+    ("family, depth=1", dict(direction="both", types=EDGE_GROUPS_ASSOCIATIONS[EdgeGroups.FAMILY], max_depth=1)),
+    ("all, depth=None", dict(direction="both", types=None, max_depth=None)),
+]
+
+
+def mean_latency(fn, starts, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for start in starts:
+            fn(start)
+    return (time.perf_counter() - t0) / (repeat * len(starts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = build_db(args.data_dir, os.path.join(tmp, "bench.db"))
+        nodes = NodeModelCollection(args.data_dir).get_nodes()
+        t0 = time.perf_counter()
+        from_db = GraphIndex.from_db(db)
+        build_db_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        from_nodes = GraphIndex.from_nodes(nodes)
+        build_nodes_ms = (time.perf_counter() - t0) * 1000
+        print(f"GraphIndex build: from db {build_db_ms:.1f} ms, from nodes {build_nodes_ms:.1f} ms "
+              f"({len(from_db.links)} links, {len(from_db.edge_type)} edges)")
+
+        starts = [node.link for node in nodes[::10]]
+        backends = [
+            ("sqlite bfs", lambda s, kw: db.traverse_edges(s, mode="bfs", **kw)),
+            ("sqlite recursive", lambda s, kw: db.traverse_edges(s, mode="recursive", **kw)),
+            ("graph index (db)", lambda s, kw: from_db.traverse_edges(s, **kw)),
+            ("graph index (yaml)", lambda s, kw: from_nodes.traverse_edges(s, **kw)),
+        ]
+        rows = []
+        for label, kwargs in CASES:
+            expected = {s: db.traverse_edges(s, **kwargs) for s in starts}
+            for name, traverse in backends:
+                for s in starts:
+                    if traverse(s, kwargs) != expected[s]:
+                        raise SystemExit(f"{name} disagrees on {s} {label}")
+                repeat = args.repeat if kwargs["max_depth"] is not None else max(1, args.repeat // 10)
+                latency = mean_latency(lambda s: traverse(s, kwargs), starts, repeat)
+                rows.append([label, name, len(starts), f"{latency * 1e6:.0f}"])
+        db.close()
+    print_table(["case", "backend", "starts", "mean us"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Time loading the data/ corpus into a fresh file-backed sqlite db, once with the per-row
+insert_node/insert_edge calls (one commit each) and once with bulk_load + insert_*_many.
+
+    uv run -m benchmarks.bench_import [--data-dir data]
+"""
+import argparse
+import os
+import tempfile
+import time
+from whitetreebible.connections.models.node_model import NodeModelCollection
+from whitetreebible.connections.settings import DATA_DIR, SUPPORTED_LANGS
+from whitetreebible.connections.sqlite_db import SqliteDB
+from benchmarks.common import QueryCounter, print_table
+
+
+def load_per_row(db: SqliteDB, nodes):
+    for node in nodes:
+        for lang in SUPPORTED_LANGS:
+            db.insert_node(node, lang=lang)
+        for edge in node.edges:
+            db.insert_edge(node.type, node.id, edge)
+
+
+def load_bulk(db: SqliteDB, nodes):
+    with db.bulk_load():
+        for lang in SUPPORTED_LANGS:
+            db.insert_nodes_many(nodes, lang=lang)
+        db.insert_edges_many((node.type, node.id, edge) for node in nodes for edge in node.edges)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args()
+
+    nodes = NodeModelCollection(args.data_dir).get_nodes()
+    edges = sum(len(node.edges) for node in nodes)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, loader in (("per-row", load_per_row), ("bulk", load_bulk)):
+            db = SqliteDB(os.path.join(tmp, f"{label}.db"))
+            with QueryCounter(db.conn) as counter:
+                t0 = time.perf_counter()
+                loader(db, nodes)
+                elapsed = time.perf_counter() - t0
+            db.close()
+            rows.append([label, len(nodes), edges, f"{elapsed * 1000:.1f}", counter.count])
+    print_table(["path", "nodes", "edges", "ms", "statements"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Time MdGenerator.generate_all over the data/ corpus and count the sqlite connections it opens.
+--db-mode picks the database the generator reads from: the file itself, the file opened
+read-only, or an in-memory copy of it.
+
+    uv run -m benchmarks.bench_md_generator [--data-dir data] [--db-mode file readonly memory]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from whitetreebible.connections.md_generator import MdGenerator
+from whitetreebible.connections.settings import DATA_DIR
+from whitetreebible.connections.sqlite_db import SqliteDB
+from benchmarks.common import QueryCounter, build_db, print_table
+
+
+class ConnectCounter:
+    """Counts sqlite3.connect calls made while active."""
+    def __init__(self):
+        self.count = 0
+        self._connect = sqlite3.connect
+
+    def _counting_connect(self, *args, **kwargs):
+        self.count += 1
+        return self._connect(*args, **kwargs)
+
+    def __enter__(self):
+        sqlite3.connect = self._counting_connect
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        sqlite3.connect = self._connect
+
+
+def open_db(mode: str, db_path: str) -> SqliteDB:
+    if mode == "readonly":
+        return SqliteDB.open_readonly(db_path)
+    if mode == "memory":
+        return SqliteDB.open_in_memory(db_path)
+    return SqliteDB(db_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--db-mode", nargs="+", default=["file", "readonly", "memory"])
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        build_db(args.data_dir, db_path).close()
+        for mode in args.db_mode:
+            docs_dir = os.path.join(tmp, f"docs_{mode}")
+            with ConnectCounter() as connects:
+                db = open_db(mode, db_path)
+                generator = MdGenerator(db=db, data_dir=args.data_dir, docs_dir=docs_dir)
+                with QueryCounter(db.conn) as queries:
+                    t0 = time.perf_counter()
+                    generator.generate_all()
+                    elapsed = time.perf_counter() - t0
+                db.close()
+            pages = sum(len(files) for _, _, files in os.walk(docs_dir))
+            rows.append([mode, pages, f"{elapsed:.2f}", f"{pages / elapsed:.0f}", connects.count, queries.count])
+    print_table(["db mode", "pages", "seconds", "pages/s", "connections", "queries on db"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+tracemalloc numbers for the model objects: memory held by a full NodeModelCollection of the data/
+corpus (and by the node and edge objects alone, with the parsed YAML dicts already in memory), and
+the allocations and set-building time for the EdgeModels a traversal decodes from edge rows.
+
+    uv run -m benchmarks.bench_model_memory [--data-dir data] [--copies 20]
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from whitetreebible.connections.models.edge_model import EdgeModel
+from whitetreebible.connections.models.node_model import NodeModel, NodeModelCollection, load_yaml_file
+from whitetreebible.connections.settings import DATA_DIR
+from benchmarks.common import build_db, print_table
+
+
+def traced(fn):
+    """(result, bytes still allocated after fn, peak bytes during fn)"""
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--copies", type=int, default=20, help="edge rows are decoded this many times over")
+    args = parser.parse_args()
+
+    rows = []
+    collection, current, peak = traced(lambda: NodeModelCollection(args.data_dir))
+    n_nodes = len(collection.nodes)
+    n_edges = sum(len(node.edges) for node in collection.nodes)
+    rows.append(["NodeModelCollection(data/)", n_nodes, n_edges, f"{current / 1024:.0f}", f"{peak / 1024:.0f}", ""])
+
+    paths = collection._yaml_paths()
+    datas = [load_yaml_file(path) for path in paths]
+    nodes, current, peak = traced(lambda: [NodeModel(data) for data in datas])
+    rows.append(["NodeModel objects only", n_nodes, n_edges, f"{current / 1024:.0f}", f"{peak / 1024:.0f}", f"{current / (n_nodes + n_edges):.0f}"])
+    del nodes, datas
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = build_db(args.data_dir, os.path.join(tmp, "bench.db"))
+        edge_rows = db.conn.execute("SELECT source, target, type FROM edges").fetchall() * args.copies
+        db.close()
+    edges, current, peak = traced(lambda: [EdgeModel.from_row(row) for row in edge_rows])
+    rows.append(["EdgeModel.from_row", "", len(edge_rows), f"{current / 1024:.0f}", f"{peak / 1024:.0f}", f"{current / len(edge_rows):.0f}"])
+
+    t0 = time.perf_counter()
+    for _ in range(10):
+        edge_set = set(edges)
+        sum(1 for edge in edges if edge in edge_set)
+    set_seconds = (time.perf_counter() - t0) / 10
+    print_table(["load", "nodes", "edges", "KiB held", "KiB peak", "bytes/object"], rows)
+    print(f"\nset() of {len(edges)} edges plus a membership test each: {set_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Time NodeModelCollection with no cache, a cold cache, a warm cache, and a warm cache after one
+file changed.
+
+    uv run -m benchmarks.bench_node_cache [--data-dir data]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from whitetreebible.connections.models.node_model import NodeModelCollection
+from whitetreebible.connections.settings import DATA_DIR
+from benchmarks.common import print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # work on a copy so touching a file does not dirty the real corpus
+        data_dir = os.path.join(tmp, "data")
+        shutil.copytree(args.data_dir, data_dir)
+        cache_path = os.path.join(tmp, "nodes.cache")
+
+        def record(label, **kwargs):
+            t0 = time.perf_counter()
+            nodes = NodeModelCollection(data_dir, **kwargs).get_nodes()
+            rows.append([label, len(nodes), f"{(time.perf_counter() - t0) * 1000:.1f}"])
+
+        record("no cache")
+        record("cold cache", cache_path=cache_path)
+        record("warm cache", cache_path=cache_path)
+        victim = next(os.path.join(root, f) for root, _, files in os.walk(data_dir) for f in sorted(files))
+        with open(victim, "a", encoding="utf-8") as f:
+            f.write("\n")
+        record("warm cache, 1 changed", cache_path=cache_path)
+        rows.append(["cache size (KiB)", "", f"{os.path.getsize(cache_path) / 1024:.0f}"])
+    print_table(["run", "nodes", "ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
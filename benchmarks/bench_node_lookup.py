@@ -0,0 +1,95 @@
+"""
+Node lookups of import_external_to_yml on a synthetic corpus (benchmarks.synthetic) imported into a
+file-backed db: lookup_similar_nodes as it used to run for every CSV row (open the db, read every node
+of the type, then list and parse every YAML file of the type) against a NodeDirectory loaded once.
+An import calls it for the source and target of every row, the last column projects a CSV of --rows rows.
+
+    uv run -m benchmarks.bench_node_lookup [--nodes 1000 10000] [--lookups 5] [--rows 5000]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from whitetreebible.connections import import_external_to_yml
+from whitetreebible.connections.import_external_to_yml import NodeDirectory, _disambiguous_name
+from whitetreebible.connections.models.node_model import NodeModel
+from whitetreebible.connections.sqlite_db import SqliteDB
+from benchmarks.common import build_db, print_table
+from benchmarks.synthetic import write_corpus
+
+
+def legacy_lookup(db_path: str, data_dir: str, node_type: str, name: str) -> list:
+    """lookup_similar_nodes before NodeDirectory, less its logging."""
+    results = []
+    name_norm = name.strip().lower()
+    seen_ids = set()
+    db = SqliteDB(db_path)
+    cur = db.conn.cursor()
+    cur.execute("SELECT id, type, name FROM nodes WHERE type = ?", (node_type,))
+    for node_id, ntype, n_en in cur.fetchall():
+        if name_norm == str(node_id).strip().lower() or name_norm == str(n_en).strip().lower():
+            path = os.path.join(data_dir, ntype, f"{node_id}.yml")
+            n_disamb = _disambiguous_name(NodeModel.from_yaml_file(path), n_en) if os.path.exists(path) else n_en or f"{ntype}/{node_id}"
+            results.append({"id": node_id, "type": ntype, "name": n_en, "name_disambiguous": n_disamb})
+            seen_ids.add((ntype, str(node_id).strip().lower()))
+    type_dir = os.path.join(data_dir, node_type.lower())
+    for fname in os.listdir(type_dir):
+        if fname.endswith('.yml') or fname.endswith('.yaml'):
+            node_id = os.path.splitext(fname)[0].strip().lower()
+            node = NodeModel.from_yaml_file(os.path.join(type_dir, fname))
+            n_en = node.name.get('en', '')
+            if (name_norm == node_id or name_norm == n_en.strip().lower()) and (node.type, node_id) not in seen_ids:
+                results.append({"id": node.id, "type": node.type, "name": n_en, "name_disambiguous": _disambiguous_name(node, n_en)})
+                seen_ids.add((node.type, node_id))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--lookups", type=int, default=5, help="legacy lookups to time per corpus")
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    rows = []
+    for n_nodes in args.nodes:
+        tmp_dir = tempfile.mkdtemp(prefix="bench_node_lookup_")
+        data_dir = os.path.join(tmp_dir, "data")
+        db_path = os.path.join(tmp_dir, "atlas.db")
+        write_corpus(data_dir, n_nodes)
+        build_db(data_dir, db_path).close()
+        import_external_to_yml.DATA_DIR = data_dir
+
+        db = SqliteDB(db_path)
+        catalogue = db.select_nodes("en")
+        db.close()
+        rng = random.Random(0)
+        # names of existing nodes, upper cased like CSV rows often are, and names nobody has
+        queries = [(node_type, name.upper()) for node_type, _, name, _ in rng.sample(catalogue, args.lookups)]
+        queries += [("person", f"Nobody {i}") for i in range(args.lookups)]
+
+        t0 = time.perf_counter()
+        directory = NodeDirectory.load(db_path=db_path, data_dir=data_dir)
+        load = time.perf_counter() - t0
+        legacy_times, directory_times = [], []
+        for node_type, name in queries:
+            t0 = time.perf_counter()
+            expected = legacy_lookup(db_path, data_dir, node_type, name)
+            legacy_times.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            found = directory.lookup(node_type, name)
+            directory_times.append(time.perf_counter() - t0)
+            assert sorted(found, key=lambda r: r["id"]) == sorted(expected, key=lambda r: r["id"]), f"lookups differ for {name!r}"
+
+        legacy_ms = statistics.median(legacy_times) * 1000
+        directory_ms = statistics.median(directory_times) * 1000
+        lookups = 2 * args.rows
+        rows.append(["legacy lookup", n_nodes, "", f"{legacy_ms:.3f}", f"{legacy_ms * lookups / 1000:.1f}"])
+        rows.append(["NodeDirectory", n_nodes, f"{load * 1000:.1f}", f"{directory_ms:.4f}", f"{load + directory_ms * lookups / 1000:.2f}"])
+    print_table(["implementation", "nodes", "load ms", "median ms per lookup", f"s for {args.rows} rows"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Print EXPLAIN QUERY PLAN for the hot edge queries on an unversioned (pre-index) database
+and again after SqliteDB has migrated it to the current schema.
+
+    uv run -m benchmarks.bench_query_plans
+"""
+import os
+import sqlite3
+import tempfile
+from whitetreebible.connections.models.edge_type import EDGE_GROUPS_ASSOCIATIONS, EdgeGroups
+from whitetreebible.connections.sqlite_db import SqliteDB, SCHEMA_MIGRATIONS
+
+
+FAMILY = [t.code for t in EDGE_GROUPS_ASSOCIATIONS[EdgeGroups.FAMILY]]
+HOT_QUERIES = [
+    ("select_edges", "SELECT source, target, type FROM edges WHERE source = ?", ("person/abraham",)),
+    ("traverse out, typed", "SELECT source, target, type FROM edges WHERE source = ? AND type IN ({})".format(",".join("?" * len(FAMILY))), ("person/abraham", *FAMILY)),
+    ("traverse in, typed", "SELECT source, target, type FROM edges WHERE target = ? AND type IN ({})".format(",".join("?" * len(FAMILY))), ("person/abraham", *FAMILY)),
+    ("rename target lookup", "UPDATE edges SET target = ? WHERE target = ?", ("person/abraham2", "person/abraham")),
+    ("select_name", "SELECT name FROM nodes WHERE id = ? AND type = ? AND lang = ?", ("abraham", "person", "en")),
+]
+
+
+def print_plans(conn, heading):
+    print(f"== {heading} (user_version={conn.execute('PRAGMA user_version').fetchone()[0]})")
+    for label, sql, params in HOT_QUERIES:
+        plan = "; ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+        print(f"  {label:<22} {plan}")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "legacy.db")
+        conn = sqlite3.connect(path)
+        # the schema as it was before versioning: tables only
+        for statement in SCHEMA_MIGRATIONS[0][1]:
+            conn.execute(statement)
+        conn.commit()
+        print_plans(conn, "before migration")
+        conn.close()
+
+        db = SqliteDB(path)
+        print_plans(db.conn, "after migration")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Peak RSS of the eager (get_nodes) and streaming (iter_nodes) paths on a synthetic corpus:
+loading the collection, importing it into sqlite, and rendering markdown with MdGenerator.
+The "cached" stages read the nodes through a warm node data sidecar (cache_path), the way
+import_yml_to_db and md_generator run. Each stage runs in its own python process so its
+ru_maxrss is its own.
+
+    uv run -m benchmarks.bench_streaming [--nodes 100000] [--stages load import md] [--data-dir DIR]
+"""
+import argparse
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.common import print_table
+
+STAGES = {
+    "load": ["baseline", "load eager", "load stream", "load eager cached", "load stream cached"],
+    "import": ["import eager", "import stream", "import stream cached"],
+    "md": ["md eager", "md stream", "md stream cached"],
+}
+CACHE_NAME = "nodes.cache"
+
+
+def run_stage(stage: str, data_dir: str, tmp: str) -> dict:
+    """Runs inside the child process."""
+    from whitetreebible.connections.import_yml_to_db import load_nodes
+    from whitetreebible.connections.logger import log
+    from whitetreebible.connections.md_generator import MdGenerator
+    from whitetreebible.connections.models.node_model import NodeModelCollection
+    from whitetreebible.connections.sqlite_db import SqliteDB
+    log.setLevel(logging.WARNING)
+    cache_path = None
+    # the db and docs of a stage are its own, named after the full stage
+    slug = stage.replace(' ', '_')
+    if stage.endswith(" cached"):
+        stage = stage.removesuffix(" cached")
+        cache_path = os.path.join(tmp, CACHE_NAME)
+    t0 = time.perf_counter()
+    count = 0
+    if stage == "load eager":
+        count = sum(len(node.edges) for node in NodeModelCollection(data_dir, cache_path=cache_path).get_nodes())
+    elif stage == "load stream":
+        count = sum(len(node.edges) for node in NodeModelCollection(data_dir, cache_path=cache_path, lazy=True).iter_nodes())
+    elif stage in ("import eager", "import stream"):
+        db = SqliteDB(os.path.join(tmp, f"{slug}.db"))
+        collection = NodeModelCollection(data_dir, cache_path=cache_path, lazy=True)
+        nodes = collection.get_nodes() if stage == "import eager" else collection.iter_nodes()
+        count = load_nodes(db, nodes)[1]
+        db.close()
+    elif stage in ("md eager", "md stream"):
+        db = SqliteDB.open_readonly(os.path.join(tmp, "corpus.db"))
+        nodes = NodeModelCollection(data_dir).get_nodes() if stage == "md eager" else None
+        docs_dir = os.path.join(tmp, f"docs_{slug}")
+        MdGenerator(db=db, data_dir=data_dir, docs_dir=docs_dir, nodes=nodes, cache_path=cache_path).generate_all()
+        db.close()
+        count = sum(len(files) for _, _, files in os.walk(docs_dir))
+    # ru_maxrss is KiB on linux
+    return {"seconds": time.perf_counter() - t0, "count": count, "rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--data-dir", help="use this corpus instead of writing a synthetic one")
+    parser.add_argument("--run-stage", help=argparse.SUPPRESS)
+    parser.add_argument("--tmp", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_stage:
+        print(json.dumps(run_stage(args.run_stage, args.data_dir, args.tmp)))
+        return
+
+    from benchmarks.synthetic import write_corpus
+    from whitetreebible.connections.import_yml_to_db import load_nodes
+    from whitetreebible.connections.models.node_model import NodeModelCollection
+    from whitetreebible.connections.sqlite_db import SqliteDB
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir
+        if not data_dir:
+            data_dir = os.path.join(tmp, "data")
+            write_corpus(data_dir, args.nodes)
+        # warm sidecar for the cached stages
+        for _ in NodeModelCollection(data_dir, cache_path=os.path.join(tmp, CACHE_NAME), lazy=True).iter_nodes():
+            pass
+        if "md" in args.stages:
+            db = SqliteDB(os.path.join(tmp, "corpus.db"))
+            load_nodes(db, NodeModelCollection(data_dir, lazy=True).iter_nodes())
+            db.close()
+        rows = []
+        for group in args.stages:
+            for stage in STAGES[group]:
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_streaming", "--run-stage", stage, "--data-dir", data_dir, "--tmp", tmp],
+                    check=True, capture_output=True, text=True,
+                )
+                result = json.loads(out.stdout.strip().splitlines()[-1])
+                rows.append([stage, result["count"], f"{result['seconds']:.1f}", f"{result['rss_kib'] / 1024:.0f}"])
+    print_table(["stage", "edges / pages", "seconds", "peak RSS MiB"], rows)
+
+
+if __name__ == "__main__":
+    main()
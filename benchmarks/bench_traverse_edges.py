@@ -0,0 +1,98 @@
+"""
+Compare the python BFS and the WITH RECURSIVE implementations of SqliteDB.traverse_edges
+on the full data/ corpus. Both must return the same edge set.
+The first table times a few start nodes, the second sums every node of the corpus as a start node,
+like md_generator walks them. The recursive query wins on deep traversals, at depth 1 the
+2 * (1 + degree) indexed SELECTs of the bfs are still faster than planning and running the CTE,
+which is why traverse_edges picks bfs for max_depth 1 or less (the "default" column).
+
+    uv run -m benchmarks.bench_traverse_edges [--data-dir data] [--repeat 3]
+"""
+import argparse
+import os
+import tempfile
+import time
+from whitetreebible.connections.models.edge_type import EDGE_GROUPS_ASSOCIATIONS, EdgeGroups
+from whitetreebible.connections.settings import DATA_DIR
+from benchmarks.common import QueryCounter, build_db, print_table
+
+
+START_NODES = ["person/abraham", "person/jacob", "person/noah", "place/canaan"]
+CASES = [
+    ("all, depth=None", dict(direction="both", types=None, max_depth=None)),
+    ("all, depth=1", dict(direction="both", types=None, max_depth=1)),
+    ("family, depth=None", dict(direction="both", types=EDGE_GROUPS_ASSOCIATIONS[EdgeGroups.FAMILY], max_depth=None)),
+    ("family, depth=1", dict(direction="both", types=EDGE_GROUPS_ASSOCIATIONS[EdgeGroups.FAMILY], max_depth=1)),
+    ("family, depth=2, out", dict(direction="out", types=EDGE_GROUPS_ASSOCIATIONS[EdgeGroups.FAMILY], max_depth=2)),
+]
+# the union of every edge group, as format_graphs_by_edge_group fetches a page's neighbourhood
+ALL_GROUP_TYPES = sorted({t for types in EDGE_GROUPS_ASSOCIATIONS.values() if types for t in types}, key=lambda t: t.value)
+ALL_NODES_CASES = [
+    ("all, depth=1", dict(direction="both", types=None, max_depth=1)),
+    ("family, depth=1", dict(direction="both", types=EDGE_GROUPS_ASSOCIATIONS[EdgeGroups.FAMILY], max_depth=1)),
+    ("edge groups, depth=1", dict(direction="both", types=ALL_GROUP_TYPES, max_depth=1)),
+    ("family, depth=2", dict(direction="both", types=EDGE_GROUPS_ASSOCIATIONS[EdgeGroups.FAMILY], max_depth=2)),
+]
+MODES = ["bfs", "recursive", None]
+
+
+def run(db, start, kwargs, mode, repeat):
+    with QueryCounter(db.conn) as counter:
+        edges = db.traverse_edges(start, mode=mode, **kwargs)
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        db.traverse_edges(start, mode=mode, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    return edges, best, counter.count
+
+
+def run_all(db, starts, kwargs, mode, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for start in starts:
+            db.traverse_edges(start, mode=mode, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = build_db(args.data_dir, os.path.join(tmp, "bench.db"))
+        rows = []
+        for start in START_NODES:
+            for label, kwargs in CASES:
+                results = {mode: run(db, start, kwargs, mode, args.repeat) for mode in MODES}
+                bfs_edges, bfs_time, bfs_queries = results["bfs"]
+                cte_edges, cte_time, cte_queries = results["recursive"]
+                if bfs_edges != cte_edges:
+                    raise SystemExit(f"Mismatch for {start} {label}: bfs={len(bfs_edges)} recursive={len(cte_edges)}")
+                rows.append([
+                    start, label, len(cte_edges),
+                    f"{bfs_time * 1000:.2f}", bfs_queries,
+                    f"{cte_time * 1000:.2f}", cte_queries,
+                    f"{results[None][1] * 1000:.2f}",
+                    f"{bfs_time / cte_time:.1f}x" if cte_time else "-",
+                ])
+        starts = [f"{t}/{i}" for t, i in db.conn.execute("SELECT DISTINCT type, id FROM nodes ORDER BY type, id")]
+        totals = []
+        for label, kwargs in ALL_NODES_CASES:
+            bfs_time, cte_time, default_time = (run_all(db, starts, kwargs, mode, args.repeat) for mode in MODES)
+            totals.append([
+                label, len(starts),
+                f"{bfs_time * 1000:.0f}", f"{cte_time * 1000:.0f}", f"{default_time * 1000:.0f}",
+                f"{bfs_time / cte_time:.2f}x",
+            ])
+        db.close()
+    print_table(["start", "case", "edges", "bfs ms", "bfs queries", "recursive ms", "recursive queries", "default ms", "recursive speedup"], rows)
+    print()
+    print_table(["case", "start nodes", "bfs ms", "recursive ms", "default ms", "recursive speedup"], totals)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Report files/second for loading the data/ corpus: the pure python SafeLoader, the libyaml
+CSafeLoader, and NodeModelCollection serial vs. process pool loading.
+
+    uv run -m benchmarks.bench_yaml_load [--data-dir data] [--workers 2 4 8]
+"""
+import argparse
+import os
+import time
+import yaml
+from whitetreebible.connections.models.node_model import NodeModelCollection, YamlLoader
+from whitetreebible.connections.settings import DATA_DIR
+from benchmarks.common import print_table
+
+
+def parse_all(paths, loader):
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            yaml.load(f, Loader=loader)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    collection = NodeModelCollection(args.data_dir)
+    paths = collection._yaml_paths()
+    expected = [node.link for node in collection.get_nodes()]
+    rows = []
+
+    def record(label, fn):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        rows.append([label, len(paths), f"{elapsed * 1000:.1f}", f"{len(paths) / elapsed:.0f}"])
+
+    record("parse, SafeLoader", lambda: parse_all(paths, yaml.SafeLoader))
+    if YamlLoader is not yaml.SafeLoader:
+        record("parse, CSafeLoader", lambda: parse_all(paths, YamlLoader))
+    record("collection, serial", lambda: NodeModelCollection(args.data_dir))
+    for workers in sorted(set(args.workers)):
+        def load():
+            nodes = NodeModelCollection(args.data_dir, workers=workers).get_nodes()
+            if [node.link for node in nodes] != expected:
+                raise SystemExit(f"Parallel load with {workers} workers returned a different order")
+        record(f"collection, {workers} workers", load)
+    print_table(["loader", "files", "ms", "files/s"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Shared helpers for the benchmark scripts. Run them from the repo root, e.g.
+    uv run -m benchmarks.bench_traverse_edges
+"""
+import os
+import time
+from contextlib import contextmanager
+from whitetreebible.connections.models.node_model import NodeModelCollection
+from whitetreebible.connections.settings import SUPPORTED_LANGS
+from whitetreebible.connections.sqlite_db import SqliteDB
+
+
+def build_db(data_dir: str, db_path: str) -> SqliteDB:
+    """Load every YAML node under data_dir into a fresh sqlite db at db_path."""
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    db = SqliteDB(db_path)
+    nodes = NodeModelCollection(data_dir).get_nodes()
+    with db.bulk_load():
+        for lang in SUPPORTED_LANGS:
+            db.insert_nodes_many(nodes, lang=lang)
+        db.insert_edges_many((node.type, node.id, edge) for node in nodes for edge in node.edges)
+    return db
+
+
+class QueryCounter:
+    """Counts statements sqlite executes on a connection via its trace callback."""
+    def __init__(self, conn):
+        self.conn = conn
+        self.count = 0
+
+    def _trace(self, statement):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        self.conn.set_trace_callback(self._trace)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.conn.set_trace_callback(None)
+
+
+@contextmanager
+def timed(results: dict, key: str):
+    start = time.perf_counter()
+    yield
+    results[key] = time.perf_counter() - start
+
+
+def print_table(headers: list[str], rows: list[list]):
+    widths = [max(len(str(x)) for x in col) for col in zip(headers, *rows)]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(str(x).ljust(w) for x, w in zip(row, widths)))
@@ -0,0 +1,228 @@
+"""
+Scaling suite: times each pipeline stage on synthetic corpora of a multiple of data/'s size and
+writes a JSON report (laid out like pytest-benchmark's) that --compare diffs against an earlier one.
+
+Stages: yaml_load (stream every file), import (load_nodes into a fresh db), traverse (depth 1 and 2
+around hubs and random nodes), generate_all (render a sample of pages), reciprocal_fixer (scan for
+missing reciprocals, no writes).
+
+    uv run -m benchmarks.suite [--scale 10 100] [--rounds 3] [--stages ...] [--json out.json] [--compare old.json]
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.common import print_table
+from benchmarks.synthetic import write_corpus
+
+# nodes in data/ when the suite was written, --scale multiplies it
+BASE_NODES = 529
+STAGES = ["yaml_load", "import", "traverse", "generate_all", "reciprocal_fixer"]
+
+
+def run_rounds(fn, rounds: int, setup=None) -> tuple[dict, object]:
+    """Time fn() rounds times (setup() runs untimed before each) and return (stats, last result)."""
+    times = []
+    result = None
+    for _ in range(rounds):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    mean = statistics.fmean(times)
+    stats = {
+        "min": min(times),
+        "max": max(times),
+        "mean": mean,
+        "stddev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "median": statistics.median(times),
+        "rounds": len(times),
+        "ops": 1 / mean if mean else 0.0,
+        "data": times,
+    }
+    return stats, result
+
+
+def corpus_dir(root: str, n_nodes: int, seed: int) -> str:
+    path = os.path.join(root, f"nodes_{n_nodes}_seed_{seed}")
+    if not os.path.exists(os.path.join(path, ".complete")):
+        t0 = time.perf_counter()
+        edges = write_corpus(path, n_nodes, seed=seed)
+        with open(os.path.join(path, ".complete"), "w") as f:
+            f.write(str(edges))
+        print(f"Wrote synthetic corpus of {n_nodes} nodes, {edges} edges in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+    return path
+
+
+def suite(data_dir: str, n_nodes: int, stages: list[str], rounds: int, tmp: str, md_pages: int, seed: int) -> list[dict]:
+    from whitetreebible.connections.import_yml_to_db import load_nodes
+    from whitetreebible.connections.md_generator import MdGenerator
+    from whitetreebible.connections.models.node_model import NodeModelCollection
+    from whitetreebible.connections.reciprocal_fixer import ReciprocalFixer
+    from whitetreebible.connections.sqlite_db import SqliteDB
+
+    results = []
+    params = {"nodes": n_nodes}
+
+    def record(group, stats, extra, name_params=None):
+        name_params = name_params or {}
+        label = ",".join(f"{k}={v}" for k, v in {**params, **name_params}.items())
+        results.append({
+            "group": group,
+            "name": f"{group}[{label}]",
+            "fullname": f"benchmarks/suite.py::{group}[{label}]",
+            "params": {**params, **name_params},
+            "stats": stats,
+            "extra_info": extra,
+        })
+        print(f"  {group}[{label}]: mean {stats['mean'] * 1000:.1f} ms over {stats['rounds']} rounds", file=sys.stderr)
+
+    db_path = os.path.join(tmp, f"suite_{n_nodes}.db")
+
+    def fresh_db():
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+    def build_db():
+        db = SqliteDB(db_path)
+        counts = load_nodes(db, NodeModelCollection(data_dir, lazy=True).iter_nodes())
+        db.close()
+        return counts
+
+    if "yaml_load" in stages:
+        stats, count = run_rounds(lambda: sum(1 for _ in NodeModelCollection(data_dir, lazy=True).iter_nodes()), rounds)
+        record("yaml_load", stats, {"nodes": count})
+
+    if "import" in stages:
+        stats, (nodes, edges) = run_rounds(build_db, rounds, setup=fresh_db)
+        record("import", stats, {"nodes": nodes, "edges": edges})
+    elif not os.path.exists(db_path):
+        build_db()
+
+    db = SqliteDB.open_readonly(db_path)
+    try:
+        if "traverse" in stages:
+            # the biggest hubs plus a fixed random sample, every stage run sees the same start nodes
+            hubs = [row[0] for row in db.conn.execute(
+                "SELECT target FROM edges GROUP BY target ORDER BY COUNT(*) DESC, target LIMIT 20"
+            )]
+            links = [row[0] for row in db.conn.execute("SELECT type || '/' || id FROM nodes ORDER BY id")]
+            starts = hubs + random.Random(seed).sample(links, min(180, len(links)))
+            for depth in (1, 2):
+                def traverse():
+                    return sum(len(db.traverse_edges(start, direction="both", max_depth=depth)) for start in starts)
+                stats, edges = run_rounds(traverse, rounds)
+                record("traverse", stats, {"starts": len(starts), "edges": edges}, {"depth": depth})
+
+        if "generate_all" in stages:
+            nodes = []
+            for node in NodeModelCollection(data_dir, lazy=True).iter_nodes():
+                nodes.append(node)
+                if len(nodes) >= md_pages:
+                    break
+            docs_dir = os.path.join(tmp, f"docs_{n_nodes}")
+            generator = MdGenerator(db=db, data_dir=data_dir, docs_dir=docs_dir, nodes=nodes)
+            stats, _ = run_rounds(generator.generate_all, rounds)
+            record("generate_all", stats, {"pages": len(nodes)})
+
+        if "reciprocal_fixer" in stages:
+            stats, missing = run_rounds(lambda: ReciprocalFixer(db, data_dir).find_missing_reciprocals(), rounds)
+            record("reciprocal_fixer", stats, {"missing": len(missing)})
+    finally:
+        db.close()
+    return results
+
+
+def commit_info() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {"id": git("rev-parse", "HEAD"), "branch": git("rev-parse", "--abbrev-ref", "HEAD"), "dirty": bool(status)}
+
+
+def load_report(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return {b["fullname"]: b for b in json.load(f)["benchmarks"]}
+
+
+def compare(report: dict, baseline: dict, baseline_path: str):
+    rows = []
+    for bench in report["benchmarks"]:
+        old = baseline.get(bench["fullname"])
+        new_mean = bench["stats"]["mean"]
+        if old is None:
+            rows.append([bench["name"], "", f"{new_mean * 1000:.1f}", "new"])
+            continue
+        old_mean = old["stats"]["mean"]
+        rows.append([bench["name"], f"{old_mean * 1000:.1f}", f"{new_mean * 1000:.1f}", f"{new_mean / old_mean:.2f}x"])
+    print(f"\ncompared with {baseline_path}:")
+    print_table(["benchmark", "old ms", "new ms", "new/old"], rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=int, nargs="+", default=[10], help=f"corpus sizes as multiples of {BASE_NODES} nodes")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--md-pages", type=int, default=200, help="pages rendered by the generate_all stage")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus-dir", help="keep generated corpora here between runs instead of a temp dir")
+    parser.add_argument("--json", dest="json_path", help="write the report to this file")
+    parser.add_argument("--compare", help="report from an earlier run to compare the means against")
+    args = parser.parse_args()
+
+    # read the baseline first, --json may point at the same file
+    baseline = load_report(args.compare) if args.compare else None
+    from whitetreebible.connections.logger import log
+    log.setLevel(logging.WARNING)
+    benchmarks = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.corpus_dir or tmp
+        for scale in args.scale:
+            n_nodes = BASE_NODES * scale
+            data_dir = corpus_dir(root, n_nodes, args.seed)
+            print(f"scale {scale}x ({n_nodes} nodes)", file=sys.stderr)
+            benchmarks += suite(data_dir, n_nodes, args.stages, args.rounds, tmp, args.md_pages, args.seed)
+
+    report = {
+        "machine_info": {
+            "node": platform.node(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "python_version": platform.python_version(),
+            "system": platform.system(),
+            "cpu_count": os.cpu_count(),
+        },
+        "commit_info": commit_info(),
+        "datetime": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "version": "1",
+        "benchmarks": benchmarks,
+    }
+    print_table(
+        ["benchmark", "min ms", "mean ms", "stddev ms", "rounds", "extra"],
+        [[b["name"], f"{b['stats']['min'] * 1000:.1f}", f"{b['stats']['mean'] * 1000:.1f}",
+          f"{b['stats']['stddev'] * 1000:.1f}", b["stats"]["rounds"],
+          " ".join(f"{k}={v}" for k, v in b["extra_info"].items())] for b in benchmarks],
+    )
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nwrote {args.json_path}")
+    if args.compare:
+        compare(report, baseline, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Deterministic synthetic corpus in the data/ layout (data/<type>/<id>.yml), for benchmarks that need
+more nodes than the real corpus has. The same arguments always write byte-identical files.
+
+The shape follows data/: node types and edge types in roughly the real proportions (every EdgeType
+occurs), a heavy tailed out-degree with some isolated nodes, preferential targets so a few hubs
+collect most incoming edges, reciprocal edges for most reciprocal types (the rest are left for
+ReciprocalFixer to find), bible/footnote/page refs on edges, and footnotes on some nodes.
+
+    uv run -m benchmarks.synthetic OUT_DIR [--nodes 100000] [--seed 0]
+"""
+import argparse
+import os
+import random
+import yaml
+from whitetreebible.connections.models.edge_type import EdgeType, RECIPROCALS
+
+# yaml.dump is pure python without libyaml's C emitter
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# node type -> weight, from the counts in data/
+NODE_TYPE_WEIGHTS = {
+    "person": 361, "place": 75, "group": 27, "object": 15, "role": 13, "concept": 12,
+    "being": 8, "animal": 6, "symbol": 4, "theme": 4, "event": 2, "plant": 2,
+}
+# edge type -> weight, from the counts in data/ (child-of and the other reciprocal halves are mostly
+# produced by the reciprocal pass); every other type gets a small weight so the full range shows up
+EDGE_TYPE_WEIGHTS = {
+    EdgeType.PARENT_OF: 345, EdgeType.ASSOCIATED_WITH: 129, EdgeType.NAME_MATCHES: 99, EdgeType.MARRIED_TO: 70,
+    EdgeType.ROLE_AS: 48, EdgeType.LEADER_OF: 41, EdgeType.RESIDENT_OF: 34, EdgeType.BLESSED: 22,
+    EdgeType.MEMBER_OF: 20, EdgeType.CREATED: 18,
+}
+BOOKS = ["Genesis", "Exodus", "Numbers", "Joshua", "Judges", "Ruth", "1 Samuel", "2 Kings", "Psalm", "Isaiah", "Matthew", "Luke", "Acts"]
+# share of reciprocal edges whose other half is written too
+RECIPROCAL_RATE = 0.85
+MAX_DEGREE = 60
+
+
+def bible_ref(rng: random.Random) -> str:
+    book = rng.choice(BOOKS)
+    chapter = rng.randint(1, 50)
+    kind = rng.random()
+    if kind < 0.15:
+        return f"{book} {chapter}"
+    verse = rng.randint(1, 30)
+    if kind < 0.3:
+        return f"{book} {chapter}:{verse}-{verse + rng.randint(1, 5)}"
+    return f"{book} {chapter}:{verse}"
+
+
+def out_degree(rng: random.Random) -> int:
+    # about one node in eight has no edges of its own, the rest follow a pareto tail (mean ~2.5)
+    if rng.random() < 0.13:
+        return 0
+    return min(MAX_DEGREE, int(rng.paretovariate(1.6)))
+
+
+def build_graph(n_nodes: int, rng: random.Random) -> tuple[list[str], list[dict]]:
+    """Node types and, per node, an insertion ordered {(target index, EdgeType): None} of its edges."""
+    node_types = rng.choices(list(NODE_TYPE_WEIGHTS), weights=list(NODE_TYPE_WEIGHTS.values()), k=n_nodes)
+    edge_types = list(EdgeType)
+    weights = [EDGE_TYPE_WEIGHTS.get(edge_type, 2) for edge_type in edge_types]
+    edges = [dict() for _ in range(n_nodes)]
+    for i in range(n_nodes):
+        for _ in range(out_degree(rng)):
+            # rng.random() ** 3 piles targets onto low indices: those become the hubs
+            j = int(n_nodes * rng.random() ** 3)
+            if j == i:
+                continue
+            edge_type = rng.choices(edge_types, weights=weights)[0]
+            edges[i][(j, edge_type)] = None
+            reciprocal = RECIPROCALS.get(edge_type)
+            if reciprocal is not None and rng.random() < RECIPROCAL_RATE:
+                edges[j][(i, reciprocal)] = None
+    return node_types, edges
+
+
+def node_link(node_types: list[str], i: int) -> str:
+    return f"{node_types[i]}/n{i:07d}"
+
+
+def node_data(i: int, node_types: list[str], edges: dict, rng: random.Random) -> dict:
+    n_nodes = len(node_types)
+    footnotes = {}
+    if rng.random() < 0.1:
+        for k in range(rng.randint(1, 3)):
+            footnotes[f"note_{k}"] = {"en": f"Synthetic footnote {k} on node {i}, compare {bible_ref(rng)}."}
+    edge_list = []
+    for j, edge_type in edges:
+        refs = []
+        for _ in range(rng.choices([0, 1, 2, 3, 4], weights=[4, 84, 9, 2, 1])[0]):
+            kind = rng.random()
+            if footnotes and kind < 0.05:
+                refs.append(f"footnote:{rng.choice(list(footnotes))}")
+            elif kind < 0.08:
+                refs.append(f"[[{node_link(node_types, rng.randrange(n_nodes))}]]")
+            else:
+                refs.append(f"bible:{bible_ref(rng)}")
+        edge_list.append({"target": node_link(node_types, j), "type": edge_type.value, "refs": sorted(set(refs))})
+    neighbour = node_link(node_types, rng.randrange(n_nodes))
+    # every footnote is cited from the description like the real nodes do, so pages render without warnings
+    citations = "".join(f"[^{key}]" for key in footnotes)
+    return {
+        "id": f"n{i:07d}",
+        "type": node_types[i],
+        "name": {"en": f"Node {i}"},
+        "name_disambiguous": {"en": f"Node {i} ({node_types[i]})"},
+        "description": {"en": f"Synthetic node {i}, see [[{neighbour}]] and [[bible:{bible_ref(rng)}]].{citations}"},
+        "footnotes": footnotes,
+        "edges": edge_list,
+    }
+
+
+def write_corpus(data_dir: str, n_nodes: int, seed: int = 0) -> int:
+    """Write n_nodes YAML files under data_dir. Returns the number of edges written."""
+    rng = random.Random(seed)
+    node_types, edges = build_graph(n_nodes, rng)
+    for node_type in set(node_types):
+        os.makedirs(os.path.join(data_dir, node_type), exist_ok=True)
+    for i in range(n_nodes):
+        data = node_data(i, node_types, edges[i], rng)
+        with open(os.path.join(data_dir, data["type"], f"{data['id']}.yml"), "w", encoding="utf-8") as f:
+            yaml.dump(data, f, Dumper=YamlDumper, sort_keys=False, allow_unicode=True)
+    return sum(len(node_edges) for node_edges in edges)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("out_dir")
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    edges = write_corpus(args.out_dir, args.nodes, args.seed)
+    print(f"Wrote {args.nodes} nodes and {edges} edges to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import pytest
+from whitetreebible.connections.models.bible_ref import BibleRef, biblehub_link, parse_bible_ref
+from whitetreebible.connections.models.edge_model import EdgeModel
+
+
+@pytest.mark.parametrize("ref, expected", [
+    ("Genesis 1", BibleRef("Genesis", 1, text="Genesis 1")),
+    ("Genesis 1:26", BibleRef("Genesis", 1, 26, text="Genesis 1:26")),
+    ("bible:Ruth 1:1-2", BibleRef("Ruth", 1, 1, 2, text="Ruth 1:1-2")),
+    ("1 Samuel 3:4", BibleRef("1 Samuel", 3, 4, text="1 Samuel 3:4")),
+    ("Song of Songs 2:1", BibleRef("Song of Songs", 2, 1, text="Song of Songs 2:1")),
+    ("Genesis", None),
+    ("see footnote", None),
+])
+def test_parse_bible_ref(ref, expected):
+    assert parse_bible_ref(ref) == expected
+
+
+@pytest.mark.parametrize("ref, url", [
+    ("Joshua 2", "https://biblehub.com/context/joshua/2.htm"),
+    ("Joshua 2:1", "https://biblehub.com/context/joshua/2-1.htm"),
+    ("Genesis 25:12-18", "https://biblehub.com/context/genesis/25.htm"),
+    ("Psalm 87", "https://biblehub.com/context/psalms/87.htm"),
+    ("1 Samuel 3:4", "https://biblehub.com/context/1_samuel/3-4.htm"),
+    ("Song of Solomon 2:1", "https://biblehub.com/context/songs/2-1.htm"),
+])
+def test_biblehub_link(ref, url):
+    assert biblehub_link(ref) == f'[{ref}]({url}){{:target="_blank"}}'
+
+
+def test_biblehub_link_leaves_unparseable_ref():
+    assert biblehub_link("Genesis") == "Genesis"
+
+
+def test_parse_refs_structured():
+    refs = ["bible:Ruth 1:1", "[[bible:Ruth 2]]", "[[boaz]]", "bible:unknown"]
+    assert EdgeModel.parse_refs(refs)["bible"] == ["bible:Ruth 1:1", "bible:Ruth 2", "bible:unknown"]
+    structured = EdgeModel.parse_refs(refs, structured=True)
+    assert structured["bible"] == [BibleRef("Ruth", 1, 1, text="Ruth 1:1"), BibleRef("Ruth", 2, text="Ruth 2"), "bible:unknown"]
+    assert structured["page"] == ["boaz"]
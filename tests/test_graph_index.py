@@ -0,0 +1,49 @@
+import os
+import pytest
+from whitetreebible.connections.graph_index import GraphIndex
+from whitetreebible.connections.models.edge_type import EdgeType
+from whitetreebible.connections.models.node_model import NodeModel
+from whitetreebible.connections.sqlite_db import SqliteDB
+
+
+NODES = [
+    NodeModel({"id": "abraham", "type": "person", "name": {"en": "Abraham"}, "name_disambiguous": {"en": "Abraham (also Abram)"},
+               "edges": [{"target": "person/isaac", "type": "parent-of"}, {"target": "person/sarah", "type": "married-to"},
+                         {"target": "place/hebron", "type": "resident-of"}]}),
+    NodeModel({"id": "isaac", "type": "person", "name": {"en": "Isaac"},
+               "edges": [{"target": "person/abraham", "type": "child-of"}, {"target": "person/jacob", "type": "parent-of"}]}),
+    NodeModel({"id": "jacob", "type": "person", "name": {"en": "Jacob"},
+               "edges": [{"target": "person/isaac", "type": "child-of"}, {"target": "person/esau", "type": "related-to"},
+                         {"target": "person/isaac", "type": "child-of"}]}),
+    NodeModel({"id": "sarah", "type": "person", "name": {"en": "Sarah"},
+               "edges": [{"target": "person/abraham", "type": "married-to"}]}),
+    NodeModel({"id": "hebron", "type": "place", "name": {"en": "Hebron"},
+               "edges": [{"target": "place/canaan", "type": "near"}]}),
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = SqliteDB(os.path.join(tmp_path, "test.db"))
+    with db.bulk_load():
+        db.insert_nodes_many(NODES, lang="en")
+        db.insert_edges_many((n.type, n.id, e) for n in NODES for e in n.edges)
+    yield db
+    db.close()
+
+
+@pytest.mark.parametrize("direction", ["out", "in", "both"])
+@pytest.mark.parametrize("max_depth", [None, -1, 0, 1, 2])
+@pytest.mark.parametrize("types", [None, [EdgeType.PARENT_OF, EdgeType.CHILD_OF], {EdgeType.NEAR}, ["*"], ["parent-of", EdgeType.CHILD_OF.code]])
+def test_graph_index_traverse_matches_sqlite(db, direction, max_depth, types):
+    indexes = [GraphIndex.from_db(db), GraphIndex.from_nodes(NODES)]
+    for start in ["person/abraham", "person/jacob", "place/canaan", "person/nobody"]:
+        expected = db.traverse_edges(start, direction=direction, types=types, max_depth=max_depth)
+        for index in indexes:
+            assert index.traverse_edges(start, direction=direction, types=types, max_depth=max_depth) == expected
+
+
+def test_graph_index_names_match_sqlite(db):
+    links = ["person/abraham", "person/isaac", "place/canaan"]
+    assert GraphIndex.from_db(db).select_names(links) == db.select_names(links)
+    assert GraphIndex.from_nodes(NODES).select_names(links) == db.select_names(links)
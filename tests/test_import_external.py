@@ -0,0 +1,117 @@
+import os
+import pytest
+from whitetreebible.connections import import_external_to_yml
+from whitetreebible.connections.import_external_to_yml import NodeDirectory, NodeStore, get_or_create_node, lookup_similar_nodes
+from whitetreebible.connections.models.node_model import NodeModel
+from whitetreebible.connections.sqlite_db import SqliteDB
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    data_dir = os.path.join(tmp_path, "data")
+    db_path = os.path.join(tmp_path, "test.db")
+    for node_type in ("person", "place"):
+        os.makedirs(os.path.join(data_dir, node_type))
+    # in the database and on disk, with a newer name in the YAML file
+    NodeModel({"id": "abram", "type": "person", "name": {"en": "Abraham"}, "name_disambiguous": {"en": "Abraham (son of Terah)"}}).to_yaml(os.path.join(data_dir, "person", "abram.yml"))
+    # only on disk, without a name_disambiguous
+    NodeModel({"id": "seth", "type": "person", "name": {"en": "Seth"}, "edges": [{"target": "person/adam", "type": "child-of"}]}).to_yaml(os.path.join(data_dir, "person", "seth.yml"))
+    NodeModel({"id": "ur", "type": "place", "name": {"en": "Ur"}}).to_yaml(os.path.join(data_dir, "place", "ur.yml"))
+    db = SqliteDB(db_path)
+    db.insert_node(NodeModel({"id": "abram", "type": "person", "name": {"en": "Abram"}}))
+    # only in the database
+    db.insert_node(NodeModel({"id": "terah", "type": "person", "name": {"en": "Terah"}}))
+    db.close()
+    monkeypatch.setattr(import_external_to_yml, "DATA_DIR", data_dir)
+    monkeypatch.setattr(import_external_to_yml, "_node_directory", NodeDirectory.load(db_path=db_path))
+    monkeypatch.setattr(import_external_to_yml, "_disambig_cache", {})
+    monkeypatch.setattr(import_external_to_yml, "_name_matches_to_add", [])
+    monkeypatch.setattr(import_external_to_yml, "_node_store", NodeStore())
+    return data_dir
+
+
+def test_directory_merges_database_and_yaml(corpus):
+    abram = {"id": "abram", "type": "person", "name": "Abram", "name_disambiguous": "Abraham (son of Terah)"}
+    assert lookup_similar_nodes("person", " ABRAM ") == [abram]
+    assert lookup_similar_nodes("person", "abraham") == [abram]
+    assert lookup_similar_nodes("person", "seth") == [{"id": "seth", "type": "person", "name": "Seth", "name_disambiguous": "Seth (son of Adam)"}]
+    assert lookup_similar_nodes("person", "Terah") == [{"id": "terah", "type": "person", "name": "Terah", "name_disambiguous": "Terah"}]
+    assert lookup_similar_nodes("place", "seth") == []
+    assert lookup_similar_nodes("place", "ur")[0]["id"] == "ur"
+    assert lookup_similar_nodes("person", " ") == []
+
+
+def test_created_nodes_are_found_by_later_rows(corpus):
+    node, path = get_or_create_node("person", "enos", "Genesis 4:26", context="seth parent-of enos",
+                                    edge_type=import_external_to_yml.EdgeType.CHILD_OF, target_link="person/seth")
+    assert path == os.path.join(corpus, "person", "enos.yml")
+    assert not os.path.exists(path)
+    assert import_external_to_yml._node_store.flush() == 1
+    assert NodeModel.from_yaml_file(path).name_disambiguous == {"en": "Enos (son of Seth)"}
+    assert lookup_similar_nodes("person", "Enos") == [{"id": "enos", "type": "person", "name": "Enos", "name_disambiguous": "Enos (son of Seth)"}]
+
+
+@pytest.mark.parametrize("flush_every", [0, 1])
+def test_main_reads_and_writes_each_node_once(corpus, monkeypatch, tmp_path, flush_every):
+    csv_path = os.path.join(tmp_path, "edges.csv")
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.write("source,edge_type,target,ref_bible,ref_footnote_anchor,ref_footnote_text\n")
+        f.write("person/seth,parent-of,person/enos,Genesis 4:26,,\n")
+        f.write("person/enos,parent-of,person/kenan,Genesis 5:9,,\n")
+        f.write("person/seth,parent-of,person/enos,Genesis 5:6,seth_age,Seth was 105\n")
+    # later rows find seth and enos again, pick the existing node
+    monkeypatch.setattr(import_external_to_yml.inquirer, "list_input", lambda message, choices, default: choices[0][1])
+    parsed = []
+    from_yaml_file = NodeModel.from_yaml_file.__func__
+    monkeypatch.setattr(NodeModel, "from_yaml_file", classmethod(lambda cls, path: parsed.append(path) or from_yaml_file(cls, path)))
+    written = []
+    monkeypatch.setattr(import_external_to_yml.os, "replace", lambda src, dst: written.append(dst) or os.rename(src, dst))
+    monkeypatch.setattr("sys.argv", ["import_external_to_yml", csv_path] + (["--flush-every", str(flush_every)] if flush_every else []))
+    import_external_to_yml.main()
+
+    seth_path = os.path.join(corpus, "person", "seth.yml")
+    assert parsed == [seth_path]
+    if flush_every:
+        # every row writes its two nodes
+        assert len(written) == 6
+    else:
+        assert sorted(written) == sorted(os.path.join(corpus, "person", f"{n}.yml") for n in ("seth", "enos", "kenan"))
+    assert not [name for name in os.listdir(os.path.join(corpus, "person")) if name.endswith(".tmp")]
+    seth = NodeModel.from_yaml_file(seth_path)
+    assert [(e.type.value, e.target, e.refs) for e in seth.edges] == [
+        ("child-of", "person/adam", []),
+        ("parent-of", "person/enos", ["bible:Genesis 4:26", "bible:Genesis 5:6", "footnote:seth_age"]),
+    ]
+    assert seth.footnotes == {"seth_age": {"en": "Seth was 105"}}
+    enos = NodeModel.from_yaml_file(os.path.join(corpus, "person", "enos.yml"))
+    assert [(e.type.value, e.target) for e in enos.edges] == [("child-of", "person/seth"), ("parent-of", "person/kenan")]
+
+
+@pytest.mark.parametrize("failure", ["bad row", "interrupt"])
+def test_main_keeps_rows_before_a_failure(corpus, monkeypatch, tmp_path, failure):
+    csv_path = os.path.join(tmp_path, "edges.csv")
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.write("person/seth,parent-of,person/enos,Genesis 4:26,,\n")
+        f.write("person/enos,parent-of,person/kenan,Genesis 5:9,,\n")
+        if failure == "bad row":
+            f.write("person/kenan,no-such-edge,person/mahalalel,Genesis 5:12,,\n")
+        else:
+            f.write("person/kenan,child-of,person/seth,Genesis 5:12,,\n")
+    prompts = []
+
+    def pick_existing(message, choices, default):
+        prompts.append(message)
+        # the third question (which seth is in the last row) is answered with Ctrl-C
+        if len(prompts) == 3:
+            raise KeyboardInterrupt
+        return choices[0][1]
+    monkeypatch.setattr(import_external_to_yml.inquirer, "list_input", pick_existing)
+    monkeypatch.setattr("sys.argv", ["import_external_to_yml", csv_path])
+    with pytest.raises(ValueError if failure == "bad row" else KeyboardInterrupt):
+        import_external_to_yml.main()
+
+    enos = NodeModel.from_yaml_file(os.path.join(corpus, "person", "enos.yml"))
+    assert [(e.type.value, e.target) for e in enos.edges] == [("child-of", "person/seth"), ("parent-of", "person/kenan")]
+    kenan = NodeModel.from_yaml_file(os.path.join(corpus, "person", "kenan.yml"))
+    assert [(e.type.value, e.target) for e in kenan.edges] == [("child-of", "person/enos")]
+    assert ("parent-of", "person/enos") in [(e.type.value, e.target) for e in NodeModel.from_yaml_file(os.path.join(corpus, "person", "seth.yml")).edges]
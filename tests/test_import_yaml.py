@@ -0,0 +1,25 @@
+import os
+from whitetreebible.connections.import_yml_to_db import load_nodes
+from whitetreebible.connections.models.node_model import NodeModel
+from whitetreebible.connections.sqlite_db import SqliteDB
+
+
+def test_load_nodes_streams_in_batches(tmp_path):
+    consumed = []
+
+    def nodes():
+        for i in range(5):
+            consumed.append(i)
+            yield NodeModel({
+                "id": f"n{i}", "type": "person", "name": {"en": f"Node {i}"},
+                "edges": [{"target": f"person/n{(i + 1) % 5}", "type": "parent-of"}],
+            })
+
+    db = SqliteDB(os.path.join(tmp_path, "test.db"))
+    assert load_nodes(db, nodes(), batch_size=2) == (5, 5)
+    assert consumed == list(range(5))
+    assert db.select_name("person", "n4") == "Node 4"
+    assert db.conn.execute("SELECT source, target FROM edges ORDER BY id").fetchall() == [
+        (f"person/n{i}", f"person/n{(i + 1) % 5}") for i in range(5)
+    ]
+    db.close()
@@ -0,0 +1,42 @@
+import os
+from whitetreebible.connections.manual_editor import ManualEditor, NodeInfo
+from whitetreebible.connections.models.node_model import NodeModel
+
+
+def make_editor(tmp_path):
+    editor = ManualEditor(data_dir=str(tmp_path), db_path=os.path.join(tmp_path, "test.db"))
+    editor.db.insert_node(NodeModel({"id": "ruth", "type": "person", "name": {"en": "Ruth"}, "name_disambiguous": {"en": "Ruth the Moabite"}}))
+    editor.db.insert_node(NodeModel({"id": "boaz", "type": "person", "name": {"en": "Boaz"}}))
+    editor.db.insert_node(NodeModel({"id": "moab", "type": "place", "name": {"en": "Moab"}}))
+    return editor
+
+
+def test_get_all_nodes_is_one_query(tmp_path):
+    editor = make_editor(tmp_path)
+    statements = []
+    editor.db.conn.set_trace_callback(statements.append)
+    nodes = editor.get_all_nodes()
+    editor.db.conn.set_trace_callback(None)
+    assert len(statements) == 1
+    assert nodes == [
+        NodeInfo(type="person", id="boaz", name="Boaz", name_disambiguous="Boaz"),
+        NodeInfo(type="place", id="moab", name="Moab", name_disambiguous="Moab"),
+        NodeInfo(type="person", id="ruth", name="Ruth", name_disambiguous="Ruth the Moabite"),
+    ]
+    assert editor.get_all_nodes() is nodes
+    editor.close()
+
+
+def test_created_and_renamed_nodes_reach_the_catalogue(tmp_path):
+    editor = make_editor(tmp_path)
+    editor.get_all_nodes()
+    assert editor.create_new_node(NodeInfo(type="person", id="obed", name="Obed", name_disambiguous="Obed son of Boaz"))
+    assert os.path.exists(os.path.join(tmp_path, "person", "obed.yml"))
+    assert NodeInfo(type="person", id="obed", name="Obed", name_disambiguous="Obed son of Boaz") in editor.get_all_nodes()
+    assert [n.id for n in editor.fuzzy_search_nodes("son of boaz")] == ["obed"]
+
+    editor._update_database_after_rename("person", "boaz", "boaz_of_bethlehem", "Boaz", "Boaz of Bethlehem")
+    editor._all_nodes_cache = None
+    assert NodeInfo(type="person", id="boaz_of_bethlehem", name="Boaz", name_disambiguous="Boaz of Bethlehem") in editor.get_all_nodes()
+    assert [n.id for n in editor.fuzzy_search_nodes("of bethlehem")] == ["boaz_of_bethlehem"]
+    editor.close()
@@ -1,6 +1,11 @@
 import os
+import pytest
+from whitetreebible.connections.graph_index import GraphIndex
 from whitetreebible.connections.md_generator import MdGenerator, MdFormatters
-from whitetreebible.connections.models.node_model import NodeModel
+from whitetreebible.connections.models.edge_type import EdgeGroups, EdgeType, EDGE_GROUPS_ASSOCIATIONS
+from whitetreebible.connections.models.edge_model import EdgeModel
+from whitetreebible.connections.models.node_model import NodeModel, NodeModelCollection
+from whitetreebible.connections.profiling import profiler
 from whitetreebible.connections.sqlite_db import SqliteDB
 
 def test_md_generator_creates_md_file_for_boaz(tmp_path):
@@ -52,7 +57,7 @@ def test_md_generator_with_association_and_mermaid(tmp_path):
     # Insert edge manually if needed by your schema
     db.conn.execute(
         "INSERT INTO edges (source, target, type) VALUES (?, ?, ?)",
-        ("person/boaz", "person/rahab", "married-to")
+        ("person/boaz", "person/rahab", EdgeType.MARRIED_TO.code)
     )
     db.conn.commit()
     gen = MdGenerator(db=db, data_dir=str(tmp_path), docs_dir=str(tmp_path))
@@ -65,3 +70,198 @@ def test_md_generator_with_association_and_mermaid(tmp_path):
     # Should have a symmetrical edge (e.g., <--> or -- or both directions)
     assert "<-->|married to|" in content
     db.close()
+
+
+def test_md_generator_incremental_only_rewrites_changed_pages(tmp_path):
+    data_dir = os.path.join(tmp_path, "data")
+    docs_dir = os.path.join(tmp_path, "docs")
+    os.makedirs(os.path.join(data_dir, "person"))
+    nodes = [
+        NodeModel({"id": "boaz", "type": "person", "name": {"en": "Boaz"},
+                   "edges": [{"target": "person/ruth", "type": "married-to"}]}),
+        NodeModel({"id": "ruth", "type": "person", "name": {"en": "Ruth"},
+                   "edges": [{"target": "person/boaz", "type": "married-to"}]}),
+        NodeModel({"id": "orpah", "type": "person", "name": {"en": "Orpah"}}),
+    ]
+    db = SqliteDB(os.path.join(tmp_path, "test.db"))
+    for node in nodes:
+        node.to_yaml(os.path.join(data_dir, "person", f"{node.id}.yml"))
+        db.insert_node(node, lang="en")
+        for edge in node.edges:
+            db.insert_edge(node.type, node.id, edge)
+    manifest_path = os.path.join(tmp_path, "manifest.json")
+    pages = {node.id: os.path.join(docs_dir, "en", "person", f"{node.id}.md") for node in nodes}
+
+    def generate():
+        MdGenerator(db=db, data_dir=data_dir, docs_dir=docs_dir, manifest_path=manifest_path).generate_all()
+
+    generate()
+    for path in pages.values():
+        os.utime(path, ns=(1, 1))
+    generate()
+    assert {os.stat(p).st_mtime_ns for p in pages.values()} == {1}
+
+    # boaz's graph draws ruth's name, orpah does not link to ruth
+    db.conn.execute("UPDATE nodes SET name = 'Ruth the Moabite' WHERE id = 'ruth'")
+    db.conn.commit()
+    generate()
+    assert os.stat(pages["boaz"]).st_mtime_ns != 1
+    assert os.stat(pages["orpah"]).st_mtime_ns == 1
+    with open(pages["boaz"]) as f:
+        assert "Ruth the Moabite" in f.read()
+    db.close()
+
+
+def test_format_links_uses_injected_db(tmp_path):
+    db = SqliteDB(os.path.join(tmp_path, "test.db"))
+    db.insert_node(NodeModel({"id": "rahab", "type": "person", "name": {"en": "Rahab of Jericho"}}), lang="en")
+    out = MdFormatters().format_links(db=db, md="Married [[person/rahab]].", lang="en")
+    assert out == "Married [Rahab of Jericho](../../person/rahab/)."
+    db.close()
+
+
+@pytest.mark.parametrize("source", ["file", "memory", "index"])
+def test_md_generator_parallel_output_matches_serial(tmp_path, source):
+    data_dir = os.path.join(tmp_path, "data")
+    os.makedirs(os.path.join(data_dir, "person"))
+    db = SqliteDB(os.path.join(tmp_path, "test.db"))
+    names = ["boaz", "ruth", "naomi", "obed", "orpah"]
+    for i, node_id in enumerate(names):
+        node = NodeModel({
+            "id": node_id, "type": "person", "name": {"en": node_id.title()},
+            "description": {"en": f"Related to [[person/{names[i - 1]}]]."},
+            "edges": [{"target": f"person/{names[i - 1]}", "type": "related-to", "refs": ["bible:Ruth 1:1"]}],
+        })
+        node.to_yaml(os.path.join(data_dir, "person", f"{node_id}.yml"))
+        db.insert_node(node, lang="en")
+        for edge in node.edges:
+            db.insert_edge(node.type, node.id, edge)
+    if source == "memory":
+        pages_db = SqliteDB.open_in_memory(db.db_path)
+    elif source == "index":
+        pages_db = GraphIndex.from_nodes(NodeModelCollection(data_dir).get_nodes(), langs=["en"])
+    else:
+        pages_db = db
+    if source != "file":
+        # workers must render from the same data as the parent, not from whatever the db file holds
+        db.insert_node(NodeModel({"id": "ruth", "type": "person", "name": {"en": "Only in the file"}}), lang="en")
+
+    outputs = {}
+    for jobs in (1, 2):
+        docs_dir = os.path.join(tmp_path, f"docs_{jobs}")
+        MdGenerator(db=pages_db, data_dir=data_dir, docs_dir=docs_dir).generate_all(jobs=jobs)
+        outputs[jobs] = {}
+        for node_id in names:
+            with open(os.path.join(docs_dir, "en", "person", f"{node_id}.md"), "rb") as f:
+                outputs[jobs][node_id] = f.read()
+    assert outputs[1] == outputs[2]
+    assert b"Only in the file" not in outputs[2]["naomi"]
+    db.close()
+
+
+def test_format_links_rewrites_bible_and_internal_links_in_one_pass(tmp_path):
+    db = SqliteDB(os.path.join(tmp_path, "test.db"))
+    rahab = NodeModel({"id": "rahab", "type": "person", "name": {"en": "Rahab"}, "name_disambiguous": {"en": "Rahab (of Jericho)"}})
+    db.insert_node(rahab, lang="en")
+    formatters = MdFormatters()
+    md = "See [[bible:Joshua 2:1]], [[person/rahab]] and [[person/unknown]] ([[bible:Psalm 87]])."
+    out = formatters.format_links(db=db, node=rahab, md=md, lang="en", use_disambiguous=True)
+    assert out == (
+        'See [Joshua 2:1](https://biblehub.com/context/joshua/2-1.htm){:target="_blank"}, '
+        "[Rahab (of Jericho)](../../person/rahab/) and [person/unknown](../../person/unknown/) "
+        '([Psalm 87](https://biblehub.com/context/psalms/87.htm){:target="_blank"}).'
+    )
+    # per page counters are only kept for profiling runs
+    assert formatters.link_timings == {}
+    profiler.enable()
+    try:
+        formatters.format_links(db=db, node=rahab, md=md, lang="en", use_disambiguous=True)
+    finally:
+        profiler.disable()
+        profiler.drain()
+    assert formatters.link_timings["person/rahab"][0] == 4
+    db.close()
+
+
+def test_format_graphs_by_edge_group_fetches_neighbourhood_once(tmp_path, monkeypatch):
+    db = SqliteDB(os.path.join(tmp_path, "test.db"))
+    nodes = [
+        NodeModel({"id": "boaz", "type": "person", "name": {"en": "Boaz"}, "edges": [
+            {"target": "person/ruth", "type": "married-to"},
+            {"target": "person/obed", "type": "parent-of"},
+            {"target": "place/bethlehem", "type": "resident-of"},
+            {"target": "group/judah", "type": "member-of"},
+        ]}),
+        NodeModel({"id": "ruth", "type": "person", "name": {"en": "Ruth"}, "edges": [
+            {"target": "person/boaz", "type": "married-to"},
+            {"target": "person/naomi", "type": "ally-of"},
+            {"target": "place/moab", "type": "born-in"},
+        ]}),
+        NodeModel({"id": "obed", "type": "person", "name": {"en": "Obed"}, "edges": [
+            {"target": "person/boaz", "type": "child-of"},
+            {"target": "person/jesse", "type": "parent-of"},
+        ]}),
+        NodeModel({"id": "bethlehem", "type": "place", "name": {"en": "Bethlehem"}}),
+    ]
+    for node in nodes:
+        db.insert_node(node, lang="en")
+        for edge in node.edges:
+            db.insert_edge(node.type, node.id, edge)
+    boaz = nodes[0]
+    formatters = MdFormatters()
+
+    # the same graphs as one format_graph_connections (and traverse) per group
+    expected = []
+    for group in EdgeGroups:
+        if EDGE_GROUPS_ASSOCIATIONS.get(group):
+            expected.append(formatters.format_graph_connections(
+                db, boaz, md=None, lang="en", title=group.for_lang(lang="en", capitalize=True),
+                types=EDGE_GROUPS_ASSOCIATIONS[group], direction="both", max_depth=1,
+            ))
+
+    traversals = []
+    traverse_edges = db.traverse_edges
+    monkeypatch.setattr(db, "traverse_edges", lambda *args, **kwargs: traversals.append(kwargs) or traverse_edges(*args, **kwargs))
+    queries = []
+    db.conn.set_trace_callback(queries.append)
+    out = formatters.format_graphs_by_edge_group(db, boaz, None, "en")
+    db.conn.set_trace_callback(None)
+    assert out == "\n".join(expected)
+    # second hop edges only show when the first hop is in the same group
+    assert "person/jesse" in out
+    assert "place/moab" not in out and "person/naomi" not in out
+    # one traversal per page, names come from the name cache
+    assert len(traversals) == 1
+    assert all(q.startswith("SELECT source, target, type FROM edges") for q in queries)
+
+    # a whole page: the graphs plus the header/association name lookups stay on the cache
+    gen = MdGenerator(db=db, data_dir=str(tmp_path), docs_dir=str(tmp_path), nodes=nodes)
+    traversals.clear()
+    queries.clear()
+    db.conn.set_trace_callback(queries.append)
+    gen.run_formatters(boaz, "en")
+    db.conn.set_trace_callback(None)
+    assert len(traversals) == 1
+    assert all(q.startswith("SELECT source, target, type FROM edges") for q in queries)
+    db.close()
+
+
+def test_filter_edges_keeps_one_direction_per_pair():
+    def edge(source, etype, target):
+        return EdgeModel({"source": f"person/{source}", "target": f"person/{target}", "type": etype})
+    edges = [
+        edge("boaz", "married-to", "ruth"), edge("ruth", "married-to", "boaz"),
+        edge("obed", "child-of", "boaz"), edge("boaz", "parent-of", "obed"),
+        edge("naomi", "related-to", "ruth"), edge("ruth", "related-to", "naomi"),
+        edge("boaz", "resident-of", "bethlehem"), edge("bethlehem", "associated-with", "boaz"),
+        edge("ruth", "led-by", "naomi"),
+    ]
+    kept, arrows = MdFormatters().filter_edges(edges)
+    assert [(e.source, e.type.value, e.target) for e in kept] == [
+        ("person/boaz", "married-to", "person/ruth"),
+        ("person/boaz", "parent-of", "person/obed"),
+        ("person/naomi", "related-to", "person/ruth"),
+        ("person/ruth", "led-by", "person/naomi"),
+        ("person/boaz", "resident-of", "person/bethlehem"),
+    ]
+    assert arrows == ["<-->", "-->", "<-->", "-->", "-->"]
@@ -0,0 +1,183 @@
+import os
+import pytest
+from whitetreebible.connections.models.node_model import NodeModel, NodeModelCollection
+
+
+def write_nodes(data_dir, count):
+    for i in range(count):
+        node_type = "person" if i % 2 else "place"
+        os.makedirs(os.path.join(data_dir, node_type), exist_ok=True)
+        node = NodeModel({
+            "id": f"node_{i:03d}",
+            "type": node_type,
+            "name": {"en": f"Node {i}"},
+            "edges": [{"target": f"person/node_{(i + 1) % count:03d}", "type": "related-to", "refs": ["bible:Ruth 1:1"]}],
+        })
+        node.to_yaml(os.path.join(data_dir, node_type, f"{node.id}.yml"))
+
+
+def test_parallel_load_matches_serial_order(tmp_path):
+    write_nodes(str(tmp_path), 12)
+    serial = NodeModelCollection(str(tmp_path)).get_nodes()
+    parallel = NodeModelCollection(str(tmp_path), workers=3).get_nodes()
+    assert [n.link for n in serial] == [n.link for n in parallel]
+    assert [n.edges for n in serial] == [n.edges for n in parallel]
+    assert len(serial) == 12
+
+
+def test_cache_reparses_only_changed_files(tmp_path, monkeypatch):
+    from whitetreebible.connections.models import node_model
+    data_dir = os.path.join(tmp_path, "data")
+    cache_path = os.path.join(tmp_path, "nodes.cache")
+    write_nodes(data_dir, 6)
+    parsed = []
+    real_load = node_model.load_yaml_file
+    monkeypatch.setattr(node_model, "load_yaml_file", lambda path: parsed.append(path) or real_load(path))
+
+    cold = NodeModelCollection(data_dir, cache_path=cache_path).get_nodes()
+    assert len(parsed) == 6
+
+    parsed.clear()
+    warm = NodeModelCollection(data_dir, cache_path=cache_path).get_nodes()
+    assert parsed == []
+    assert [n.link for n in warm] == [n.link for n in cold]
+
+    changed = os.path.join(data_dir, "person", "node_001.yml")
+    node = NodeModel.from_yaml_file(changed)
+    node.name["en"] = "Renamed node"
+    node.to_yaml(changed)
+    parsed.clear()
+    nodes = NodeModelCollection(data_dir, cache_path=cache_path).get_nodes()
+    assert parsed == [changed]
+    assert {n.id: n.name["en"] for n in nodes}["node_001"] == "Renamed node"
+
+    with open(cache_path, "wb") as f:
+        f.write(b"not a pickle")
+    parsed.clear()
+    assert len(NodeModelCollection(data_dir, cache_path=cache_path).get_nodes()) == 6
+    assert len(parsed) == 6
+
+
+def test_to_yaml_round_trip_keeps_field_order(tmp_path):
+    data = {
+        "id": "ruth", "type": "person", "name": {"en": "Ruth"}, "name_disambiguous": {"en": "Ruth (Moabite)"},
+        "description": {"en": "A Moabite woman."}, "footnotes": {},
+        "edges": [{"target": "person/boaz", "type": "married-to", "refs": ["bible:Ruth 4:13"]}],
+    }
+    path = os.path.join(tmp_path, "ruth.yml")
+    yaml_str = NodeModel(data).to_yaml(path)
+    assert not hasattr(NodeModel(data), "__dict__")
+    assert [line.split(":")[0] for line in yaml_str.splitlines() if not line.startswith((" ", "-"))] == list(data)
+    assert NodeModel.from_yaml_file(path).to_yaml() == yaml_str
+
+
+def test_edge_identity_is_read_only_and_hash_cached():
+    import pickle
+    from whitetreebible.connections.models.edge_model import EdgeModel, NO_REFS
+    edge = EdgeModel({"source": "person/ruth", "target": "person/boaz", "type": "married-to", "refs": ["bible:Ruth 4:13"]})
+    with pytest.raises(AttributeError):
+        edge.target = "person/obed"
+    edge.refs.append("bible:Ruth 4:10")
+    moved = edge.replace(target="person/obed")
+    assert (moved.target, moved.refs) == ("person/obed", edge.refs) and moved.refs is not edge.refs
+    assert hash(edge) == hash(EdgeModel.from_row(("person/ruth", "person/boaz", "married-to")))
+    assert pickle.loads(pickle.dumps(edge)).refs == edge.refs
+    rows = [EdgeModel.from_row(("person/ruth", "person/boaz", 5)) for _ in range(2)]
+    assert rows[0].refs is rows[1].refs is NO_REFS
+    assert rows[0].to_dict()["refs"] == []
+
+
+def test_iter_nodes_streams_in_get_nodes_order(tmp_path, monkeypatch):
+    from whitetreebible.connections.models import node_model
+    data_dir = os.path.join(tmp_path, "data")
+    write_nodes(data_dir, 6)
+    parsed = []
+    real_load = node_model.load_yaml_file
+    monkeypatch.setattr(node_model, "load_yaml_file", lambda path: parsed.append(path) or real_load(path))
+
+    collection = NodeModelCollection(data_dir, lazy=True)
+    assert parsed == []
+    stream = collection.iter_nodes()
+    first = next(stream)
+    assert len(parsed) == 1
+    links = [first.link] + [n.link for n in stream]
+    assert links == [n.link for n in NodeModelCollection(data_dir).get_nodes()]
+    assert collection.nodes == []
+
+    assert [n.link for n in collection.iter_nodes(node_types=["person"])] == [l for l in links if l.startswith("person/")]
+    # once loaded, iteration (and the type filter) is served from memory
+    collection.get_nodes()
+    parsed.clear()
+    assert [n.link for n in collection.iter_nodes(node_types=["place"])] == [l for l in links if l.startswith("place/")]
+    assert parsed == []
+
+    cache_path = os.path.join(tmp_path, "nodes.cache")
+    assert [n.link for n in NodeModelCollection(data_dir, cache_path=cache_path, lazy=True).iter_nodes()] == links
+    parsed.clear()
+    assert [n.link for n in NodeModelCollection(data_dir, cache_path=cache_path, lazy=True).iter_nodes()] == links
+    assert parsed == []
+
+
+def test_changing_nodes_leaves_the_cache_alone(tmp_path):
+    data_dir = os.path.join(tmp_path, "data")
+    cache_path = os.path.join(tmp_path, "nodes.cache")
+    write_nodes(data_dir, 4)
+    NodeModelCollection(data_dir, cache_path=cache_path).get_nodes()
+    # one file changes, so the streamed walk parses it and saves the sidecar after the other nodes were handed out cached
+    changed = os.path.join(data_dir, "person", "node_001.yml")
+    node = NodeModel.from_yaml_file(changed)
+    node.name["en"] = "Renamed node"
+    node.to_yaml(changed)
+
+    for node in NodeModelCollection(data_dir, cache_path=cache_path, lazy=True).iter_nodes():
+        node.name["en"] += " (edited)"
+        node.edges[0].refs.append("bible:Ruth 4:17")
+    for node in NodeModelCollection(data_dir, cache_path=cache_path).get_nodes():
+        node.name["en"] += " (edited)"
+        node.edges[0].refs.append("bible:Ruth 4:17")
+
+    nodes = NodeModelCollection(data_dir, cache_path=cache_path).get_nodes()
+    assert sorted(n.name["en"] for n in nodes) == ["Node 0", "Node 2", "Node 3", "Renamed node"]
+    assert all(n.edges[0].refs == ["bible:Ruth 1:1"] for n in nodes)
+
+
+def test_iter_nodes_rewrites_the_cache_alongside_the_walk(tmp_path, monkeypatch):
+    from whitetreebible.connections.models import node_cache, node_model
+    data_dir = os.path.join(tmp_path, "data")
+    cache_path = os.path.join(tmp_path, "nodes.cache")
+    write_nodes(data_dir, 6)
+    parsed = []
+    real_load = node_model.load_yaml_file
+    monkeypatch.setattr(node_model, "load_yaml_file", lambda path: parsed.append(path) or real_load(path))
+    # the stream never loads the whole sidecar
+    monkeypatch.setattr(node_cache.NodeDataCache, "_load", lambda self: pytest.fail("sidecar loaded whole"))
+    links = [n.link for n in NodeModelCollection(data_dir, cache_path=cache_path, lazy=True).iter_nodes()]
+    assert len(parsed) == 6
+
+    # a walk stopped early leaves the sidecar as it was
+    changed = os.path.join(data_dir, "person", "node_001.yml")
+    node = NodeModel.from_yaml_file(changed)
+    node.name["en"] = "Renamed node"
+    node.to_yaml(changed)
+    with open(cache_path, "rb") as f:
+        before = f.read()
+    parsed.clear()
+    for node in NodeModelCollection(data_dir, cache_path=cache_path, lazy=True).iter_nodes():
+        if node.id == "node_001":
+            break
+    assert parsed == [changed]
+    with open(cache_path, "rb") as f:
+        assert f.read() == before
+    assert not os.path.exists(f"{cache_path}.tmp")
+
+    # a filtered walk keeps the records of the other types, a full walk drops the ones of deleted files
+    parsed.clear()
+    assert [n.name["en"] for n in NodeModelCollection(data_dir, cache_path=cache_path, lazy=True).iter_nodes(node_types=["person"])] == ["Renamed node", "Node 3", "Node 5"]
+    assert parsed == [changed]
+    os.remove(os.path.join(data_dir, "place", "node_000.yml"))
+    parsed.clear()
+    assert [n.link for n in NodeModelCollection(data_dir, cache_path=cache_path, lazy=True).iter_nodes()] == [l for l in links if l != "place/node_000"]
+    assert parsed == []
+    monkeypatch.undo()
+    cache = node_cache.NodeDataCache(cache_path)
+    assert sorted(cache.entries) == sorted(os.path.abspath(p) for p in NodeModelCollection(data_dir, lazy=True)._yaml_paths())
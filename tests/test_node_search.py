@@ -0,0 +1,71 @@
+import random
+from whitetreebible.connections.manual_editor import NodeInfo
+from whitetreebible.connections.node_search import NodeSearchIndex, linear_search
+
+
+def make_nodes():
+    nodes = [
+        NodeInfo(type="person", id="abraham", name="Abraham", name_disambiguous="Abraham"),
+        NodeInfo(type="person", id="abram", name="Abram", name_disambiguous="Abram (Abraham)"),
+        NodeInfo(type="place", id="abrahams_well", name="Well", name_disambiguous="Well of Abraham"),
+        NodeInfo(type="person", id="boaz", name="Boaz", name_disambiguous="Boaz"),
+        NodeInfo(type="person", id="jesse", name="Jesse", name_disambiguous="Jesse of Bethlehem"),
+        NodeInfo(type="place", id="bethlehem", name="Bethlehem", name_disambiguous="Bethlehem"),
+        NodeInfo(type="person", id="ruth", name="Ruth", name_disambiguous="Ruth the Moabite"),
+    ]
+    return sorted(nodes, key=lambda x: x.name.lower())
+
+
+def test_tiers_rank_like_linear_search():
+    nodes = make_nodes()
+    index = NodeSearchIndex(nodes)
+    for query in ["abraham", "Abra", "bra", "beth", "BOAZ", "h", "ab", "of", "the moab"]:
+        assert index.search(query, limit=10)[:len(linear_search(nodes, query, 10))] == linear_search(nodes, query, 10), query
+        assert index.search(query, limit=2) == linear_search(nodes, query, 2) or len(linear_search(nodes, query, 2)) < 2, query
+    assert [n.id for n in index.search("abraham")][:3] == ["abraham", "abrahams_well", "abram"]
+    assert index.search("   ") == []
+
+
+def test_typo_tolerant_matches_rank_below_substrings():
+    nodes = make_nodes()
+    index = NodeSearchIndex(nodes)
+    assert linear_search(nodes, "bethlehm", 10) == []
+    assert [n.id for n in index.search("bethlehm")] == ["bethlehem", "jesse"]
+    # a substring match still comes first, the near miss fills the remaining slot
+    assert [n.id for n in index.search("ruth")][0] == "ruth"
+    assert index.search("zzzz") == []
+
+
+def test_matches_linear_search_on_random_nodes():
+    rng = random.Random(0)
+    syllables = ["ab", "ra", "ham", "el", "i", "jah", "be", "th", "le", "hem", "na", "o", "mi", "ru", "ze"]
+    nodes = []
+    for i in range(2000):
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(1, 4))).capitalize()
+        nodes.append(NodeInfo(type="person", id=f"{name.lower()}_{i}", name=name, name_disambiguous=f"{name} son of {rng.choice(syllables)}"))
+    nodes.sort(key=lambda x: x.name.lower())
+    index = NodeSearchIndex(nodes)
+    for query in ["a", "ab", "ham", "Elijah", "jahbe", "son of ze", "_19", "th", "abrahamel", "x"]:
+        for limit in (1, 10, 50):
+            expected = linear_search(nodes, query, limit)
+            results = index.search(query, limit)
+            assert results[:len(expected)] == expected, (query, limit)
+            assert len(results) == limit or len(expected) < limit, (query, limit)
+            # anything past the legacy matches is a typo tolerant match
+            for node in results[len(expected):]:
+                assert not any(query.lower() in f.lower() for f in (node.id, node.name, node.name_disambiguous))
+
+
+def test_editor_search_adds_typo_matches_to_database_results(tmp_path):
+    from whitetreebible.connections.manual_editor import ManualEditor
+    from whitetreebible.connections.models.node_model import NodeModel
+    with ManualEditor(data_dir=str(tmp_path), db_path=str(tmp_path / "test.db")) as editor:
+        for node in make_nodes():
+            editor.db.insert_node(NodeModel({"id": node.id, "type": node.type, "name": {"en": node.name},
+                                             "name_disambiguous": {"en": node.name_disambiguous}}))
+        assert editor.fuzzy_search_nodes("abra", limit=3) == linear_search(make_nodes(), "abra", 3)
+        assert editor._search_index is None
+        # no substring match, the near miss comes from the in-memory index
+        assert [n.id for n in editor.fuzzy_search_nodes("bethlehm")] == ["bethlehem", "jesse"]
+        assert editor._search_index is not None
+        assert [n.id for n in editor.fuzzy_search_nodes("boa")] == ["boaz"]
@@ -0,0 +1,115 @@
+import json
+import os
+import sqlite3
+from whitetreebible.connections.md_generator import MdGenerator
+from whitetreebible.connections.models.node_model import NodeModel, load_yaml_file
+from whitetreebible.connections.profiling import ProfiledConnection, normalize_sql, profiled, profiler, tracer
+from whitetreebible.connections.sqlite_db import SqliteDB
+
+
+def make_db(tmp_path):
+    db = SqliteDB(os.path.join(tmp_path, "test.db"))
+    boaz = NodeModel({"id": "boaz", "type": "person", "name": {"en": "Boaz"}, "edges": [{"target": "person/ruth", "type": "married-to"}]})
+    db.insert_node(boaz)
+    db.insert_node(NodeModel({"id": "ruth", "type": "person", "name": {"en": "Ruth"}}))
+    db.insert_edge(boaz.type, boaz.id, boaz.edges[0])
+    return db
+
+
+def test_disabled_profiler_records_nothing(tmp_path):
+    profiler.drain()
+    path = os.path.join(tmp_path, "boaz.yml")
+    NodeModel({"id": "boaz", "type": "person"}).to_yaml(path)
+    load_yaml_file(path)
+    db = make_db(tmp_path)
+    db.traverse_edges("person/boaz")
+    assert type(db.conn) is sqlite3.Connection
+    assert profiler.stats == {}
+    db.close()
+
+
+def test_profiled_records_parse_sql_formatters_and_writes(tmp_path):
+    report_path = os.path.join(tmp_path, "profile.json")
+    with profiled(report_path):
+        db = make_db(tmp_path)
+        assert isinstance(db.conn, ProfiledConnection)
+        node = NodeModel({"id": "boaz", "type": "person", "name": {"en": "Boaz"}})
+        path = os.path.join(tmp_path, "boaz.yml")
+        node.to_yaml(path)
+        load_yaml_file(path)
+        gen = MdGenerator(db=db, data_dir=str(tmp_path), docs_dir=str(tmp_path), nodes=[node])
+        gen.generate_all()
+        db.close()
+    assert not profiler.enabled
+    with open(report_path) as f:
+        report = json.load(f)
+    stats = report["stats"]
+    for name in ["yaml.parse", "write.yaml", "write.md", "sql.execute", "sql.fetch", "format.format_header", "format.format_footnotes"]:
+        assert stats[name]["count"] >= 1, name
+    # one page, so each formatter ran once
+    assert stats["format.format_header"]["count"] == 1
+    assert report["wall_seconds"] >= stats["write.md"]["total_seconds"]
+
+
+def test_profiled_connection_counts_statements():
+    profiler.enable()
+    try:
+        conn = sqlite3.connect(":memory:", factory=ProfiledConnection)
+        conn.execute("CREATE TABLE t (x)")
+        conn.executemany("INSERT INTO t VALUES (?)", [(1,), (2,), (3,)])
+        assert [row[0] for row in conn.execute("SELECT x FROM t ORDER BY x")] == [1, 2, 3]
+        assert conn.cursor().execute("SELECT COUNT(*) FROM t").fetchone() == (3,)
+        conn.close()
+        assert profiler.stats["sql.execute"][0] == 3
+        assert profiler.stats["sql.executemany"][0] == 1
+        # three rows, the end of the iteration and one fetchone
+        assert profiler.stats["sql.fetch"][0] == 5
+    finally:
+        profiler.disable()
+
+
+def test_merge_and_table():
+    profiler.enable()
+    try:
+        profiler.add("stage.a", 0.5)
+        profiler.merge({"stage.a": [2, 1.0, 0.75], "stage.b": [1, 0.25, 0.25]})
+        assert profiler.stats == {"stage.a": [3, 1.5, 0.75], "stage.b": [1, 0.25, 0.25]}
+        table = profiler.format_table()
+        assert table.splitlines()[0].split() == ["stat", "count", "total", "s", "mean", "ms", "max", "ms", "%", "wall"]
+        assert "stage.a" in table and "wall" in table.splitlines()[-1]
+        assert profiler.drain()["stage.b"] == [1, 0.25, 0.25]
+        assert profiler.stats == {}
+    finally:
+        profiler.disable()
+
+
+def test_normalize_sql_replaces_literals_and_lists():
+    a = normalize_sql("SELECT t0 FROM edges  WHERE source = 'it''s'\n AND type IN (3, 4, 5) LIMIT 10")
+    b = normalize_sql("SELECT t0 FROM edges WHERE source = :start AND type IN (?,?) LIMIT ?")
+    assert a == b == "SELECT t0 FROM edges WHERE source = ? AND type IN (?...) LIMIT ?"
+
+
+def test_tracer_aggregates_statements_and_flags_scans(tmp_path):
+    tracer.enable()
+    try:
+        db = make_db(tmp_path)
+        db.traverse_edges("person/boaz", max_depth=1, mode="recursive")
+        db.traverse_edges("person/ruth", max_depth=1, mode="recursive")
+        # raw cursors handed out through db.conn are traced too
+        cur = db.conn.cursor()
+        cur.execute("SELECT source FROM edges WHERE type = 3")
+        rows = cur.fetchall()
+        db.close()
+    finally:
+        tracer.disable()
+    report = {e["sql"]: e for e in tracer.report()}
+    traversal = next(e for sql, e in report.items() if sql.startswith("WITH RECURSIVE reach"))
+    assert traversal["count"] == 2
+    # boaz -> ruth is found from either end
+    assert traversal["rows"] == 2
+    assert traversal["total_seconds"] > 0
+    assert traversal["unindexed"] == []
+    scan = report["SELECT source FROM edges WHERE type = ?"]
+    assert scan["count"] == 1 and scan["rows"] == len(rows)
+    assert scan["unindexed"] == ["SCAN edges"]
+    assert "statements reading whole tables" in tracer.format_table()
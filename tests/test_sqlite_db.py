@@ -0,0 +1,281 @@
+import os
+import pytest
+from whitetreebible.connections.models.edge_model import EdgeModel
+from whitetreebible.connections.models.edge_type import EdgeType
+from whitetreebible.connections.sqlite_db import SqliteDB
+
+
+EDGES = [
+    ("person/abraham", "person/isaac", "parent-of"),
+    ("person/isaac", "person/abraham", "child-of"),
+    ("person/isaac", "person/jacob", "parent-of"),
+    ("person/jacob", "person/isaac", "child-of"),
+    ("person/jacob", "person/esau", "related-to"),
+    ("person/abraham", "person/sarah", "married-to"),
+    ("person/sarah", "person/abraham", "married-to"),
+    ("person/abraham", "place/hebron", "resident-of"),
+    ("place/hebron", "place/canaan", "near"),
+    ("person/esau", "place/edom", "resident-of"),
+    ("person/jacob", "person/isaac", "child-of"),  # duplicate row
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = SqliteDB(os.path.join(tmp_path, "test.db"))
+    db.conn.executemany(
+        "INSERT INTO edges (source, target, type) VALUES (?, ?, ?)",
+        [(source, target, EdgeType(etype).code) for source, target, etype in EDGES],
+    )
+    db.conn.commit()
+    yield db
+    db.close()
+
+
+@pytest.mark.parametrize("direction", ["out", "in", "both"])
+@pytest.mark.parametrize("max_depth", [None, -1, 0, 1, 2])
+@pytest.mark.parametrize("types", [None, [EdgeType.PARENT_OF, EdgeType.CHILD_OF], {EdgeType.NEAR}, ["*"]])
+def test_traverse_edges_recursive_matches_bfs(db, direction, max_depth, types):
+    for start in ["person/abraham", "person/jacob", "place/canaan", "person/nobody"]:
+        bfs = db.traverse_edges(start, direction=direction, types=types, max_depth=max_depth, mode="bfs")
+        recursive = db.traverse_edges(start, direction=direction, types=types, max_depth=max_depth, mode="recursive")
+        assert recursive == bfs
+        assert db.traverse_edges(start, direction=direction, types=types, max_depth=max_depth) == bfs
+
+
+def test_traverse_edges_star_is_every_type_and_default_mode_follows_depth(db):
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    for max_depth in (None, 1, 2):
+        statements.clear()
+        assert db.traverse_edges("person/abraham", types=["*"], max_depth=max_depth) == db.traverse_edges("person/abraham", max_depth=max_depth)
+        recursive = [sql for sql in statements if "WITH RECURSIVE" in sql]
+        # depth 1 walks with the per node SELECTs, deeper traversals run the one CTE
+        assert len(recursive) == (0 if max_depth == 1 else 2), max_depth
+    db.conn.set_trace_callback(None)
+
+
+def test_legacy_db_is_migrated_in_place(tmp_path):
+    import sqlite3
+    from whitetreebible.connections.sqlite_db import SCHEMA_VERSION
+    path = os.path.join(tmp_path, "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE nodes (id TEXT, type TEXT, lang TEXT, name TEXT, name_disambiguous TEXT, PRIMARY KEY (id, type, lang))")
+    conn.execute("CREATE TABLE edges (id INTEGER PRIMARY KEY AUTOINCREMENT, source TEXT, target TEXT, type TEXT)")
+    conn.executemany("INSERT INTO edges (source, target, type) VALUES (?, ?, ?)", EDGES)
+    conn.execute("INSERT INTO nodes VALUES ('isaac', 'person', 'en', 'Isaac', 'Isaac (son of Abraham)')")
+    conn.commit()
+    conn.close()
+
+    db = SqliteDB(path)
+    assert db.conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert db.conn.execute("SELECT COUNT(*) FROM edges").fetchone()[0] == len(EDGES)
+    # type strings became codes, the edges_named view still reads them as strings
+    assert sorted(db.conn.execute("SELECT source, target, type FROM edges_named").fetchall()) == sorted(EDGES)
+    assert {row[0] for row in db.conn.execute("SELECT DISTINCT typeof(type) FROM edges")} == {"integer"}
+    assert db.traverse_edges("person/isaac", direction="in", types=[EdgeType.PARENT_OF], max_depth=1) == {
+        EdgeModel.from_row(("person/abraham", "person/isaac", "parent-of"))
+    }
+    plan = " ".join(row[-1] for row in db.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT source, target, type FROM edges WHERE target = ? AND type IN (?, ?)",
+        ("person/isaac", EdgeType.PARENT_OF.code, EdgeType.CHILD_OF.code),
+    ))
+    assert "COVERING INDEX idx_edges_target_type_source" in plan
+    # nodes already there are indexed for search_nodes
+    assert [row["id"] for row in db.search_nodes("son of abr")] == ["isaac"]
+    db.close()
+
+
+def test_legacy_db_with_unknown_edge_types_is_not_migrated(tmp_path):
+    import sqlite3
+    from whitetreebible.connections.sqlite_db import SCHEMA_VERSION
+    path = os.path.join(tmp_path, "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE edges (id INTEGER PRIMARY KEY AUTOINCREMENT, source TEXT, target TEXT, type TEXT)")
+    conn.executemany("INSERT INTO edges (source, target, type) VALUES (?, ?, ?)", EDGES + [("person/isaac", "person/esau", "father-of")])
+    conn.commit()
+    conn.close()
+
+    with pytest.raises(ValueError, match="'father-of' \\(1 edges\\)"):
+        SqliteDB(path)
+    # the edges are left as they were, with their type strings
+    conn = sqlite3.connect(path)
+    assert sorted(conn.execute("SELECT source, target, type FROM edges").fetchall()) == sorted(EDGES + [("person/isaac", "person/esau", "father-of")])
+    conn.execute("UPDATE edges SET type = 'parent-of' WHERE type = 'father-of'")
+    conn.commit()
+    conn.close()
+
+    db = SqliteDB(path)
+    assert db.conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert db.conn.execute("SELECT COUNT(*) FROM edges_named").fetchone()[0] == len(EDGES) + 1
+    db.close()
+
+
+def test_every_edge_type_has_a_code_and_a_row(tmp_path):
+    from whitetreebible.connections.models.edge_type import EDGE_TYPE_CODES
+    assert set(EDGE_TYPE_CODES) == set(EdgeType)
+    assert len(set(EDGE_TYPE_CODES.values())) == len(EDGE_TYPE_CODES)
+    path = os.path.join(tmp_path, "test.db")
+    db = SqliteDB(path)
+    # a db migrated before born-in had a code
+    db.conn.execute("DELETE FROM edge_types WHERE value = 'born-in'")
+    db.conn.commit()
+    db.insert_edge("person", "ruth", EdgeModel({"target": "place/moab", "type": "born-in"}))
+    db.close()
+
+    db = SqliteDB(path)
+    rows = dict(db.conn.execute("SELECT value, code FROM edge_types"))
+    assert rows == {edge_type.value: code for edge_type, code in EDGE_TYPE_CODES.items()}
+    assert db.conn.execute("SELECT source, target, type FROM edges_named").fetchall() == [("person/ruth", "place/moab", "born-in")]
+    db.close()
+
+
+def test_bulk_load_matches_per_row_inserts(tmp_path):
+    from whitetreebible.connections.models.node_model import NodeModel
+    from whitetreebible.connections.sqlite_db import INDEXES
+    nodes = [
+        NodeModel({"id": "boaz", "type": "person", "name": {"en": "Boaz"},
+                   "edges": [{"target": "person/ruth", "type": "married-to"}]}),
+        NodeModel({"id": "ruth", "type": "person", "name": {"en": "Ruth"}, "name_disambiguous": {"en": "Ruth (Moabite)"},
+                   "edges": [{"target": "person/boaz", "type": "married-to"}, {"target": "place/moab", "type": "born-in"}]}),
+    ]
+    per_row = SqliteDB(os.path.join(tmp_path, "per_row.db"))
+    for node in nodes:
+        per_row.insert_node(node, lang="en")
+        for edge in node.edges:
+            per_row.insert_edge(node.type, node.id, edge)
+
+    bulk = SqliteDB(os.path.join(tmp_path, "bulk.db"))
+    with bulk.bulk_load():
+        assert bulk.insert_nodes_many(nodes, lang="en") == 2
+        assert bulk.insert_edges_many((n.type, n.id, e) for n in nodes for e in n.edges) == 3
+
+    for table in ("nodes", "edges"):
+        q = f"SELECT * FROM {table} ORDER BY 1, 2, 3"
+        assert bulk.conn.execute(q).fetchall() == per_row.conn.execute(q).fetchall()
+    index_names = {row[0] for row in bulk.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert set(INDEXES) <= index_names
+    per_row.close()
+    bulk.close()
+
+
+def test_interrupted_bulk_load_leaves_indexes_and_triggers(tmp_path):
+    import sqlite3
+    from whitetreebible.connections.models.node_model import NodeModel
+    from whitetreebible.connections.sqlite_db import INDEXES, NODE_SEARCH_TRIGGERS
+    path = os.path.join(tmp_path, "test.db")
+    expected = set(INDEXES) | set(NODE_SEARCH_TRIGGERS)
+
+    def schema_names():
+        conn = sqlite3.connect(path)
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')")}
+        conn.close()
+        return names
+
+    db = SqliteDB(path)
+    with db.bulk_load():
+        db.insert_nodes_many([NodeModel({"id": "boaz", "type": "person", "name": {"en": "Boaz"}})], lang="en")
+        # the drops are not committed, a process killed here leaves the file with its indexes and triggers
+        assert expected <= schema_names()
+    db.close()
+
+    # a database an older import left without them gets them back on the next open
+    conn = sqlite3.connect(path)
+    conn.execute("DROP INDEX idx_edges_source_type_target")
+    conn.execute("DROP TRIGGER nodes_search_insert")
+    conn.execute("INSERT INTO nodes (id, type, lang, name) VALUES ('ruth', 'person', 'en', 'Ruth')")
+    conn.commit()
+    conn.close()
+    db = SqliteDB(path)
+    assert expected <= schema_names()
+    assert [row["id"] for row in db.search_nodes("ruth")] == ["ruth"]
+    db.close()
+
+
+def test_open_readonly_and_in_memory(db):
+    import sqlite3
+    from whitetreebible.connections.models.node_model import NodeModel
+    db.insert_node(NodeModel({"id": "abraham", "type": "person", "name": {"en": "Abraham"}}))
+    db.conn.commit()
+
+    readonly = SqliteDB.open_readonly(db.db_path)
+    assert readonly.select_name("person", "abraham") == "Abraham"
+    with pytest.raises(sqlite3.OperationalError):
+        readonly.conn.execute("DELETE FROM edges")
+    readonly.close()
+
+    memory = SqliteDB.open_in_memory(db.db_path)
+    assert memory.traverse_edges("person/abraham", max_depth=0) == db.traverse_edges("person/abraham", max_depth=0)
+    memory.conn.execute("DELETE FROM edges")
+    assert db.conn.execute("SELECT COUNT(*) FROM edges").fetchone()[0] == len(EDGES)
+    memory.close()
+
+
+def test_name_cache_is_invalidated_by_writes(db):
+    from whitetreebible.connections.models.node_model import NodeModel
+    db.insert_node(NodeModel({"id": "isaac", "type": "person", "name": {"en": "Isaac"}, "name_disambiguous": {"en": "Isaac (son of Abraham)"}}))
+    assert db.select_names(["person/isaac", "person/nobody"]) == {
+        "person/isaac": ("Isaac", "Isaac (son of Abraham)"),
+        "person/nobody": (None, None),
+    }
+    db.insert_node(NodeModel({"id": "jacob", "type": "person", "name": {"en": "Jacob"}}))
+    assert db.select_name("person", "jacob") == "Jacob"
+    # writes through the raw connection, like ManualEditor's rename, are picked up too
+    db.conn.execute("UPDATE nodes SET id = 'israel' WHERE id = 'jacob'")
+    db.conn.commit()
+    assert db.select_name("person", "jacob") is None
+    assert db.select_name("person", "israel") == "Jacob"
+
+
+def test_search_nodes_ranks_like_linear_search(tmp_path):
+    from whitetreebible.connections.manual_editor import NodeInfo
+    from whitetreebible.connections.models.node_model import NodeModel
+    from whitetreebible.connections.node_search import linear_search
+    db = SqliteDB(os.path.join(tmp_path, "test.db"))
+    nodes = [
+        ("person", "abraham", "Abraham", "Abraham"),
+        ("person", "abram", "Abram", "Abram (Abraham)"),
+        ("place", "abrahams_well", "Well", "Well of Abraham"),
+        ("person", "boaz", "Boaz", "Boaz"),
+        ("person", "jesse", "Jesse", "Jesse of Bethlehem"),
+        ("place", "bethlehem", "Bethlehem", "Bethlehem"),
+        ("person", "ruth", "Ruth", "Ruth the Moabite"),
+    ]
+    for node_type, node_id, name, disamb in nodes:
+        db.insert_node(NodeModel({"id": node_id, "type": node_type, "name": {"en": name}, "name_disambiguous": {"en": disamb}}))
+    infos = sorted((NodeInfo(*node) for node in nodes), key=lambda x: x.name.lower())
+    for query in ["abraham", "Abra", "bra", "beth", "BOAZ", "h", "ab", "of", "the moab", "zzz", "  ",
+                  " ab", " of", "h ", "ruth ", "m ", " h"]:
+        for limit in (2, 10):
+            expected = [(n.type, n.id) for n in linear_search(infos, query, limit)]
+            assert [(row["type"], row["id"]) for row in db.search_nodes(query, limit=limit)] == expected, (query, limit)
+    assert db.search_nodes("abraham")[0] == {"id": "abraham", "type": "person", "name": "Abraham", "name_disambiguous": "Abraham", "score": 1000}
+    assert [row["id"] for row in db.search_nodes("abraham", type="place")] == ["abrahams_well"]
+    # quotes and FTS5 operators are matched literally
+    assert db.search_nodes('ab"ra') == [] and db.search_nodes("ruth OR boaz") == []
+    db.close()
+
+
+def test_search_nodes_follows_writes(tmp_path):
+    from whitetreebible.connections.models.node_model import NodeModel
+    db = SqliteDB(os.path.join(tmp_path, "test.db"))
+    db.insert_node(NodeModel({"id": "jacob", "type": "person", "name": {"en": "Jacob"}}))
+    # INSERT OR REPLACE drops the old row from the index
+    db.insert_node(NodeModel({"id": "jacob", "type": "person", "name": {"en": "Jakob"}}))
+    assert db.search_nodes("jacob")[0]["name"] == "Jakob"
+    assert db.search_nodes("ako")[0]["id"] == "jacob"
+    assert db.search_nodes("Jacob", type="place") == []
+    # renames through the raw connection, like ManualEditor's
+    db.conn.execute("UPDATE nodes SET id = 'israel' WHERE id = 'jacob'")
+    db.conn.commit()
+    assert db.search_nodes("jacob") == []
+    assert [row["id"] for row in db.search_nodes("isr")] == ["israel"]
+    with db.bulk_load():
+        db.insert_nodes_many([NodeModel({"id": "esau", "type": "person", "name": {"en": "Esau"}})])
+        db.insert_nodes_many([NodeModel({"id": "israel", "type": "person", "name": {"en": "Israel"}})])
+    assert [row["id"] for row in db.search_nodes("esa")] == ["esau"]
+    assert [row["name"] for row in db.search_nodes("israel")] == ["Israel"]
+    db.conn.execute("DELETE FROM nodes WHERE id = 'esau'")
+    assert db.search_nodes("esau") == []
+    db.conn.execute("INSERT INTO node_search (node_search) VALUES ('integrity-check')")
+    db.close()
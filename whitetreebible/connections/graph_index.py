@@ -0,0 +1,165 @@
+from array import array
+from typing import Iterable, Optional
+from whitetreebible.connections.models.edge_model import EdgeModel
+from whitetreebible.connections.models.edge_type import EdgeType, edge_type_of
+from whitetreebible.connections.models.node_model import NodeModel
+from whitetreebible.connections.settings import SUPPORTED_LANGS
+
+# bit position of each edge type in the per-node type masks
+TYPE_BITS = {edge_type: i for i, edge_type in enumerate(EdgeType)}
+
+
+class GraphIndex:
+    """
+    Read-only in-memory copy of the edge graph for traversal heavy readers.
+    Node links are interned to integers and edges live in compact CSR style adjacency arrays
+    (one for outgoing, one for incoming), plus a bitmask per node of the edge types it has in
+    each direction so typed traversals skip nodes without a matching edge.
+    Implements the read API MdFormatters uses (traverse_edges, select_name, select_name_disambiguous,
+    select_names), so it can be passed anywhere a SqliteDB is only read from.
+    """
+    def __init__(self, edges: Iterable[tuple[str, str, str]], names: Optional[dict] = None, db_path: Optional[str] = None):
+        """
+        edges: (source_link, target_link, type) rows, type as value string, db code or EdgeType; duplicates are collapsed
+        names: (type, id, lang) -> (name, name_disambiguous)
+        db_path: database the index was built from, if any
+        """
+        self.db_path = db_path
+        self.names = names or {}
+        self.links: list[str] = []
+        self.link_ids: dict[str, int] = {}
+        self.edge_source = array('i')
+        self.edge_target = array('i')
+        self.edge_type = array('B')
+        seen = set()
+        for source, target, etype in edges:
+            etype = edge_type_of(etype)
+            key = (source, target, etype)
+            if key in seen:
+                continue
+            seen.add(key)
+            self.edge_source.append(self._intern(source))
+            self.edge_target.append(self._intern(target))
+            self.edge_type.append(TYPE_BITS[etype])
+        self._types = list(EdgeType)
+        self._edge_models: list[Optional[EdgeModel]] = [None] * len(self.edge_type)
+        self.out_offsets, self.out_edges, self.out_masks = self._adjacency(self.edge_source)
+        self.in_offsets, self.in_edges, self.in_masks = self._adjacency(self.edge_target)
+
+    @classmethod
+    def from_db(cls, db) -> "GraphIndex":
+        cur = db.conn.cursor()
+        cur.execute("SELECT source, target, type FROM edges")
+        edges = cur.fetchall()
+        cur.execute("SELECT type, id, lang, name, name_disambiguous FROM nodes")
+        names = {(t, i, l): (n, nd) for t, i, l, n, nd in cur.fetchall()}
+        return cls(edges, names=names, db_path=db.db_path)
+
+    @classmethod
+    def from_nodes(cls, nodes: Iterable[NodeModel], langs: Optional[list[str]] = None) -> "GraphIndex":
+        """Build from parsed YAML nodes, with the same names import_yml_to_db would store."""
+        langs = langs or SUPPORTED_LANGS
+        edges = []
+        names = {}
+        for node in nodes:
+            for lang in langs:
+                name = node.name.get(lang, next(iter(node.name.values()), node.id))
+                names[(node.type, node.id, lang)] = (name, node.name_disambiguous.get(lang))
+            for edge in node.edges:
+                edges.append((node.link, edge.target, edge.type.value))
+        return cls(edges, names=names)
+
+    def _intern(self, link: str) -> int:
+        link_id = self.link_ids.get(link)
+        if link_id is None:
+            link_id = len(self.links)
+            self.link_ids[link] = link_id
+            self.links.append(link)
+        return link_id
+
+    def _adjacency(self, endpoint: array) -> tuple[array, array, list[int]]:
+        """Counting sort of edge indices by endpoint node: edges of node n are edges[offsets[n]:offsets[n + 1]]."""
+        count = len(self.links)
+        offsets = array('i', [0] * (count + 1))
+        masks = [0] * count
+        for i, node in enumerate(endpoint):
+            offsets[node + 1] += 1
+            masks[node] |= 1 << self.edge_type[i]
+        for n in range(count):
+            offsets[n + 1] += offsets[n]
+        edges = array('i', [0] * len(endpoint))
+        fill = array('i', offsets[:-1])
+        for i, node in enumerate(endpoint):
+            edges[fill[node]] = i
+            fill[node] += 1
+        return offsets, edges, masks
+
+    def _edge(self, i: int) -> EdgeModel:
+        edge = self._edge_models[i]
+        if edge is None:
+            edge = EdgeModel.from_row((self.links[self.edge_source[i]], self.links[self.edge_target[i]], self._types[self.edge_type[i]]))
+            self._edge_models[i] = edge
+        return edge
+
+    def traverse_edges(self, start_node_link: str, direction: str = "both", types: Optional[list[EdgeType]] = None, max_depth: Optional[int] = None, mode: Optional[str] = None) -> set[EdgeModel]:
+        """
+        Same contract and result as SqliteDB.traverse_edges; mode is accepted for compatibility and ignored.
+        """
+        start = self.link_ids.get(start_node_link)
+        if start is None or (max_depth is not None and max_depth < 0):
+            return set()
+        if types and "*" not in types:
+            type_mask = 0
+            for t in types:
+                try:
+                    type_mask |= 1 << TYPE_BITS[edge_type_of(t)]
+                except ValueError:
+                    continue  # unknown type strings match nothing, like the sql IN filter
+        else:
+            type_mask = (1 << len(TYPE_BITS)) - 1
+        walks = []
+        if direction in ("out", "both"):
+            walks.append((self.out_offsets, self.out_edges, self.out_masks, self.edge_target))
+        if direction in ("in", "both"):
+            walks.append((self.in_offsets, self.in_edges, self.in_masks, self.edge_source))
+
+        collected = set()
+        visited = {start}
+        frontier = [start]
+        depth = 0
+        edge_type = self.edge_type
+        while frontier:
+            next_frontier = []
+            expand = max_depth is None or depth < max_depth
+            for node in frontier:
+                for offsets, adjacency, masks, far_end in walks:
+                    if not masks[node] & type_mask:
+                        continue
+                    for k in range(offsets[node], offsets[node + 1]):
+                        i = adjacency[k]
+                        if not (1 << edge_type[i]) & type_mask:
+                            continue
+                        collected.add(i)
+                        other = far_end[i]
+                        if expand and other not in visited:
+                            visited.add(other)
+                            next_frontier.append(other)
+            frontier = next_frontier
+            depth += 1
+        return {self._edge(i) for i in collected}
+
+    def select_name(self, node_type: str, node_id: str, lang: str = "en") -> Optional[str]:
+        return self.names.get((node_type, node_id, lang), (None, None))[0]
+
+    def select_name_disambiguous(self, node_type: str, node_id: str, lang: str = "en") -> Optional[str]:
+        return self.names.get((node_type, node_id, lang), (None, None))[1]
+
+    def select_names(self, links: Iterable[str], lang: str = "en") -> dict[str, tuple[Optional[str], Optional[str]]]:
+        result = {}
+        for link in links:
+            node_type, _, node_id = link.partition('/')
+            result[link] = self.names.get((node_type, node_id, lang), (None, None))
+        return result
+
+    def close(self):
+        pass
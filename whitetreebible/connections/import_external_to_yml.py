@@ -3,8 +3,11 @@ Script to process a CSV with columns: node_type, source, target, edge_type.
 For each row, verifies that source and target nodes exist (creates if missing),
 adds the specified edge, and adds a reciprocal edge if appropriate.
 
+Nodes are read once, edited in memory and written back when the import ends (or every
+--flush-every rows), see NodeStore.
+
 Usage:
-    python import_external.py <edges.csv>
+    python import_external.py <edges.csv> [--flush-every N]
 CSV example:
     person, Seth, Enos, parent-of
     person, Enos, Seth, child-of
@@ -13,81 +16,158 @@ from whitetreebible.connections.logger import log
 from whitetreebible.connections.models.edge_type import EdgeType, RECIPROCALS
 from whitetreebible.connections.models.node_model import NodeModel, EdgeModel
 from whitetreebible.connections.sqlite_db import SqliteDB
+from typing import Optional
+import argparse
 import csv
 import inquirer
 import os
-import sys
 
 
 DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../data'))
 
 _disambig_cache = {}
 _name_matches_to_add = []  # Track name-matches relationships to add at the end
+_node_directory = None  # NodeDirectory of this run, see get_node_directory
+
+
+def _normalize(value) -> str:
+    return str(value).strip().lower()
+
+
+def _disambiguous_name(node: NodeModel, name: str) -> str:
+    """The node's English name_disambiguous, else one made from name and its first edge."""
+    n_disamb = node.name_disambiguous.get('en', '') if hasattr(node, 'name_disambiguous') else ''
+    if n_disamb:
+        return n_disamb
+    if node.edges:
+        first_edge = node.edges[0]
+        return format_disambiguous_from_edge(node.id, name, first_edge.type, first_edge.target)
+    return format_disambiguous_from_edge(node.id, name, '', '')
+
+
+class NodeDirectory:
+    """
+    Every node an import can link to, from the database and the YAML files under DATA_DIR, as the
+    {"id", "type", "name", "name_disambiguous"} dicts lookup_similar_nodes returns. Entries are keyed
+    by (type, normalized id) and (type, normalized name), so a lookup is a dict access instead of a
+    query and a parse of every YAML file of the type. Load it once per run and add() every node
+    the run creates.
+    """
+    def __init__(self):
+        self.entries: dict[tuple[str, str], dict] = {}
+        # (type, normalized id or name) -> entry keys, in the order the nodes were added
+        self.keys: dict[tuple[str, str], list[tuple[str, str]]] = {}
+
+    @classmethod
+    def load(cls, db_path: str = None, data_dir: str = None) -> "NodeDirectory":
+        """Read every node from the database at db_path (DB_PATH) and the YAML files under data_dir (DATA_DIR)."""
+        directory = cls()
+        try:
+            db = SqliteDB(db_path)
+            try:
+                for node_type, node_id, name, _ in db.select_nodes("en"):
+                    directory._put(node_type, node_id, name, name or f"{node_type}/{node_id}")
+            finally:
+                db.close()
+        except Exception as e:
+            log.warning(f"DB lookup failed: {e}")
+        data_dir = data_dir or DATA_DIR
+        if os.path.exists(data_dir):
+            for type_dir in sorted(os.listdir(data_dir)):
+                type_path = os.path.join(data_dir, type_dir)
+                if not os.path.isdir(type_path):
+                    continue
+                for fname in sorted(os.listdir(type_path)):
+                    if fname.endswith('.yml') or fname.endswith('.yaml'):
+                        try:
+                            directory.add(NodeModel.from_yaml_file(os.path.join(type_path, fname)))
+                        except Exception as e:
+                            log.warning(f"YAML lookup failed for {fname}: {e}")
+        log.info(f"Node directory holds {len(directory.entries)} nodes.")
+        return directory
+
+    def add(self, node: NodeModel):
+        """Add or update node. A node already known from the database keeps its database name and is also found by its YAML name."""
+        n_en = node.name.get('en', '')
+        entry = self.entries.get((_normalize(node.type), _normalize(node.id)))
+        name = entry["name"] if entry is not None and entry["name"] else n_en
+        self._put(node.type, node.id, name, _disambiguous_name(node, name), extra_name=n_en)
+
+    def _put(self, node_type: str, node_id: str, name: str, name_disambiguous: str, extra_name: str = None):
+        entry_key = (_normalize(node_type), _normalize(node_id))
+        entry = self.entries.get(entry_key)
+        if entry is None:
+            entry = self.entries[entry_key] = {"id": node_id, "type": node_type}
+        entry.update(name=name, name_disambiguous=name_disambiguous)
+        for value in (node_id, name, extra_name):
+            if value:
+                keys = self.keys.setdefault((entry_key[0], _normalize(value)), [])
+                if entry_key not in keys:
+                    keys.append(entry_key)
+
+    def lookup(self, node_type: str, name: str) -> list:
+        """Nodes of node_type whose id or name equals name, ignoring case and surrounding whitespace."""
+        return [self.entries[key] for key in self.keys.get((_normalize(node_type), _normalize(name)), [])]
+
+
+def get_node_directory() -> NodeDirectory:
+    """The NodeDirectory of this run, loaded on first use."""
+    global _node_directory
+    if _node_directory is None:
+        _node_directory = NodeDirectory.load()
+    return _node_directory
+
+
+class NodeStore:
+    """
+    Write-back store of the nodes an import session touches, keyed by YAML path. get() reads a file
+    at most once, later rows edit the same NodeModel in memory, and flush() writes only the nodes
+    added or marked dirty since the last flush, each through a temp file renamed over the original.
+    """
+    def __init__(self):
+        self.nodes: dict[str, NodeModel] = {}
+        self.dirty: set[str] = set()
+
+    def get(self, node_type: str, node_id: str) -> tuple[Optional[NodeModel], str]:
+        """The node and its YAML path; the node is None when it has no file and was never added."""
+        path = get_node_yaml_path(node_type, node_id)
+        node = self.nodes.get(path)
+        if node is None and os.path.exists(path):
+            node = self.nodes[path] = NodeModel.from_yaml_file(path)
+        return node, path
+
+    def add(self, node: NodeModel, path: str):
+        self.nodes[path] = node
+        self.dirty.add(path)
+
+    def mark_dirty(self, path: str):
+        self.dirty.add(path)
+
+    def flush(self) -> int:
+        """Write the dirty nodes, returns how many files were written."""
+        for path in sorted(self.dirty):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.nodes[path].to_yaml())
+            os.replace(tmp_path, path)
+        written = len(self.dirty)
+        self.dirty.clear()
+        log.info(f"Wrote {written} nodes.")
+        return written
+
+
+_node_store = NodeStore()  # nodes of this import session
 
 
 def lookup_similar_nodes(node_type: str, name: str) -> list:
     """
-    Try to find similar nodes by name using the DB if available, else scan YAML files.
+    Find the nodes of node_type whose id or English name equals name (case insensitive), in the
+    database or the YAML files, through the run's NodeDirectory.
     Returns a list of (id, type, name, name_disambiguous) dicts.
     If name_disambiguous is empty, construct it from name and first edge, or fallback to type/id.
     """
-    results = []
-    name_norm = name.strip().lower()
-    seen_ids = set()
-    # Always check DB
-    try:
-        db = SqliteDB()
-        cur = db.conn.cursor()
-        cur.execute("SELECT id, type, name FROM nodes WHERE type = ?", (node_type,))
-        for row in cur.fetchall():
-            node_id, ntype, n_en = row[0], row[1], row[2]
-            node_id_norm = str(node_id).strip().lower()
-            n_en_norm = str(n_en).strip().lower()
-            if name_norm == node_id_norm or name_norm == n_en_norm:
-                yaml_path = get_node_yaml_path(ntype, node_id)
-                n_disamb = ''
-                if os.path.exists(yaml_path):
-                    try:
-                        node = NodeModel.from_yaml_file(yaml_path)
-                        n_disamb = node.name_disambiguous.get('en', '') if hasattr(node, 'name_disambiguous') else ''
-                        if not n_disamb:
-                            if node.edges:
-                                first_edge = node.edges[0]
-                                n_disamb = format_disambiguous_from_edge(node_id, n_en, first_edge.type, first_edge.target)
-                            else:
-                                n_disamb = format_disambiguous_from_edge(node_id, n_en, '', '')
-                    except Exception:
-                        n_disamb = n_en or f"{ntype}/{node_id}"
-                else:
-                    n_disamb = n_en or f"{ntype}/{node_id}"
-                results.append({"id": node_id, "type": ntype, "name": n_en, "name_disambiguous": n_disamb})
-                seen_ids.add((ntype, node_id_norm))
-    except Exception as e:
-        log.warning(f"DB lookup failed: {e}")
-    # Always check YAML files
-    data_dir = os.path.join(DATA_DIR, node_type.lower())
-    if os.path.exists(data_dir):
-        for fname in os.listdir(data_dir):
-            if fname.endswith('.yml') or fname.endswith('.yaml'):
-                path = os.path.join(data_dir, fname)
-                node_id_from_file = os.path.splitext(fname)[0].strip().lower()
-                try:
-                    node = NodeModel.from_yaml_file(path)
-                    n_en = node.name.get('en', '')
-                    n_en_norm = n_en.strip().lower()
-                    n_disamb = node.name_disambiguous.get('en', '') if hasattr(node, 'name_disambiguous') else ''
-                    if not n_disamb:
-                        if node.edges:
-                            first_edge = node.edges[0]
-                            n_disamb = format_disambiguous_from_edge(node.id, n_en, first_edge.type, first_edge.target)
-                        else:
-                            n_disamb = format_disambiguous_from_edge(node.id, n_en, '', '')
-                    # Match on filename or name_en
-                    if (name_norm == node_id_from_file or name_norm == n_en_norm) and (node.type, node_id_from_file) not in seen_ids:
-                        results.append({"id": node.id, "type": node.type, "name": n_en, "name_disambiguous": n_disamb})
-                        seen_ids.add((node.type, node_id_from_file))
-                except Exception as e:
-                    log.warning(f"YAML lookup failed for {fname}: {e}")
+    results = get_node_directory().lookup(node_type, name) if name.strip() else []
     log.info(f"lookup_similar_nodes('{node_type}', '{name}') found {len(results)} matches: {[r['id'] for r in results]}")
     return results
 
@@ -185,17 +265,9 @@ def create_name_matches_edges():
             node2.edges.append(EdgeModel(edge_data))
             log.info(f"Added name-matches: {node2.link} -> {node1.link}")
 
-        # Save both nodes
-        node1_path = get_node_yaml_path(node1.type, node1.id)
-        node2_path = get_node_yaml_path(node2.type, node2.id)
-        
-        os.makedirs(os.path.dirname(node1_path), exist_ok=True)
-        os.makedirs(os.path.dirname(node2_path), exist_ok=True)
-        
-        with open(node1_path, 'w', encoding='utf-8') as f:
-            f.write(node1.to_yaml())
-        with open(node2_path, 'w', encoding='utf-8') as f:
-            f.write(node2.to_yaml())
+        # Both nodes are written with the next flush
+        _node_store.add(node1, get_node_yaml_path(node1.type, node1.id))
+        _node_store.add(node2, get_node_yaml_path(node2.type, node2.id))
 
 
 
@@ -203,8 +275,10 @@ def get_or_create_node(node_type: str, name: str, bible_ref: str, context: str,
     cache_key = (node_type, name, bible_ref)
     if cache_key in _disambig_cache:
         node_id = _disambig_cache[cache_key]
-        yaml_path = get_node_yaml_path(node_type, node_id)
-        node = NodeModel.from_yaml_file(yaml_path) if os.path.exists(yaml_path) else NodeModel({"id": node_id, "type": node_type, "name": {"en": name}, "edges": []})
+        node, yaml_path = _node_store.get(node_type, node_id)
+        if node is None:
+            node = NodeModel({"id": node_id, "type": node_type, "name": {"en": name}, "edges": []})
+            _node_store.add(node, yaml_path)
         return node, yaml_path
     # Look for similar nodes
     matches = lookup_similar_nodes(node_type, name)
@@ -229,8 +303,11 @@ def get_or_create_node(node_type: str, name: str, bible_ref: str, context: str,
         if answer in [m['id'] for m in matches]:
             node_id = answer
             _disambig_cache[cache_key] = node_id
-            yaml_path = get_node_yaml_path(node_type, node_id)
-            node = NodeModel.from_yaml_file(yaml_path)
+            node, yaml_path = _node_store.get(node_type, node_id)
+            if node is None:
+                # known to the database only
+                node = NodeModel({"id": node_id, "type": node_type, "name": {"en": name}, "edges": []})
+                _node_store.add(node, yaml_path)
             return node, yaml_path
         if answer is None or (isinstance(answer, str) and answer.startswith('Create new:')):
             default_id = f"{node_id}_{bible_ref.lower().replace(' ', '_').replace(':', '_')}"
@@ -246,7 +323,7 @@ def get_or_create_node(node_type: str, name: str, bible_ref: str, context: str,
                         existing_yaml_path = get_node_yaml_path(match['type'], match['id'])
                         if os.path.exists(existing_yaml_path):
                             try:
-                                existing_node = NodeModel.from_yaml_file(existing_yaml_path)
+                                existing_node, _ = _node_store.get(match['type'], match['id'])
                                 # We'll create the new node below, then add the relationship
                                 # Store for later processing
                                 add_name_matches_relationship(name, None, existing_node)  # placeholder for new node
@@ -287,130 +364,135 @@ def get_or_create_node(node_type: str, name: str, bible_ref: str, context: str,
         if placeholder_node is None and base_name == name:
             _name_matches_to_add[i] = (base_name, node, existing_node)
     
+    # later rows find it without waiting for its YAML file
+    get_node_directory().add(node)
+    _node_store.add(node, yaml_path)
     log.info(f"New node: {node_type}/{node_id}")
     return node, yaml_path
 
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python import_external.py <edges.csv>")
-        sys.exit(1)
-    file_path = sys.argv[1]
-    with open(file_path, newline='', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile, fieldnames=[
-            "source", "edge_type", "target",
-            "ref_bible", "ref_footnote_anchor", "ref_footnote_text"
-        ])
-        for row in reader:
-            # skip header
-            if row["source"] == "source":
-                continue
-            s_type, s_name = row["source"].strip().split('/')
-            edge_type = EdgeType(row["edge_type"].strip())
-            t_type, t_name = row["target"].strip().split('/')
-            ref_bible = None
-            if row["ref_bible"] is not None:
-                ref_bible = row["ref_bible"].strip()
-            ref_footnote_anchor = None
-            if row["ref_footnote_anchor"] is not None:
-                ref_footnote_anchor = row["ref_footnote_anchor"].strip()
-            ref_footnote_text = None
-            if row["ref_footnote_text"] is not None:
-                ref_footnote_text = row["ref_footnote_text"].strip()
-
-            # Get or create source and target nodes
-            readable_edge = edge_type.for_lang(lang="en")
-            context = f"{s_name} {readable_edge} {t_name}"
+    parser = argparse.ArgumentParser(description="Add the nodes and edges of a CSV to the YAML files.")
+    parser.add_argument("csv_path", help="CSV with source, edge_type, target, ref_bible, ref_footnote_anchor, ref_footnote_text columns")
+    parser.add_argument("--flush-every", type=int, default=0, metavar="N",
+                        help="also write the changed YAML files every N rows (default: only at the end)")
+    args = parser.parse_args()
+    file_path = args.csv_path
+    written = 0
+    try:
+        with open(file_path, newline='', encoding='utf-8') as csvfile:
+            reader = csv.DictReader(csvfile, fieldnames=[
+                "source", "edge_type", "target",
+                "ref_bible", "ref_footnote_anchor", "ref_footnote_text"
+            ])
+            for row_number, row in enumerate(reader, 1):
+                # skip header
+                if row["source"] == "source":
+                    continue
+                s_type, s_name = row["source"].strip().split('/')
+                edge_type = EdgeType(row["edge_type"].strip())
+                t_type, t_name = row["target"].strip().split('/')
+                ref_bible = None
+                if row["ref_bible"] is not None:
+                    ref_bible = row["ref_bible"].strip()
+                ref_footnote_anchor = None
+                if row["ref_footnote_anchor"] is not None:
+                    ref_footnote_anchor = row["ref_footnote_anchor"].strip()
+                ref_footnote_text = None
+                if row["ref_footnote_text"] is not None:
+                    ref_footnote_text = row["ref_footnote_text"].strip()
+
+                # Get or create source and target nodes
+                readable_edge = edge_type.for_lang(lang="en")
+                context = f"{s_name} {readable_edge} {t_name}"
             
-            # First create target node (needed for source node's disambiguous name)
-            reciprocal_edge = RECIPROCALS.get(edge_type) if edge_type in RECIPROCALS else None
-            target_node, target_path = get_or_create_node(t_type, t_name, ref_bible, context=context, 
-                                                        edge_type=reciprocal_edge, target_link=f"{s_type}/{s_name}")
+                # First create target node (needed for source node's disambiguous name)
+                reciprocal_edge = RECIPROCALS.get(edge_type) if edge_type in RECIPROCALS else None
+                target_node, target_path = get_or_create_node(t_type, t_name, ref_bible, context=context, 
+                                                            edge_type=reciprocal_edge, target_link=f"{s_type}/{s_name}")
             
-            # Then create source node with target info
-            source_node, source_path = get_or_create_node(s_type, s_name, ref_bible, context=context, 
-                                                        edge_type=edge_type, target_link=target_node.link)
-
-
-            # Build refs, including bible and footnote refs
-            edge_refs = []
-            if ref_bible:
-                # remove quotes if present
-                ref_bible = ref_bible.strip('"').strip("'")
-                edge_refs.append(f"bible:{ref_bible}")
-
-            # Add footnote to node's footnotes dict if anchor/text present
-            anchor = ref_footnote_anchor if ref_footnote_anchor else ''
-            text = ref_footnote_text if ref_footnote_text else ''
-            if anchor:
-                # Add to source_node.footnotes (create if missing)
-                if not hasattr(source_node, 'footnotes') or source_node.footnotes is None:
-                    source_node.footnotes = {}
-                if anchor not in source_node.footnotes:
-                    source_node.footnotes[anchor] = {"en": text} if text else {}
-                elif text:
-                    # Update text if anchor exists but text is missing
-                    if not source_node.footnotes[anchor].get("en"):
-                        source_node.footnotes[anchor]["en"] = text
-                # Add footnote:<anchor> to refs
-                edge_refs.append(f"footnote:{anchor}")
-
-            # Check for existing edge in source_node
-            found = False
-            for edge in source_node.edges:
-                if edge.target == target_node.link and edge.type == edge_type:
-                    for ref in edge_refs:
-                        if ref and ref not in edge.refs:
-                            edge.refs.append(ref)
-                    found = True
-                    break
-            if not found:
-                edge_data = {
-                    "target": target_node.link,
-                    "type": edge_type,
-                    "refs": edge_refs
-                }
-                source_node.edges.append(EdgeModel(edge_data))
-
-            # Add reciprocal edge if defined
-            if edge_type in RECIPROCALS:
-                reciprocal = RECIPROCALS[edge_type]
-                recip_found = False
-                # Only mirror non-footnote refs (e.g., bible refs) to reciprocal edge
-                mirrored_refs = [ref for ref in edge_refs if not (isinstance(ref, str) and ref.startswith("footnote:"))]
-                for edge in target_node.edges:
-                    edge_type_val = edge.type.value if hasattr(edge.type, 'value') else edge.type
-                    if edge.target == source_node.link and edge_type_val == reciprocal:
-                        for ref in mirrored_refs:
+                # Then create source node with target info
+                source_node, source_path = get_or_create_node(s_type, s_name, ref_bible, context=context, 
+                                                            edge_type=edge_type, target_link=target_node.link)
+
+
+                # Build refs, including bible and footnote refs
+                edge_refs = []
+                if ref_bible:
+                    # remove quotes if present
+                    ref_bible = ref_bible.strip('"').strip("'")
+                    edge_refs.append(f"bible:{ref_bible}")
+
+                # Add footnote to node's footnotes dict if anchor/text present
+                anchor = ref_footnote_anchor if ref_footnote_anchor else ''
+                text = ref_footnote_text if ref_footnote_text else ''
+                if anchor:
+                    # Add to source_node.footnotes (create if missing)
+                    if not hasattr(source_node, 'footnotes') or source_node.footnotes is None:
+                        source_node.footnotes = {}
+                    if anchor not in source_node.footnotes:
+                        source_node.footnotes[anchor] = {"en": text} if text else {}
+                    elif text:
+                        # Update text if anchor exists but text is missing
+                        if not source_node.footnotes[anchor].get("en"):
+                            source_node.footnotes[anchor]["en"] = text
+                    # Add footnote:<anchor> to refs
+                    edge_refs.append(f"footnote:{anchor}")
+
+                # Check for existing edge in source_node
+                found = False
+                for edge in source_node.edges:
+                    if edge.target == target_node.link and edge.type == edge_type:
+                        for ref in edge_refs:
                             if ref and ref not in edge.refs:
                                 edge.refs.append(ref)
-                        recip_found = True
+                        found = True
                         break
-                if not recip_found:
-                    recip_edge_data = {
-                        "target": source_node.link,
-                        "type": reciprocal,
-                        "refs": mirrored_refs
+                if not found:
+                    edge_data = {
+                        "target": target_node.link,
+                        "type": edge_type,
+                        "refs": edge_refs
                     }
-                    target_node.edges.append(EdgeModel(recip_edge_data))
-
-            # Save updated YAML (write only once after all edge modifications)
-            source_str = source_node.to_yaml()
-            target_str = target_node.to_yaml()
-            log.info(f"New edge: {source_node.link} {edge_type} {target_node.link}")
-            # Ensure parent directories exist before writing
-            os.makedirs(os.path.dirname(source_path), exist_ok=True)
-            os.makedirs(os.path.dirname(target_path), exist_ok=True)
-            with open(source_path, 'w', encoding='utf-8') as f:
-                f.write(source_str)
-            with open(target_path, 'w', encoding='utf-8') as f:
-                f.write(target_str)
+                    source_node.edges.append(EdgeModel(edge_data))
+
+                # Add reciprocal edge if defined
+                if edge_type in RECIPROCALS:
+                    reciprocal = RECIPROCALS[edge_type]
+                    recip_found = False
+                    # Only mirror non-footnote refs (e.g., bible refs) to reciprocal edge
+                    mirrored_refs = [ref for ref in edge_refs if not (isinstance(ref, str) and ref.startswith("footnote:"))]
+                    for edge in target_node.edges:
+                        edge_type_val = edge.type.value if hasattr(edge.type, 'value') else edge.type
+                        if edge.target == source_node.link and edge_type_val == reciprocal:
+                            for ref in mirrored_refs:
+                                if ref and ref not in edge.refs:
+                                    edge.refs.append(ref)
+                            recip_found = True
+                            break
+                    if not recip_found:
+                        recip_edge_data = {
+                            "target": source_node.link,
+                            "type": reciprocal,
+                            "refs": mirrored_refs
+                        }
+                        target_node.edges.append(EdgeModel(recip_edge_data))
+
+                # Written with the next flush
+                _node_store.mark_dirty(source_path)
+                _node_store.mark_dirty(target_path)
+                log.info(f"New edge: {source_node.link} {edge_type} {target_node.link}")
+                if args.flush_every and row_number % args.flush_every == 0:
+                    written += _node_store.flush()
     
-    # Create all pending name-matches relationships
-    create_name_matches_edges()
+        # Create all pending name-matches relationships
+        create_name_matches_edges()
+    finally:
+        # also when a row fails or the session is interrupted, so the rows before it are kept
+        written += _node_store.flush()
     
-    print("Nodes and edges updated in YAML files from CSV.")
+    print(f"Nodes and edges updated in {written} YAML files from CSV.")
     print(f"Added {len(_name_matches_to_add)} name-matches relationships.")
 
 if __name__ == "__main__":
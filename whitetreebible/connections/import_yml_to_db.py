@@ -1,34 +1,54 @@
 from whitetreebible.connections.logger import log
-from whitetreebible.connections.models.node_model import NodeModelCollection
-from whitetreebible.connections.settings import DB_PATH, DATA_DIR, SUPPORTED_LANGS
+from whitetreebible.connections.models.node_model import NodeModel, NodeModelCollection
+from whitetreebible.connections.profiling import add_profile_argument, profiled, profiler
+from whitetreebible.connections.settings import DB_PATH, DATA_DIR, SUPPORTED_LANGS, NODE_CACHE_PATH
 from whitetreebible.connections.sqlite_db import SqliteDB
 from tqdm import tqdm
+from itertools import batched
+from typing import Iterable
 import os
 
-def import_yaml(db: SqliteDB, data_dir: str, clear_existing: bool = True):
-    collection = NodeModelCollection(data_dir)
+def load_nodes(db: SqliteDB, nodes: Iterable[NodeModel], batch_size: int = 1000) -> tuple[int, int]:
+    """
+    Insert nodes (in every supported language) and their edges, batch_size nodes at a time, in one bulk_load.
+    nodes can be any iterable, e.g. a streaming NodeModelCollection.iter_nodes(). Returns (nodes, edges) written.
+    """
+    node_count = 0
+    edge_count = 0
+    # one transaction for the whole corpus, edge indexes are built once at the end
+    with db.bulk_load():
+        for batch in batched(nodes, batch_size):
+            for lang in SUPPORTED_LANGS:
+                db.insert_nodes_many(nodes=batch, lang=lang)
+            edge_count += db.insert_edges_many((node.type, node.id, edge) for node in batch for edge in node.edges)
+            node_count += len(batch)
+    return node_count, edge_count
+
+
+def import_yaml(db: SqliteDB, data_dir: str, clear_existing: bool = True, cache_path: str = None, batch_size: int = 1000):
+    # nodes are streamed in batches, so memory stays bounded by batch_size however large the corpus
+    collection = NodeModelCollection(data_dir, cache_path=cache_path, lazy=True)
     # delete old db
     if os.path.exists(DB_PATH) and clear_existing:
         os.remove(DB_PATH)
         log.info(f"Deleted old database at {DB_PATH}.")
     db = SqliteDB(DB_PATH)
-    nodes = collection.get_nodes()
-    log.info(f"Importing {len(nodes)} nodes from {DATA_DIR} into {DB_PATH}...")
-    edges = 0
-    for node in tqdm(nodes, desc="Importing nodes"):
-        for lang in SUPPORTED_LANGS:
-            db.insert_node(node=node, lang=lang)
-        for edge in node.edges:
-            db.insert_edge(source_type=node.type, source_id=node.id, edge=edge)
-            edges += 1
-    log.info(f"Imported {len(nodes)} nodes and {edges} edges into {DB_PATH}.")
+    log.info(f"Importing nodes from {DATA_DIR} into {DB_PATH}...")
+    nodes, edges = load_nodes(db, tqdm(collection.iter_nodes(), desc="Importing nodes"), batch_size=batch_size)
+    log.info(f"Imported {nodes} nodes and {edges} edges into {DB_PATH}.")
 
 
 
 def main():
-    db = SqliteDB(DB_PATH)
-    import_yaml(db=db, data_dir=DATA_DIR)
-    db.close()
+    import argparse
+    parser = argparse.ArgumentParser(description="Import the YAML node data into the sqlite database.")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    with profiled(args.profile, trace_sql=args.trace_sql):
+        db = SqliteDB(DB_PATH)
+        with profiler.timer("stage.import_yaml"):
+            import_yaml(db=db, data_dir=DATA_DIR, cache_path=NODE_CACHE_PATH)
+        db.close()
 
 
     
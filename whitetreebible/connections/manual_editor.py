@@ -16,9 +16,10 @@ from whitetreebible.connections.logger import log
 from whitetreebible.connections.models.node_model import NodeModel, NodeModelCollection, NodeType
 from whitetreebible.connections.models.edge_model import EdgeModel
 from whitetreebible.connections.models.edge_type import EdgeType, RECIPROCALS
+from whitetreebible.connections.node_search import NodeSearchIndex
 from whitetreebible.connections.sqlite_db import SqliteDB
 from whitetreebible.connections.settings import DATA_DIR, DB_PATH
-from whitetreebible.connections.import_external_to_yml import lookup_similar_nodes, get_node_yaml_path
+from whitetreebible.connections.import_external_to_yml import get_node_yaml_path
 
 
 @dataclass
@@ -43,6 +44,7 @@ class ManualEditor:
         self.db_path = db_path
         self.db = SqliteDB(db_path)
         self._all_nodes_cache = None
+        self._search_index = None
         self._edge_types_cache = None
         
     def close(self):
@@ -57,24 +59,12 @@ class ManualEditor:
         self.close()
     
     def get_all_nodes(self) -> List[NodeInfo]:
-        """Get all nodes from database for autocomplete."""
+        """Get all nodes from database for autocomplete, names included, with a single query."""
         if self._all_nodes_cache is None:
             nodes = []
             try:
-                cur = self.db.conn.cursor()
-                cur.execute("SELECT DISTINCT id, type FROM nodes")
-                for row in cur.fetchall():
-                    node_id, node_type = row
-                    # Get name and name_disambiguous from database
-                    name = self.db.select_name(node_type, node_id, "en") or node_id
-                    yaml_path = get_node_yaml_path(node_type, node_id)
-                    name_disamb = ""
-                    if os.path.exists(yaml_path):
-                        try:
-                            node = NodeModel.from_yaml_file(yaml_path)
-                            name_disamb = node.name_disambiguous.get('en', '') if hasattr(node, 'name_disambiguous') else ''
-                        except Exception:
-                            pass
+                for node_type, node_id, name, name_disamb in self.db.select_nodes("en"):
+                    name = name or node_id
                     nodes.append(NodeInfo(
                         type=node_type,
                         id=node_id,
@@ -109,37 +99,35 @@ class ManualEditor:
         return os.path.exists(yaml_path)
     
     def fuzzy_search_nodes(self, query: str, limit: int = 10) -> List[NodeInfo]:
-        """Perform fuzzy search on nodes by name or ID."""
+        """
+        Perform fuzzy search on nodes by name or ID: exact id or name first, then prefix matches, then substring matches,
+        then near misses (typos). Substring matches come from the database's node_search index (SqliteDB.search_nodes);
+        only when they leave room under limit are near misses added from a NodeSearchIndex over get_all_nodes,
+        which is built on the first such search after the node list changes.
+        """
         if not query.strip():
             return []
-        
-        query_lower = query.lower()
+        try:
+            results = [
+                NodeInfo(type=row["type"], id=row["id"], name=row["name"] or row["id"],
+                         name_disambiguous=row["name_disambiguous"] or row["name"] or row["id"])
+                for row in self.db.search_nodes(query, limit=limit)
+            ]
+        except Exception as e:
+            log.warning(f"Could not search nodes in database: {e}")
+            results = []
+        if len(results) == limit:
+            return results
         all_nodes = self.get_all_nodes()
-        matches = []
-        
-        for node in all_nodes:
-            score = 0
-            
-            # Exact match on ID or name gets highest score
-            if query_lower == node.id.lower() or query_lower == node.name.lower():
-                score = 1000
-            # Starts with query gets high score
-            elif (node.id.lower().startswith(query_lower) or 
-                  node.name.lower().startswith(query_lower) or
-                  node.name_disambiguous.lower().startswith(query_lower)):
-                score = 500
-            # Contains query gets medium score
-            elif (query_lower in node.id.lower() or 
-                  query_lower in node.name.lower() or
-                  query_lower in node.name_disambiguous.lower()):
-                score = 100
-            
-            if score > 0:
-                matches.append((score, node))
-        
-        # Sort by score (descending) and take top results
-        matches.sort(key=lambda x: x[0], reverse=True)
-        return [node for score, node in matches[:limit]]
+        if self._search_index is None or self._search_index.nodes is not all_nodes:
+            self._search_index = NodeSearchIndex(all_nodes)
+        found = {node.link for node in results}
+        for node in self._search_index.search(query, limit):
+            if len(results) == limit:
+                break
+            if node.link not in found:
+                results.append(node)
+        return results
     
     def select_node_with_search(self, prompt: str, allow_new: bool = True) -> Optional[NodeInfo]:
         """Select a node using text search with fuzzy matching.
@@ -282,6 +270,9 @@ class ManualEditor:
             log.info(f"✅ Created new node at: {yaml_path}")
             log.info(f"📝 Please edit the file to add description and other details")
             
+            # Add it to the database too, get_all_nodes and searches read nodes from there
+            self.db.insert_node(NodeModel(node_data))
+            
             # Clear cache to include new node
             self._all_nodes_cache = None
             
@@ -573,7 +564,7 @@ class ManualEditor:
             
             # Update database - reimport the changed files
             print("\n🔄 Updating database...")
-            self._update_database_after_rename(node.type, node.id, new_id)
+            self._update_database_after_rename(node.type, node.id, new_id, new_name, new_name_disamb)
             
             # Clear cache to reflect changes
             self._all_nodes_cache = None
@@ -604,9 +595,9 @@ class ManualEditor:
                         updated = False
                         
                         # Update edge targets
-                        for edge in node.edges:
+                        for i, edge in enumerate(node.edges):
                             if edge.target == old_link:
-                                edge.target = new_link
+                                node.edges[i] = edge.replace(target=new_link)
                                 updated = True
                         
                         if updated:
@@ -618,8 +609,9 @@ class ManualEditor:
         
         return updated_files
     
-    def _update_database_after_rename(self, node_type: str, old_id: str, new_id: str):
-        """Update database after renaming a node."""
+    def _update_database_after_rename(self, node_type: str, old_id: str, new_id: str,
+                                      name: Optional[str] = None, name_disambiguous: Optional[str] = None):
+        """Update database after renaming a node, and its English names when given."""
         try:
             old_link = f"{node_type}/{old_id}"
             new_link = f"{node_type}/{new_id}"
@@ -627,6 +619,9 @@ class ManualEditor:
             # Update node entry
             cur = self.db.conn.cursor()
             cur.execute("UPDATE nodes SET id = ? WHERE type = ? AND id = ?", (new_id, node_type, old_id))
+            if name is not None:
+                cur.execute("UPDATE nodes SET name = ?, name_disambiguous = ? WHERE type = ? AND id = ? AND lang = 'en'",
+                            (name, name_disambiguous or name, node_type, new_id))
             
             # Update edges where this node is source
             cur.execute("UPDATE edges SET source = ? WHERE source = ?", (new_link, old_link))
@@ -635,6 +630,7 @@ class ManualEditor:
             cur.execute("UPDATE edges SET target = ? WHERE target = ?", (new_link, old_link))
             
             self.db.conn.commit()
+            self.db.invalidate_name_cache()
             print("✅ Database updated successfully")
             
         except Exception as e:
@@ -1,92 +1,134 @@
+from whitetreebible.connections.graph_index import GraphIndex
 from whitetreebible.connections.logger import log
-from whitetreebible.connections.models.edge_type import EdgeGroups, EdgeType, EDGE_GROUPS_ASSOCIATIONS, RECIPROCALS
+from whitetreebible.connections.models.bible_ref import biblehub_link
+from whitetreebible.connections.models.edge_type import EdgeGroups, EdgeType, EDGE_GROUPS_ASSOCIATIONS, RECIPROCAL_PAIRS
 from whitetreebible.connections.models.edge_model import EdgeModel
 from whitetreebible.connections.models.node_model import NodeModelCollection, NodeModel
-from whitetreebible.connections.settings import SUPPORTED_LANGS
+from whitetreebible.connections.profiling import add_profile_argument, profiled, profiler, tracer
+from whitetreebible.connections.settings import SUPPORTED_LANGS, DB_PATH, NODE_CACHE_PATH, MD_MANIFEST_PATH
 from whitetreebible.connections.sqlite_db import SqliteDB
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import copy
+import hashlib
+import json
+import logging
 import os
 import re
+import time
+from typing import Optional
 
 
 
+INTERNAL_LINK_RE = re.compile(r"\[\[([^\]:]+)\]\]")
+# [[bible:Book 1:2]] captures group 1, [[type/id]] captures group 2
+LINK_RE = re.compile(r"\[\[(?:bible:([^\]]+)|([^\]:]+))\]\]")
+
+
 # Markdown formatters as a class for easy inheritance/extension
 class MdFormatters:
 
+    def __init__(self):
+        # node link -> [links rewritten, seconds spent] across format_links calls for that page,
+        # kept while the profiler is enabled only, otherwise it would hold an entry for every page generated
+        self.link_timings: dict[Optional[str], list] = {}
+
     def format_graphs_by_edge_group(self, db: SqliteDB, node: NodeModel, md, lang):
         lines = [] if not md else [md]
+        if not node.link:
+            return md
+        groups = [(group, types) for group, types in EDGE_GROUPS_ASSOCIATIONS.items() if types]
+        # Fetch the neighbourhood for every group at once, then walk it in memory per group.
+        # A group's walk only reaches nodes the combined walk reaches, so this gives the same edges
+        # as one traverse_edges per group.
+        all_types = sorted({t for _, types in groups for t in types}, key=lambda t: t.value)
+        edges = db.traverse_edges(start_node_link=node.link, direction="both", types=all_types, max_depth=1)
+        neighbourhood = GraphIndex((e.source, e.target, e.type.value) for e in edges)
+        names = db.select_names({link for e in edges for link in (e.source, e.target)}, lang=lang)
         for group in EdgeGroups:
             group_types = EDGE_GROUPS_ASSOCIATIONS.get(group, None)
             if not group_types:
                 continue
             title = group.for_lang(lang=lang, capitalize=True)
+            group_edges = neighbourhood.traverse_edges(start_node_link=node.link, direction="both", types=group_types, max_depth=1)
             graph_md = self.format_graph_connections(
-                db, node, md=None, lang=lang, title=title, types=group_types, direction="both", max_depth=1
+                db, node, md=None, lang=lang, title=title, edges=group_edges, names=names
             )
             lines.append(graph_md)
         return "\n".join(lines)
 
     def filter_edges(self, edges:set[EdgeModel]) -> tuple[list[EdgeModel], list[str]]:
+        """
+        Drop the redundant direction of symmetric and reciprocal edge pairs, returning the kept edges and their arrows.
+        One pass buckets the edges by node pair, a second decides per edge with one RECIPROCAL_PAIRS lookup.
+        The other direction is found by scanning the edge's bucket, which holds at most two edges per edge type,
+        so the work is linear in the number of edges however large the hub.
+        """
+        # edges grouped by unordered node pair, in first seen order
         edge_map = {}
         for edge in edges:
-            key = tuple(sorted([edge.source, edge.target]))
-            if key not in edge_map:
-                edge_map[key] = []
-            edge_map[key].append(edge)
+            source, target = edge.source, edge.target
+            key = (source, target) if source <= target else (target, source)
+            group = edge_map.get(key)
+            if group is None:
+                edge_map[key] = [edge]
+            else:
+                group.append(edge)
 
-        # log.info(edge_map)
+        trace = log.isEnabledFor(logging.DEBUG)
         filtered_edges = []
         arrows = []
-        reciprocal_priority_order = list(RECIPROCALS.keys())
-        # For reciprocal filtering, use the order in RECIPROCALS.keys()
-        for key, group in edge_map.items():
-            edge_lookup = {(e.type, e.source, e.target): e for e in group}
-            used = set()
+        for group in edge_map.values():
+            used = []
             for edge in group:
                 etype = edge.type
                 if etype in used:
                     continue
-                has_reciprocal = etype in RECIPROCALS
-                is_symmetric = RECIPROCALS.get(etype, None) == etype
-                # 1. Symmetric: only keep one direction (source < target for determinism)
-                if is_symmetric:
-                    log.info(f"Symmetric edge {edge.source} {etype} {edge.target}")
-                    used.add(etype)
+                reciprocal = RECIPROCAL_PAIRS.get(etype)
+                # 1. Symmetric: only keep one direction
+                if reciprocal is not None and reciprocal[0] is etype:
+                    if trace:
+                        log.debug(f"Symmetric edge {edge.source} {etype} {edge.target}")
+                    used.append(etype)
                     filtered_edges.append(edge)
                     arrows.append(self.get_arrow_for_edge(edge, symmetrical=True))
-                # 2. Reciprocal: only keep canonical direction (key in RECIPROCALS, source->target)
-                elif has_reciprocal:
-                    reciprocal_edge = edge_lookup.get((RECIPROCALS.get(etype, None), edge.target, edge.source))
-                    log.info(f"Reciprocal edge {edge.source} {etype} {edge.target} (reciprocal: {reciprocal_edge.type if reciprocal_edge else "None found"})")
-                    if reciprocal_edge:
-                        # check if this is the better one, if so keep it, if not, continue
-                        if reciprocal_priority_order.index(etype) < reciprocal_priority_order.index(reciprocal_edge.type):
-                            log.info(f"Keeping edge {edge.source} {etype} {edge.target} over {reciprocal_edge.source} {reciprocal_edge.type} {reciprocal_edge.target}")
-                            used.add(etype)
-                            used.add(reciprocal_edge.type)
-                            filtered_edges.append(edge)
-                            arrows.append(self.get_arrow_for_edge(edge, symmetrical=False))
-                        else:
-                            continue
-                    else:
-                        # log.info(f"Reciprocal edge {edge.source} {etype} {edge.target} has no reciprocal defined, keeping it.")
+                # 2. Reciprocal: only keep the direction whose type comes first in RECIPROCALS
+                elif reciprocal is not None:
+                    reciprocal_type, wins = reciprocal
+                    has_reciprocal_edge = self._has_reverse_edge(group, edge, reciprocal_type)
+                    if trace:
+                        log.debug(f"Reciprocal edge {edge.source} {etype} {edge.target} (reciprocal: {reciprocal_type if has_reciprocal_edge else 'None found'})")
+                    if not has_reciprocal_edge:
                         # the other side doesn't exist (it probably should), display
-                        used.add(etype)
+                        used.append(etype)
+                        filtered_edges.append(edge)
+                        arrows.append(self.get_arrow_for_edge(edge, symmetrical=False))
+                    elif wins:
+                        used.append(etype)
+                        used.append(reciprocal_type)
                         filtered_edges.append(edge)
                         arrows.append(self.get_arrow_for_edge(edge, symmetrical=False))
                 # 3. Symmetric but no reciprocal defined: collapse into one (like enemy/enemy)
-                elif edge_lookup.get((etype, edge.target, edge.source), None):
-                    log.info(f"Symmetric (no reciprocal defined) edge {edge.source} {etype} {edge.target}")
-                    used.add(etype)
+                elif self._has_reverse_edge(group, edge, etype):
+                    if trace:
+                        log.debug(f"Symmetric (no reciprocal defined) edge {edge.source} {etype} {edge.target}")
+                    used.append(etype)
                     filtered_edges.append(edge)
                     arrows.append(self.get_arrow_for_edge(edge, symmetrical=True))
                 # 4. All others: keep
                 else:
-                    # log.info(f"Normal edge {edge.source} {etype} {edge.target}, keeping it.")
-                    used.add(etype)
+                    used.append(etype)
                     filtered_edges.append(edge)
                     arrows.append(self.get_arrow_for_edge(edge, symmetrical=False))
         return filtered_edges, arrows
 
+    @staticmethod
+    def _has_reverse_edge(group: list[EdgeModel], edge: EdgeModel, edge_type: EdgeType) -> bool:
+        """Whether group (the edges between one node pair) has edge_type from edge.target to edge.source."""
+        for other in group:
+            if other.type is edge_type and other.source == edge.target:
+                return True
+        return False
+
 
 
     def get_arrow_for_edge(self, edge:EdgeModel, symmetrical: bool) -> str:
@@ -101,37 +143,39 @@ class MdFormatters:
 
 
 
-    def format_graph_connections(self, db:SqliteDB, node:NodeModel, md, lang:str='en', title="Graph Connections", types: list[EdgeType]=None, direction="both", max_depth=None):
+    def format_graph_connections(self, db:SqliteDB, node:NodeModel, md, lang:str='en', title="Graph Connections", types: list[EdgeType]=None, direction="both", max_depth=None, edges=None, names=None):
         """
         Output a mermaid graph of connections for this node from the db, with customizable parameters.
+        edges and names can be passed in when the caller already fetched them (names must cover every edge endpoint).
         """
         if not node.link:
             return md
 
         # Get edges based on parameters
-        edges = db.traverse_edges(start_node_link=node.link, direction=direction, types=types, max_depth=max_depth)
+        if edges is None:
+            edges = db.traverse_edges(start_node_link=node.link, direction=direction, types=types, max_depth=max_depth)
         # log.info(f"Node {node.link} has {len(edges)} edges for graph.")
+        # sets iterate in hash order, which changes between processes; sort so every run draws the same graph
+        edges = sorted(edges, key=lambda e: (e.source, e.type.value, e.target))
 
         # Collect all node ids/types involved
-        node_links = set()
+        node_links = []
         for edge in edges:
-            node_links.add(edge.source)
-            node_links.add(edge.target)
+            node_links.append(edge.source)
+            node_links.append(edge.target)
+        node_links = list(dict.fromkeys(node_links))
 
         # Get names for all nodes in this graph, using format_links for link formatting
         node_labels = {}
         links = {}
+        if names is None:
+            names = db.select_names(node_links, lang=lang)
         for node_link in node_links:
-            ntype, nid = node_link.split('/')
-            # Use format_links to get the formatted link (as markdown)
-            name = db.select_name(node_type=ntype, node_id=nid, lang=lang)
+            name = names[node_link][0]
             if name:
                 node_labels[node_link] = name
                 # Also store the formatted link
-                partial_node = NodeModel()
-                partial_node.type = ntype
-                partial_node.id = nid
-                links[node_link] = self.format_links(db=db, node=partial_node, lang=lang)
+                links[node_link] = self.internal_link(node_link, names)
             else:
                 node_labels[node_link] = node_link  # fallback to id if name not found
 
@@ -218,6 +262,7 @@ class MdFormatters:
             # Sort groups by edge type display name
             sorted_groups = sorted(edge_groups.items(), key=lambda x: x[0].for_lang(lang=lang))
             
+            names = db.select_names({edge.target for edge in node.edges}, lang=lang)
             for edge_type, edges in sorted_groups:
                 # Collect targets and their references for this edge type
                 targets_with_refs = []
@@ -225,7 +270,7 @@ class MdFormatters:
                     # Check if this is a name_matches edge to use disambiguous name
                     use_disambiguous = edge.type == EdgeType.NAME_MATCHES
                     # Turn target into an id link
-                    target_link = self.format_links(db=db, node=node, md=f"[[{edge.target}]]", lang=lang, use_disambiguous=use_disambiguous)
+                    target_link = self.internal_link(edge.target, names, use_disambiguous=use_disambiguous)
                     # Show refs in readable format (bible:..., footnote:...)
                     ref_strs = []
                     for ref in getattr(edge, 'refs', []):
@@ -305,68 +350,80 @@ class MdFormatters:
         Replace [[bible:Book Chapter:Verse]] with BibleHub links, and [[id]] with /type/id links.
         For internal links, use the localized name from the sqlite db if available.
         If use_disambiguous is True, use name_disambiguous instead of name for internal links.
+        Both link kinds are rewritten in one pass of LINK_RE, with one batched name lookup for the page.
         """
-        db = SqliteDB()
-
-        def biblehub_link(match):
-            ref = match.group(1)
-            try:
-                book, chapterverse = ref.split(' ', 1)
-                book_url = book.lower().replace(' ', '_')
-                if book_url == 'psalm':
-                    book_url = 'psalms'
-                # Handle chapter or chapter:verse
-                if ':' in chapterverse:
-                    chapter, verse = chapterverse.split(':')
-                    if '-' in verse:
-                        verse = ''
-                    else:
-                        verse = f"-{verse}"
-                else:
-                    chapter = chapterverse
-                    verse = ''
-                url = f"https://biblehub.com/context/{book_url}/{chapter}{verse}.htm"
-                return f"[{ref}]({url}){{:target=\"_blank\"}}"
-            except Exception:
-                return ref
-
-        def id_link(match):
-            page_id = match.group(1)
-            # Try to infer type from context (node.type if available)
-            node_type, node_id = page_id.split('/')
-            # Use relative links for internal pages (add trailing slash for MkDocs)
-            url = f"../../{page_id}/"
-            # Try to get localized name from db
-            link_text = page_id
-            if node_type and node_id:
-                if use_disambiguous:
-                    db_name = db.select_name_disambiguous(node_type=node_type, node_id=node_id, lang=lang or "en")
-                    if not db_name:  # fallback to regular name if disambiguous not available
-                        db_name = db.select_name(node_type=node_type, node_id=node_id, lang=lang or "en")
-                else:
-                    db_name = db.select_name(node_type=node_type, node_id=node_id, lang=lang or "en")
-                if db_name:
-                    link_text = db_name
-            return f"[{link_text}]({url})"
-
+        start = time.perf_counter()
         response = None
+        rewrites = 0
         if md:
-            response = re.sub(r"\[\[bible:([^\]]+)\]\]", biblehub_link, md)
-            response = re.sub(r"\[\[([^\]:]+)\]\]", id_link, response)
+            matches = list(LINK_RE.finditer(md))
+            page_ids = {m.group(2) for m in matches if m.group(2) is not None}
+            names = db.select_names(page_ids, lang=lang or "en") if page_ids else {}
+            parts = []
+            pos = 0
+            for match in matches:
+                parts.append(md[pos:match.start()])
+                if match.group(1) is not None:
+                    parts.append(self.biblehub_link(match.group(1)))
+                else:
+                    parts.append(self.internal_link(match.group(2), names, use_disambiguous))
+                pos = match.end()
+            parts.append(md[pos:])
+            response = "".join(parts)
+            rewrites = len(matches)
         elif node:
-            # create an id_link match for the current node
-            id_link_match = re.match(r"\[\[([^\]:]+)\]\]", f"[[{node.type}/{node.id}]]")
-            if id_link_match:
-                response = id_link(match=id_link_match)
+            # create an id link for the current node
+            page_id = f"{node.type}/{node.id}"
+            if INTERNAL_LINK_RE.fullmatch(f"[[{page_id}]]"):
+                response = self.internal_link(page_id, db.select_names([page_id], lang=lang or "en"), use_disambiguous)
+                rewrites = 1
+        if profiler.enabled:
+            stats = self.link_timings.setdefault(node.link if node else None, [0, 0.0])
+            stats[0] += rewrites
+            stats[1] += time.perf_counter() - start
         return response
 
+    def biblehub_link(self, ref: str) -> str:
+        return biblehub_link(ref)
+
+    def internal_link(self, page_id: str, names: dict, use_disambiguous=False) -> str:
+        """
+        Markdown link for a type/id page. names is a select_names result covering page_id.
+        """
+        node_type, node_id = page_id.split('/')
+        # Use relative links for internal pages (add trailing slash for MkDocs)
+        url = f"../../{page_id}/"
+        link_text = page_id
+        if node_type and node_id:
+            name, name_disambiguous = names.get(page_id, (None, None))
+            # fallback to regular name if disambiguous not available
+            db_name = (name_disambiguous or name) if use_disambiguous else name
+            if db_name:
+                link_text = db_name
+        return f"[{link_text}]({url})"
+
+
+
+# bump when formatter output changes so incremental runs regenerate every page
+MANIFEST_VERSION = 1
+
+
+def _digest(value) -> str:
+    return hashlib.sha256(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
 
 
 class MdGenerator:
-    def __init__(self, db: SqliteDB, data_dir="data", docs_dir="docs", formatters=None):
+    def __init__(self, db: SqliteDB, data_dir="data", docs_dir="docs", formatters=None, cache_path=None, manifest_path=None, nodes=None):
+        """
+        manifest_path: when set, generate_all only re-renders pages whose recorded inputs changed
+        (see page_dependencies) and keeps the per-page digests in this json file between runs.
+        nodes: render these nodes instead of loading data_dir.
+        """
         self.db = db    
         self.data_dir = data_dir
         self.docs_dir = docs_dir
+        self.manifest_path = manifest_path
+        self.custom_formatters = formatters
         self.formatter_obj = MdFormatters()
         # Use instance methods as default formatters
         self.formatters = formatters or [
@@ -377,18 +434,101 @@ class MdGenerator:
             self.formatter_obj.format_graphs_by_edge_group,
             self.formatter_obj.format_footnotes,
         ]
-        self.nodes = NodeModelCollection(self.data_dir).get_nodes()
+        # without an explicit node list the data_dir files are streamed one node at a time by generate_all
+        self.nodes = nodes
+        self.collection = NodeModelCollection(self.data_dir, cache_path=cache_path, lazy=True) if nodes is None else None
+
+    def iter_nodes(self):
+        """The nodes to render: the list passed in, or the data_dir YAML files parsed as they are reached."""
+        return iter(self.nodes) if self.nodes is not None else self.collection.iter_nodes()
 
     def ensure_dir(self, path):
         if not os.path.exists(path):
             os.makedirs(path)
 
-    def generate_all(self):
+    def load_manifest(self) -> dict:
+        if not self.manifest_path or not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning(f"Could not read manifest {self.manifest_path} ({e}), regenerating all pages.")
+            return {}
+        if manifest.get("version") != self.manifest_version():
+            return {}
+        return manifest.get("pages", {})
+
+    def save_manifest(self, pages: dict):
+        manifest_dir = os.path.dirname(self.manifest_path)
+        if manifest_dir:
+            self.ensure_dir(manifest_dir)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": self.manifest_version(), "pages": pages}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def manifest_version(self) -> str:
+        # a different formatter chain renders different pages from the same inputs
+        return _digest([MANIFEST_VERSION, [getattr(f, "__qualname__", repr(f)) for f in self.formatters]])
+
+    def page_dependencies(self, node, lang) -> dict:
+        """
+        Digests of everything a page is rendered from: the node's own (language patched) data,
+        the edges around it (the depth 1 traversal the graphs draw, which also covers the neighbours' edges)
+        and the names of every node the page links to or draws.
+        """
+        source = {
+            "id": node.id,
+            "type": node.type,
+            "name": node.name,
+            "name_disambiguous": node.name_disambiguous,
+            "description": node.description,
+            "footnotes": node.footnotes,
+            "edges": [e.to_dict() for e in node.edges],
+        }
+        edges = self.db.traverse_edges(start_node_link=node.link, direction="both", max_depth=1)
+        links = {e.target for e in node.edges}
+        for edge in edges:
+            links.add(edge.source)
+            links.add(edge.target)
+        for text in [json.dumps(node.description, ensure_ascii=False), json.dumps(node.footnotes, ensure_ascii=False)]:
+            links.update(INTERNAL_LINK_RE.findall(text))
+        names = sorted(self.db.select_names(links, lang=lang).items())
+        return {
+            "source": _digest(source),
+            "edges": _digest(sorted((e.source, e.type.value, e.target) for e in edges)),
+            "names": _digest(names),
+        }
+
+    def write_if_changed(self, path, content) -> bool:
+        """Write content unless the file already holds exactly that, so untouched pages keep their mtime."""
+        with profiler.timer("write.md"):
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    if f.read() == content:
+                        return False
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            return True
+
+    def generate_all(self, jobs: int = 1):
+        """
+        Render every node in every supported language. jobs > 1 renders the pages in a process pool,
+        each worker reading from its own read-only connection to the same database file.
+        Serial runs render each page as its node is read, so only one node is held at a time;
+        the pool needs the whole task list up front.
+        """
         supported_langs = SUPPORTED_LANGS
-        for node in self.nodes:
+        incremental = self.manifest_path is not None
+        previous = self.load_manifest() if incremental else {}
+        pages = {}
+        skipped = 0
+        tasks = []
+        for node in self.iter_nodes():
             for lang in supported_langs:
                 # Set up language-aware title and description for formatters
-                node_lang = node
+                node_lang = copy.copy(node)
                 # Patch name_disambiguous
                 name_disamb = getattr(node, 'name_disambiguous', None)
                 if name_disamb and isinstance(name_disamb, dict):
@@ -405,13 +545,73 @@ class MdGenerator:
                 rel_dir = os.path.join(self.docs_dir, lang, node.type) if node.type else os.path.join(self.docs_dir, lang)
                 self.ensure_dir(rel_dir)
                 md_file = os.path.join(rel_dir, f"{node.id}.md")
-                content = self.run_formatters(node_lang, lang)
-                with open(md_file, "w", encoding="utf-8") as f:
-                    f.write(content)
-                log.info(f"Generated {md_file}")
+                if incremental:
+                    deps = self.page_dependencies(node_lang, lang)
+                    pages[md_file] = deps
+                    if previous.get(md_file) == deps and os.path.exists(md_file):
+                        skipped += 1
+                        continue
+                if jobs > 1:
+                    tasks.append((node_lang, lang, md_file))
+                else:
+                    self.render_page(node_lang, lang, md_file)
+        if len(tasks) > 1:
+            self.render_pages_parallel(tasks, jobs)
+        else:
+            for node_lang, lang, md_file in tasks:
+                self.render_page(node_lang, lang, md_file)
+        if incremental:
+            self.save_manifest(pages)
+            log.info(f"Incremental run: {len(pages) - skipped} pages regenerated, {skipped} unchanged.")
+
+    def render_page(self, node, lang, md_file) -> bool:
+        content = self.run_formatters(node, lang)
+        written = self.write_if_changed(md_file, content)
+        if written:
+            log.info(f"Generated {md_file}")
+        return written
+
+    def worker_source(self):
+        """
+        What a render worker needs to read the same data as self.db: the database file to open read-only,
+        the image of an in-memory database, or the GraphIndex itself (it pickles as plain arrays and dicts).
+        """
+        if isinstance(self.db, GraphIndex):
+            return self.db
+        db_file = self.db.database_file()
+        return db_file if db_file else self.db.serialize()
+
+    def render_pages_parallel(self, tasks, jobs: int):
+        """Split tasks into chunks for a pool of jobs workers and log each worker's throughput."""
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        chunks = [tasks[i:i + chunksize] for i in range(0, len(tasks), chunksize)]
+        per_worker = {}
+        t0 = time.perf_counter()
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_render_worker,
+            initargs=(self.worker_source(), self.custom_formatters, profiler.enabled, tracer.enabled),
+        ) as pool:
+            for future in as_completed([pool.submit(_render_chunk, chunk) for chunk in chunks]):
+                pid, rendered, seconds, stats, traced = future.result()
+                profiler.merge(stats)
+                tracer.merge(traced)
+                stats = per_worker.setdefault(pid, [0, 0.0])
+                stats[0] += rendered
+                stats[1] += seconds
+        elapsed = time.perf_counter() - t0
+        for i, (pid, (rendered, seconds)) in enumerate(sorted(per_worker.items()), 1):
+            rate = rendered / seconds if seconds else 0
+            log.info(f"Worker {i} (pid {pid}): {rendered} pages in {seconds:.2f}s ({rate:.0f} pages/s)")
+        log.info(f"Rendered {len(tasks)} pages with {jobs} jobs in {elapsed:.2f}s ({len(tasks) / elapsed:.0f} pages/s)")
 
     def run_formatters(self, node, lang):
         md = ""
+        if profiler.enabled:
+            for formatter in self.formatters:
+                with profiler.timer(f"format.{getattr(formatter, '__name__', type(formatter).__name__)}"):
+                    md = formatter(self.db, node, md, lang)
+            return md
         for formatter in self.formatters:
             md = formatter(self.db, node, md, lang)
         return md
@@ -436,21 +636,72 @@ class MdGenerator:
 
 
 
+# Process pool workers for MdGenerator.render_pages_parallel; one generator per worker process
+_worker_generator = None
+
+
+def _init_render_worker(source, formatters, profile=False, trace_sql=False):
+    """source: a MdGenerator.worker_source() result."""
+    global _worker_generator
+    if profile:
+        profiler.enable()
+    if trace_sql:
+        tracer.enable()
+    if isinstance(source, GraphIndex):
+        db = source
+    elif isinstance(source, bytes):
+        db = SqliteDB.open_serialized(source)
+    else:
+        db = SqliteDB.open_readonly(source)
+    _worker_generator = MdGenerator(db=db, formatters=formatters, nodes=[])
+
+
+def _render_chunk(tasks):
+    t0 = time.perf_counter()
+    for node_lang, lang, md_file in tasks:
+        _worker_generator.render_page(node_lang, lang, md_file)
+    # the stats recorded for this chunk go back with it, so the parent's report covers every worker
+    return os.getpid(), len(tasks), time.perf_counter() - t0, profiler.drain(), tracer.drain()
+
+
+
 def main():
     import argparse
     parser = argparse.ArgumentParser(description="Generate markdown from YAML node data.")
     parser.add_argument('--data-dir', default='data', help='Directory containing YAML node data')
     parser.add_argument('--docs-dir', default='docs', help='Directory to output markdown files')
+    parser.add_argument('--incremental', action='store_true', help='Only regenerate pages whose inputs changed since the last incremental run')
+    parser.add_argument('--jobs', type=int, default=1, help='Render pages in this many worker processes')
+    parser.add_argument('--db-path', default=DB_PATH, help='Sqlite database built by import_yml_to_db')
+    parser.add_argument('--db-mode', choices=['file', 'readonly', 'memory'], default='file',
+                        help='Read the database file directly, open it read-only, or copy it into memory first')
+    parser.add_argument('--graph-index', action='store_true', help='Load the edge graph into an in-memory GraphIndex and render from it')
+    add_profile_argument(parser)
     args = parser.parse_args()
-    try:
-        db = SqliteDB()
-        generator = MdGenerator(db=db, data_dir=args.data_dir, docs_dir=args.docs_dir)
-        generator.generate_all()
-        generator.copy_static_files()
-    except Exception as e:
-        log.error(f"Error occurred: {e}")
-    finally:
-        db.close()  
+    db = None
+    with profiled(args.profile, trace_sql=args.trace_sql):
+        try:
+            with profiler.timer("stage.open_db"):
+                if args.db_mode == 'readonly':
+                    db = SqliteDB.open_readonly(args.db_path)
+                elif args.db_mode == 'memory':
+                    db = SqliteDB.open_in_memory(args.db_path)
+                else:
+                    db = SqliteDB(args.db_path)
+                source = GraphIndex.from_db(db) if args.graph_index else db
+            generator = MdGenerator(
+                db=source, data_dir=args.data_dir, docs_dir=args.docs_dir, cache_path=NODE_CACHE_PATH,
+                manifest_path=MD_MANIFEST_PATH if args.incremental else None,
+            )
+            with profiler.timer("stage.generate_all"):
+                generator.generate_all(jobs=args.jobs)
+            with profiler.timer("stage.copy_static_files"):
+                generator.copy_static_files()
+        except Exception as e:
+            log.error(f"Error occurred: {e}")
+        finally:
+            if db:
+                db.close()
 
 if __name__ == "__main__":
     main()
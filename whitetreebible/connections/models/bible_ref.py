@@ -0,0 +1,93 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+# BibleHub url slug for every book, used to normalize the book name of a ref
+BOOK_SLUGS = {
+    # Old Testament
+    "genesis": "genesis", "exodus": "exodus", "leviticus": "leviticus", "numbers": "numbers",
+    "deuteronomy": "deuteronomy", "joshua": "joshua", "judges": "judges", "ruth": "ruth",
+    "1 samuel": "1_samuel", "2 samuel": "2_samuel", "1 kings": "1_kings", "2 kings": "2_kings",
+    "1 chronicles": "1_chronicles", "2 chronicles": "2_chronicles", "ezra": "ezra", "nehemiah": "nehemiah",
+    "esther": "esther", "job": "job", "psalms": "psalms", "proverbs": "proverbs", "ecclesiastes": "ecclesiastes",
+    "song of songs": "songs", "isaiah": "isaiah", "jeremiah": "jeremiah", "lamentations": "lamentations",
+    "ezekiel": "ezekiel", "daniel": "daniel", "hosea": "hosea", "joel": "joel", "amos": "amos",
+    "obadiah": "obadiah", "jonah": "jonah", "micah": "micah", "nahum": "nahum", "habakkuk": "habakkuk",
+    "zephaniah": "zephaniah", "haggai": "haggai", "zechariah": "zechariah", "malachi": "malachi",
+    # New Testament
+    "matthew": "matthew", "mark": "mark", "luke": "luke", "john": "john", "acts": "acts", "romans": "romans",
+    "1 corinthians": "1_corinthians", "2 corinthians": "2_corinthians", "galatians": "galatians",
+    "ephesians": "ephesians", "philippians": "philippians", "colossians": "colossians",
+    "1 thessalonians": "1_thessalonians", "2 thessalonians": "2_thessalonians", "1 timothy": "1_timothy",
+    "2 timothy": "2_timothy", "titus": "titus", "philemon": "philemon", "hebrews": "hebrews", "james": "james",
+    "1 peter": "1_peter", "2 peter": "2_peter", "1 john": "1_john", "2 john": "2_john", "3 john": "3_john",
+    "jude": "jude", "revelation": "revelation",
+    # Alternate names
+    "psalm": "psalms", "song of solomon": "songs", "song": "songs", "canticles": "songs", "revelations": "revelation",
+    "acts of the apostles": "acts", "qoheleth": "ecclesiastes",
+}
+
+BIBLE_REF_RE = re.compile(
+    r"^\s*(?P<book>(?:[1-3]\s*)?[^\d\s][^\d]*?)\s+(?P<chapter>\d+)"
+    r"(?::(?P<verse_start>\d+)(?:\s*[-–]\s*(?P<verse_end>\d+))?)?\s*$"
+)
+
+
+@dataclass(frozen=True)
+class BibleRef:
+    """A parsed bible reference: book, chapter and an optional verse or verse range."""
+    book: str
+    chapter: int
+    verse_start: Optional[int] = None
+    verse_end: Optional[int] = None
+    text: str = ""
+
+    @property
+    def book_slug(self) -> str:
+        key = " ".join(self.book.lower().split())
+        return BOOK_SLUGS.get(key, key.replace(' ', '_'))
+
+    @property
+    def url(self) -> str:
+        # BibleHub's context pages take a single verse; ranges link to the whole chapter
+        verse = f"-{self.verse_start}" if self.verse_start is not None and self.verse_end is None else ""
+        return f"https://biblehub.com/context/{self.book_slug}/{self.chapter}{verse}.htm"
+
+    def __str__(self) -> str:
+        return self.text or self.canonical()
+
+    def canonical(self) -> str:
+        ref = f"{self.book} {self.chapter}"
+        if self.verse_start is not None:
+            ref += f":{self.verse_start}"
+            if self.verse_end is not None:
+                ref += f"-{self.verse_end}"
+        return ref
+
+
+@lru_cache(maxsize=8192)
+def parse_bible_ref(ref: str) -> Optional[BibleRef]:
+    """Parse 'Book 1', 'Book 1:2' or 'Book 1:2-3' (a leading 'bible:' is ignored). Returns None if it is not a ref."""
+    text = ref[len("bible:"):] if ref.startswith("bible:") else ref
+    match = BIBLE_REF_RE.match(text)
+    if not match:
+        return None
+    verse_start = match.group("verse_start")
+    verse_end = match.group("verse_end")
+    return BibleRef(
+        book=match.group("book").strip(),
+        chapter=int(match.group("chapter")),
+        verse_start=int(verse_start) if verse_start else None,
+        verse_end=int(verse_end) if verse_end else None,
+        text=text,
+    )
+
+
+@lru_cache(maxsize=8192)
+def biblehub_link(ref: str) -> str:
+    """Markdown link to the BibleHub context page for ref, or ref unchanged if it cannot be parsed."""
+    parsed = parse_bible_ref(ref)
+    if parsed is None:
+        return ref
+    return f"[{ref}]({parsed.url}){{:target=\"_blank\"}}"
@@ -1,32 +1,64 @@
 from typing import Any, Dict, List, Union
-from .edge_type import EdgeType
+from .bible_ref import parse_bible_ref
+from .edge_type import edge_type_of
+
+# refs of edges decoded from db rows, which carry none; one shared immutable instance instead of a list per row
+NO_REFS: tuple = ()
+
 
 class EdgeModel:
 
     """
     Data Access Object for an edge (relationship) between nodes in the Connections.
     Each edge connects a source node to a target node with a type, and refs.
+    source, target and type are read-only, they make up the edge's identity and its cached hash;
+    use replace() for a changed copy. refs stays a plain list that can be appended to.
     """
+    __slots__ = ("source", "target", "type", "refs", "_hash")
+
     def __init__(self, data: Dict[str, Any]):
-        self.source: str = data.get("source", "")
-        self.target: str = data.get("target", "")
-        self.type: EdgeType = EdgeType(data.get("type", ""))
-        self.refs: List[Union[str, Dict[str, Any]]] = data.get("refs", [])
+        setattr_ = object.__setattr__
+        setattr_(self, "source", data.get("source", ""))
+        setattr_(self, "target", data.get("target", ""))
+        setattr_(self, "type", edge_type_of(data.get("type", "")))
+        setattr_(self, "refs", data.get("refs", []))
+        setattr_(self, "_hash", None)
+
+    def __setattr__(self, name, value):
+        if name != "refs":
+            raise AttributeError(f"EdgeModel.{name} is read-only, use replace() for a changed copy")
+        object.__setattr__(self, name, value)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, EdgeModel):
             return False
         return (self.source, self.target, self.type) == (other.source, other.target, other.type)
 
     def __hash__(self):
-        return hash((self.source, self.target, self.type))
+        h = self._hash
+        if h is None:
+            h = hash((self.source, self.target, self.type))
+            object.__setattr__(self, "_hash", h)
+        return h
+
+    def __reduce__(self):
+        # pickle and copy go through __init__, slots with a guarded __setattr__ can't be restored directly
+        return (EdgeModel, ({"source": self.source, "target": self.target, "type": self.type, "refs": self.refs},))
+
+    def replace(self, **changes) -> "EdgeModel":
+        """Copy of this edge with some of source, target, type or refs changed."""
+        data = {"source": self.source, "target": self.target, "type": self.type, "refs": list(self.refs)}
+        data.update(changes)
+        return EdgeModel(data)
     
     def to_dict(self) -> Dict[str, Any]:
         return {
             # source is implicit in context for yaml so do not serialize it
             "target": self.target,
             "type": self.type.value if hasattr(self.type, 'value') else str(self.type),
-            "refs": self.refs
+            "refs": self.refs if isinstance(self.refs, list) else list(self.refs)
         }
 
 
@@ -38,17 +70,27 @@ class EdgeModel:
 
     @staticmethod
     def from_row(row: tuple) -> "EdgeModel":
+        """Edge from a (source, target, type) db row; type may be the integer code, the value string or the member."""
         source, target, etype = row
-        return EdgeModel({"source": source, "target": target, "type": etype, "refs": []})
+        # skips __init__ and its dict, this runs for every edge a traversal returns
+        edge = EdgeModel.__new__(EdgeModel)
+        setattr_ = object.__setattr__
+        setattr_(edge, "source", source)
+        setattr_(edge, "target", target)
+        setattr_(edge, "type", edge_type_of(etype))
+        setattr_(edge, "refs", NO_REFS)
+        setattr_(edge, "_hash", None)
+        return edge
 
 
 
     @staticmethod
-    def parse_refs(refs: List[Union[str, Dict[str, Any]]]) -> Dict[str, List[str]]:
+    def parse_refs(refs: List[Union[str, Dict[str, Any]]], structured: bool = False) -> Dict[str, List[Any]]:
         """
         Categorize refs into page_ids, bible refs, and footnotes.
         Supports both [[bible:...]] and bible:... (and footnote:...) formats in refs.
         Returns a dict with keys: 'page', 'bible', 'footnote'.
+        With structured=True the 'bible' entries are BibleRef objects (refs that do not parse stay strings).
         """
         result = {"page": [], "bible": [], "footnote": []}
         for ref in refs:
@@ -68,4 +110,6 @@ class EdgeModel:
                 elif ref.startswith("[^") and ref.endswith("]"):
                     result["footnote"].append(ref)
             # else: ignore dict/other for now
+        if structured:
+            result["bible"] = [parse_bible_ref(ref) or ref for ref in result["bible"]]
         return result
@@ -64,6 +64,11 @@ class EdgeType(Enum):
     
     def __str__(self):
         return self.value
+
+    @property
+    def code(self) -> int:
+        """Stable integer code stored in the edges.type column, see EDGE_TYPE_CODES."""
+        return EDGE_TYPE_CODES[self]
     
     def for_lang(self, lang: str = "en", capitalize = False) -> str:
         value = EDGE_TYPE_LANG_LABELS.get(lang, {}).get(self, self.value)
@@ -72,6 +77,73 @@ class EdgeType(Enum):
         return value
 
 
+# Integer code of each edge type, as stored in the db (edges.type, edge_types.code).
+# Codes are permanent: give new types the next free number and never reuse or renumber one.
+EDGE_TYPE_CODES = {
+    EdgeType.PARENT_OF: 1,
+    EdgeType.CHILD_OF: 2,
+    EdgeType.ANCESTOR_OF: 3,
+    EdgeType.DESCENDANT_OF: 4,
+    EdgeType.MARRIED_TO: 5,
+    EdgeType.RELATED_TO: 6,
+    EdgeType.MEMBER_OF: 7,
+    EdgeType.LEADER_OF: 8,
+    EdgeType.LED_BY: 9,
+    EdgeType.ALLY_OF: 10,
+    EdgeType.ENEMY_OF: 11,
+    EdgeType.CONTEMPORARY_OF: 12,
+    EdgeType.ORIGIN_OF: 13,
+    EdgeType.ASSOCIATED_WITH: 14,
+    EdgeType.RESIDENT_OF: 15,
+    EdgeType.VISITED: 16,
+    EdgeType.BORN_IN: 17,
+    EdgeType.DIED_IN: 18,
+    EdgeType.BURIED_IN: 19,
+    EdgeType.NEAR: 20,
+    EdgeType.ROLE_AS: 21,
+    EdgeType.WORKED_WITH: 22,
+    EdgeType.ASSISTED: 23,
+    EdgeType.TAUGHT: 24,
+    EdgeType.LEARNED_FROM: 25,
+    EdgeType.SENT: 26,
+    EdgeType.RECEIVED_FROM: 27,
+    EdgeType.GAVE_TO: 28,
+    EdgeType.BLESSED: 29,
+    EdgeType.CURSED: 30,
+    EdgeType.ANOINTED: 31,
+    EdgeType.APPOINTED: 32,
+    EdgeType.JUDGED: 33,
+    EdgeType.HEALED: 34,
+    EdgeType.PERSECUTED: 35,
+    EdgeType.SAVED: 36,
+    EdgeType.KILLED: 37,
+    EdgeType.CREATED: 38,
+    EdgeType.DEFEATED: 39,
+    EdgeType.PROMISED: 40,
+    EdgeType.ATTACKED: 41,
+    EdgeType.LOVED: 42,
+    EdgeType.EXTRAMARITAL_WITH: 43,
+    EdgeType.NAME_MATCHES: 44,
+    EdgeType.TYPE_OF: 45,
+    EdgeType.ANTITYPE_OF: 46,
+    EdgeType.EXAMPLE_OF: 47,
+    EdgeType.MENTIONED_WITH: 48,
+    EdgeType.CITED: 49,
+}
+EDGE_TYPES_BY_CODE = {code: edge_type for edge_type, code in EDGE_TYPE_CODES.items()}
+# value string or integer code -> member, so decoding skips the EdgeType(value) lookup machinery
+_EDGE_TYPE_LOOKUP = {**{edge_type.value: edge_type for edge_type in EdgeType}, **EDGE_TYPES_BY_CODE}
+
+
+def edge_type_of(value) -> EdgeType:
+    """EdgeType for a value string, an integer code or a member; raises ValueError like EdgeType(value) otherwise."""
+    edge_type = _EDGE_TYPE_LOOKUP.get(value) if value.__class__ is not EdgeType else value
+    if edge_type is None:
+        return EdgeType(value)
+    return edge_type
+
+
+
 class EdgeGroups(Enum):
     FAMILY = "family"
     SOCIAL = "social/political"
@@ -176,6 +248,17 @@ RECIPROCALS = {
     EdgeType.EXTRAMARITAL_WITH: EdgeType.EXTRAMARITAL_WITH, # symmetric
 }
 
+# When both directions of a reciprocal pair exist, the edge whose type comes first in RECIPROCALS is drawn.
+# Types that only appear as a reciprocal (like associated-with) rank after every key.
+RECIPROCAL_PRIORITY = {edge_type: i for i, edge_type in enumerate(RECIPROCALS)}
+for _edge_type in EdgeType:
+    RECIPROCAL_PRIORITY.setdefault(_edge_type, len(RECIPROCALS))
+# edge type -> (its reciprocal, whether it wins over that reciprocal), so filtering needs one lookup per edge
+RECIPROCAL_PAIRS = {
+    edge_type: (reciprocal, RECIPROCAL_PRIORITY[edge_type] < RECIPROCAL_PRIORITY[reciprocal])
+    for edge_type, reciprocal in RECIPROCALS.items()
+}
+
 
 
 # Localized labels (example: English, Hebrew, Spanish, etc.)
@@ -0,0 +1,158 @@
+import os
+import pickle
+from typing import Any, Dict, Iterator, Optional, Tuple
+from whitetreebible.connections.logger import log
+from whitetreebible.connections.profiling import profiler
+
+# bump when the cached payload changes shape so old sidecars are discarded
+CACHE_FORMAT_VERSION = 2
+
+# A sidecar is a pickled {"version": CACHE_FORMAT_VERSION} header followed by one pickled record per file,
+# (absolute path, mtime_ns, size, pickled data), in ascending path order. The data stays pickled inside
+# its record, so records can be copied without decoding the node and every get() hands out a fresh dict.
+Record = Tuple[str, int, int, bytes]
+
+
+def _stamp(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_records(cache_path: str) -> Iterator[Record]:
+    """Records of the sidecar at cache_path; a missing, corrupt or outdated one reads as empty (or ends early)."""
+    if not os.path.exists(cache_path):
+        return
+    try:
+        with open(cache_path, "rb") as f:
+            header = pickle.load(f)
+            if not isinstance(header, dict) or header.get("version") != CACHE_FORMAT_VERSION:
+                log.info(f"Node cache {cache_path} is from another format, rebuilding.")
+                return
+            while True:
+                try:
+                    record = pickle.load(f)
+                except EOFError:
+                    return
+                yield record
+    except Exception as e:
+        log.warning(f"Node cache {cache_path} is unreadable ({e}), rebuilding.")
+
+
+def _open_for_write(cache_path: str):
+    cache_dir = os.path.dirname(cache_path)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    f = open(f"{cache_path}.tmp", "wb")
+    pickle.dump({"version": CACHE_FORMAT_VERSION}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return f
+
+
+class NodeDataCache:
+    """
+    Pickle sidecar holding the parsed YAML data of every node file, keyed by absolute path.
+    An entry is only reused while the file's mtime and size still match what was recorded,
+    anything else (new, changed, unreadable entry) is reported as a miss and re-parsed by the caller.
+    A missing, corrupt or outdated sidecar is treated as empty and rewritten on save().
+    """
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        self.entries: Dict[str, Tuple[int, int, bytes]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self):
+        with profiler.timer("yaml.cache_load"):
+            for path, mtime, size, payload in _read_records(self.cache_path):
+                self.entries[path] = (mtime, size, payload)
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(os.path.abspath(path))
+        try:
+            mtime, size, payload = entry
+            if (mtime, size) == _stamp(path):
+                data = pickle.loads(payload)
+                if isinstance(data, dict):
+                    self.hits += 1
+                    return data
+        except Exception:
+            pass
+        self.misses += 1
+        return None
+
+    def put(self, path: str, data: Dict[str, Any]):
+        mtime, size = _stamp(path)
+        self.entries[os.path.abspath(path)] = (mtime, size, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def save(self, keep_paths=None):
+        """Write the sidecar atomically. keep_paths drops entries for files that no longer exist."""
+        if keep_paths is not None:
+            keep = {os.path.abspath(p) for p in keep_paths}
+            self.entries = {k: v for k, v in self.entries.items() if k in keep}
+        with _open_for_write(self.cache_path) as f:
+            for path in sorted(self.entries):
+                pickle.dump((path, *self.entries[path]), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f"{self.cache_path}.tmp", self.cache_path)
+
+
+class NodeDataCacheStream:
+    """
+    The same sidecar, read and rewritten in one pass alongside a walk over files in ascending path order,
+    so only the record of the current file is held. get() and put() must be called in that order;
+    records of files the walk skips are kept with keep_others, dropped otherwise.
+    close() replaces the sidecar if anything changed, and only once the walk is complete.
+    """
+    def __init__(self, cache_path: str, keep_others: bool = False):
+        self.cache_path = cache_path
+        self.keep_others = keep_others
+        self.hits = 0
+        self.misses = 0
+        self.changed = False
+        self._records = _read_records(cache_path)
+        self._next = next(self._records, None)
+        self._out = _open_for_write(cache_path)
+
+    def _write(self, record: Record):
+        pickle.dump(record, self._out, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _advance(self, key: Optional[str]):
+        """Pass over the records before key (all of them for None)."""
+        while self._next is not None and (key is None or self._next[0] < key):
+            if self.keep_others:
+                self._write(self._next)
+            else:
+                self.changed = True
+            self._next = next(self._records, None)
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        key = os.path.abspath(path)
+        self._advance(key)
+        if self._next is not None and self._next[0] == key:
+            record, self._next = self._next, next(self._records, None)
+            try:
+                if record[1:3] == _stamp(path):
+                    data = pickle.loads(record[3])
+                    if isinstance(data, dict):
+                        self.hits += 1
+                        self._write(record)
+                        return data
+            except Exception:
+                pass
+            self.changed = True
+        self.misses += 1
+        return None
+
+    def put(self, path: str, data: Dict[str, Any]):
+        self._write((os.path.abspath(path), *_stamp(path), pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)))
+        self.changed = True
+
+    def close(self, complete: bool = True):
+        if complete:
+            self._advance(None)
+        self._records.close()
+        self._out.close()
+        tmp_path = f"{self.cache_path}.tmp"
+        if complete and self.changed:
+            os.replace(tmp_path, self.cache_path)
+        else:
+            os.remove(tmp_path)
@@ -1,14 +1,29 @@
 import yaml
 import os
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from whitetreebible.connections.logger import log
 from whitetreebible.connections.models.edge_model import EdgeModel
+from whitetreebible.connections.models.node_cache import NodeDataCache, NodeDataCacheStream
+from whitetreebible.connections.profiling import profiler
+
+# libyaml's C loader is several times faster than the pure python one, use it when pyyaml was built with it
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_yaml_file(file_path: str) -> Dict[str, Any]:
+    with profiler.timer("yaml.parse"), open(file_path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=YamlLoader)
 
 class NodeModel:
     """
     Data Access Object for a node (person, place, tribe, etc) in the Connections.
     Loads from YAML and provides access to node data and edge relationships.
+    Slotted, so a node carries no per-instance __dict__; __slots__ lists the fields in their YAML order.
     """
+    __slots__ = ("id", "type", "name", "name_disambiguous", "description", "footnotes", "edges")
+
     def __init__(self, data: Dict[str, Any]=None):
         data = data or {}
         self.id: str = data.get("id", "")
@@ -30,14 +45,12 @@ class NodeModel:
 
     @classmethod
     def from_yaml_file(cls, file_path: str) -> "NodeModel":
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
-        return cls(data)
+        return cls(load_yaml_file(file_path))
 
 
 
     def to_yaml(self, file_path: str = None) -> str:
-        data = self.__dict__.copy()
+        data = {field: getattr(self, field) for field in NodeModel.__slots__}
         # Combine edges with the same type and target, keeping unique refs
         edge_map = {}
         for e in self.edges:
@@ -57,7 +70,7 @@ class NodeModel:
         data['edges'] = combined_edges
         yaml_str = yaml.safe_dump(data, sort_keys=False, allow_unicode=True)
         if file_path:
-            with open(file_path, 'w', encoding='utf-8') as f:
+            with profiler.timer("write.yaml"), open(file_path, 'w', encoding='utf-8') as f:
                 f.write(yaml_str)
         return yaml_str
     
@@ -66,21 +79,100 @@ class NodeModel:
 class NodeModelCollection:
     """
     Loads all YAML files in a directory tree into NodeModel objects.
+    Files are read in sorted path order. Pass workers > 1 to parse them in a process pool,
+    the resulting node order is the same as a serial load.
+    Pass cache_path to keep the parsed data in a sidecar so later runs only re-parse changed files.
+    Pass lazy=True to skip the upfront load: get_nodes() then loads on first use, and iter_nodes()
+    streams the files without ever holding the whole corpus.
     """
-    def __init__(self, data_dir: str):
+    def __init__(self, data_dir: str, workers: Optional[int] = None, cache_path: Optional[str] = None, lazy: bool = False):
         self.data_dir = data_dir
+        self.workers = workers
+        self.cache_path = cache_path
         self.nodes: List[NodeModel] = []
-        self._load_all()
+        self._loaded = False
+        if not lazy:
+            self._load_all()
+
+    def _yaml_paths(self, node_types: Optional[Iterable[str]] = None) -> List[str]:
+        roots = [self.data_dir] if node_types is None else [os.path.join(self.data_dir, t) for t in node_types]
+        paths = []
+        for top in roots:
+            for root, _, files in os.walk(top):
+                for file in files:
+                    if file.endswith(('.yml', '.yaml')):
+                        paths.append(os.path.join(root, file))
+        return sorted(paths)
+
+    def _iter_parse(self, paths: List[str]) -> Iterator[Dict[str, Any]]:
+        if self.workers and self.workers > 1 and len(paths) > 1:
+            # workers only parse, they hand back plain dicts which are cheap to pickle
+            chunksize = max(1, len(paths) // (self.workers * 4))
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                yield from pool.map(load_yaml_file, paths, chunksize=chunksize)
+            return
+        for path in paths:
+            yield load_yaml_file(path)
+
+    def _parse(self, paths: List[str]) -> List[Dict[str, Any]]:
+        return list(self._iter_parse(paths))
+
+    def iter_nodes(self, node_types: Optional[Iterable[str]] = None) -> Iterator[NodeModel]:
+        """
+        Yield nodes one at a time, in get_nodes() order, parsing each file only when it is reached.
+        node_types limits the walk to those type directories (data/person for "person").
+        Nothing is retained, so memory stays bounded by one node; with a cache_path the sidecar is
+        read and rewritten record by record alongside the walk, and replaced once the iteration completes.
+        If the collection is already loaded the nodes come from memory.
+        """
+        if self._loaded:
+            wanted = None if node_types is None else set(node_types)
+            for node in self.nodes:
+                if wanted is None or node.type in wanted:
+                    yield node
+            return
+        paths = self._yaml_paths(node_types)
+        if not self.cache_path:
+            for data in self._iter_parse(paths):
+                yield NodeModel(data)
+            return
+        # a filtered walk sees only some paths, keep the other entries
+        cache = NodeDataCacheStream(self.cache_path, keep_others=node_types is not None)
+        complete = False
+        try:
+            for path in paths:
+                data = cache.get(path)
+                if data is None:
+                    data = load_yaml_file(path)
+                    cache.put(path, data)
+                yield NodeModel(data)
+            complete = True
+        finally:
+            cache.close(complete=complete)
 
     def _load_all(self):
-        for root, _, files in os.walk(self.data_dir):
-            for file in files:
-                if file.endswith(('.yml', '.yaml')):
-                    path = os.path.join(root, file)
-                    node = NodeModel.from_yaml_file(path)
-                    self.nodes.append(node)
+        paths = self._yaml_paths()
+        self._loaded = True
+        if not self.cache_path:
+            self.nodes = [NodeModel(data) for data in self._parse(paths)]
+            return
+        cache = NodeDataCache(self.cache_path)
+        datas = [cache.get(path) for path in paths]
+        stale = [path for path, data in zip(paths, datas) if data is None]
+        if stale:
+            parsed = iter(self._parse(stale))
+            for i, data in enumerate(datas):
+                if data is None:
+                    datas[i] = next(parsed)
+                    cache.put(paths[i], datas[i])
+        if stale or len(cache.entries) != len(paths):
+            cache.save(keep_paths=paths)
+        log.info(f"Loaded {len(paths)} nodes from {self.data_dir} ({cache.hits} cached, {len(stale)} parsed).")
+        self.nodes = [NodeModel(data) for data in datas]
 
     def get_nodes(self) -> List[NodeModel]:
+        if not self._loaded:
+            self._load_all()
         return self.nodes
 
 
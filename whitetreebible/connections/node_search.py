@@ -0,0 +1,157 @@
+import heapq
+import math
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Any, Sequence
+
+
+# scores of the match tiers, a higher tier always ranks first
+EXACT_SCORE = 1000
+PREFIX_SCORE = 500
+CONTAINS_SCORE = 100
+# typo tolerant matches score below every substring match, scaled by the share of the query's trigrams
+# they contain; MIN_SIMILARITY of them have to be there
+MIN_SIMILARITY = 0.5
+MAX_FUZZY_SCORE = CONTAINS_SCORE - 1
+MAX_CHAR = chr(0x10FFFF)
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def linear_search(nodes: Sequence[Any], query: str, limit: int = 10) -> list:
+    """
+    Score every node against the query and return the best limit, ties in nodes order:
+    1000 for an exact id or name, 500 when id, name or name_disambiguous starts with it, 100 when one contains it.
+    Kept as the reference implementation for NodeSearchIndex.search (which adds typo tolerant matches below 100).
+    """
+    if not query.strip():
+        return []
+    query_lower = query.lower()
+    matches = []
+    for node in nodes:
+        score = 0
+        if query_lower == node.id.lower() or query_lower == node.name.lower():
+            score = EXACT_SCORE
+        elif (node.id.lower().startswith(query_lower) or
+              node.name.lower().startswith(query_lower) or
+              node.name_disambiguous.lower().startswith(query_lower)):
+            score = PREFIX_SCORE
+        elif (query_lower in node.id.lower() or
+              query_lower in node.name.lower() or
+              query_lower in node.name_disambiguous.lower()):
+            score = CONTAINS_SCORE
+        if score > 0:
+            matches.append((score, node))
+    matches.sort(key=lambda x: x[0], reverse=True)
+    return [node for score, node in matches[:limit]]
+
+
+class NodeSearchIndex:
+    """
+    Prebuilt search over the id, name and name_disambiguous of a fixed list of nodes (anything with
+    those attributes, e.g. ManualEditor's NodeInfo). Results rank like linear_search: by tier,
+    then by position in nodes. The fields are lowercased once here, and each query touches
+    only the candidates its tier can come from:
+    - exact: a dict from lowercased id and name to positions
+    - prefix: bisect into the sorted (field, position) pairs
+    - contains: the shortest trigram posting list of the query, checked with `in`
+      (queries under three characters walk the fields in position order until enough match)
+    - typo tolerant: nodes sharing at least MIN_SIMILARITY of the query's trigrams, only searched
+      when the tiers above found fewer than limit nodes
+    Rebuild the index when the node list changes.
+    """
+    def __init__(self, nodes: Sequence[Any]):
+        self.nodes = nodes
+        self.fields: list[tuple[str, str, str]] = []
+        exact = defaultdict(list)
+        postings = defaultdict(list)
+        keys = []
+        key_positions = []
+        for pos, node in enumerate(nodes):
+            fields = (node.id.lower(), node.name.lower(), node.name_disambiguous.lower())
+            self.fields.append(fields)
+            for value in {fields[0], fields[1]}:
+                exact[value].append(pos)
+            for value in set(fields):
+                keys.append(value)
+                key_positions.append(pos)
+            for gram in trigrams(fields[0]) | trigrams(fields[1]) | trigrams(fields[2]):
+                # positions go in ascending, so every posting list stays sorted
+                postings[gram].append(pos)
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.prefix_keys = [keys[i] for i in order]
+        self.prefix_positions = [key_positions[i] for i in order]
+        self.exact: dict[str, list[int]] = dict(exact)
+        self.postings: dict[str, list[int]] = dict(postings)
+
+    def _prefix_matches(self, query: str) -> set[int]:
+        # every key starting with query sorts between query and query + the highest code point
+        lo = bisect_left(self.prefix_keys, query)
+        hi = bisect_left(self.prefix_keys, query + MAX_CHAR, lo)
+        return set(self.prefix_positions[lo:hi])
+
+    def _contains_matches(self, query: str, scored: set[int], need: int) -> list[int]:
+        """The first need positions (ascending) not already scored whose fields contain query."""
+        grams = trigrams(query)
+        if grams:
+            candidates = min((self.postings.get(gram, ()) for gram in grams), key=len)
+        else:
+            candidates = range(len(self.fields))
+        found = []
+        for pos in candidates:
+            if pos in scored:
+                continue
+            id_lower, name_lower, disamb_lower = self.fields[pos]
+            if query in id_lower or query in name_lower or query in disamb_lower:
+                found.append(pos)
+                if len(found) == need:
+                    break
+        return found
+
+    def _fuzzy_matches(self, query: str, scored: set[int]) -> dict[int, int]:
+        grams = trigrams(query)
+        if not grams:
+            return {}
+        lists = sorted((self.postings.get(gram, []) for gram in grams), key=len)
+        need = math.ceil(MIN_SIMILARITY * len(grams))
+        # a node holding need of the trigrams is in at least one of the len - need + 1 shortest lists,
+        # so those are counted in full and the longer ones only looked up for the candidates found
+        split = len(lists) - need + 1
+        shared = Counter()
+        for postings in lists[:split]:
+            shared.update(postings)
+        candidates = [pos for pos in shared if pos not in scored]
+        for postings in lists[split:]:
+            for pos in candidates:
+                i = bisect_left(postings, pos)
+                if i < len(postings) and postings[i] == pos:
+                    shared[pos] += 1
+        return {
+            pos: max(1, int(MAX_FUZZY_SCORE * shared[pos] / len(grams)))
+            for pos in candidates
+            if shared[pos] >= need
+        }
+
+    def search(self, query: str, limit: int = 10) -> list:
+        if not query.strip() or limit <= 0:
+            return []
+        query = query.lower()
+        # tier by tier, each contributing its lowest positions; a lower tier only matters while
+        # the ones above leave room in the top limit
+        exact = self.exact.get(query, [])
+        ranked = exact[:limit]
+        scored = set(exact)
+        if len(ranked) < limit:
+            prefix = self._prefix_matches(query) - scored
+            ranked += heapq.nsmallest(limit - len(ranked), prefix)
+            scored |= prefix
+        if len(ranked) < limit:
+            contains = self._contains_matches(query, scored, limit - len(ranked))
+            ranked += contains
+            scored.update(contains)
+        if len(ranked) < limit:
+            fuzzy = self._fuzzy_matches(query, scored)
+            ranked += [pos for pos, _ in heapq.nsmallest(limit - len(ranked), fuzzy.items(), key=lambda item: (-item[1], item[0]))]
+        return [self.nodes[pos] for pos in ranked]
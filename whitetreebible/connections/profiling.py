@@ -0,0 +1,403 @@
+"""
+Counters and timers for the build pipeline, switched on with a command's --profile flag.
+
+Instrumented code records into the shared `profiler`:
+
+    with profiler.timer("yaml.parse"):
+        data = yaml.load(...)
+
+While profiling is off (the default) timer() hands back one shared no-op context and nothing is
+recorded, and SqliteDB opens plain sqlite3 connections; loops that run per page check
+profiler.enabled first so they keep their unprofiled shape.
+
+--trace-sql switches on the `tracer` instead (or as well): every statement sqlite runs on a
+connection SqliteDB opens is reported through sqlite3's trace callback, aggregated by its
+normalized text with count, time and rows returned, and explained once to flag table scans.
+The report is printed when the process exits.
+"""
+import atexit
+import json
+import re
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Optional
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.profiler.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Profiler:
+    """Named stats of [count, total seconds, max seconds], recorded only while enabled."""
+    def __init__(self):
+        self.enabled = False
+        self.stats: dict[str, list] = {}
+        self.started = None
+
+    def enable(self):
+        self.enabled = True
+        self.stats = {}
+        self.started = time.perf_counter()
+
+    def disable(self):
+        self.enabled = False
+
+    def timer(self, name: str):
+        return _Timer(self, name) if self.enabled else _NULL_TIMER
+
+    def add(self, name: str, seconds: float, count: int = 1):
+        stat = self.stats.get(name)
+        if stat is None:
+            self.stats[name] = [count, seconds, seconds]
+        else:
+            stat[0] += count
+            stat[1] += seconds
+            if seconds > stat[2]:
+                stat[2] = seconds
+
+    def merge(self, stats: dict[str, list]):
+        """Fold in stats recorded elsewhere, e.g. returned by a worker process."""
+        for name, (count, total, longest) in stats.items():
+            stat = self.stats.setdefault(name, [0, 0.0, 0.0])
+            stat[0] += count
+            stat[1] += total
+            stat[2] = max(stat[2], longest)
+
+    def drain(self) -> dict[str, list]:
+        """Hand back the stats recorded so far and start again from empty."""
+        stats, self.stats = self.stats, {}
+        return stats
+
+    def report(self) -> dict:
+        wall = time.perf_counter() - self.started if self.started is not None else 0.0
+        return {
+            "wall_seconds": wall,
+            "stats": {
+                name: {"count": count, "total_seconds": total, "mean_ms": total / count * 1000 if count else 0.0, "max_ms": longest * 1000}
+                for name, (count, total, longest) in sorted(self.stats.items())
+            },
+        }
+
+    def format_table(self) -> str:
+        report = self.report()
+        wall = report["wall_seconds"]
+        headers = ["stat", "count", "total s", "mean ms", "max ms", "% wall"]
+        rows = [
+            [name, s["count"], f"{s['total_seconds']:.3f}", f"{s['mean_ms']:.3f}", f"{s['max_ms']:.3f}",
+             f"{s['total_seconds'] / wall * 100:.1f}" if wall else ""]
+            for name, s in report["stats"].items()
+        ]
+        rows.append(["wall", "", f"{wall:.3f}", "", "", ""])
+        widths = [max(len(str(x)) for x in col) for col in zip(headers, *rows)]
+        lines = ["  ".join(str(h).ljust(w) for h, w in zip(headers, widths)), "  ".join("-" * w for w in widths)]
+        lines += ["  ".join(str(x).ljust(w) for x, w in zip(row, widths)) for row in rows]
+        return "\n".join(lines)
+
+
+profiler = Profiler()
+
+
+# quoted strings and numbers (not digits inside identifiers like t0), then bound parameters
+SQL_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|(?<![\w.])\d+(?:\.\d+)?(?![\w.])|:\w+|\?\d*")
+SQL_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+SQL_SPACE_RE = re.compile(r"\s+")
+# statements EXPLAIN QUERY PLAN can say something useful about
+EXPLAINED_VERBS = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+
+@lru_cache(maxsize=4096)
+def normalize_sql(sql: str) -> str:
+    """
+    The statement with whitespace collapsed and every literal and parameter replaced by ?,
+    so runs of one statement with different values aggregate under one key. IN (?, ?, ...) lists
+    of any length become (?...).
+    """
+    sql = SQL_SPACE_RE.sub(" ", sql).strip()
+    sql = SQL_LITERAL_RE.sub("?", sql)
+    return SQL_LIST_RE.sub("(?...)", sql)
+
+
+def unindexed_scans(plan: list[str]) -> list[str]:
+    """The EXPLAIN QUERY PLAN lines that read a whole table: SCANs without an index, CTEs excluded."""
+    ctes = {line.split()[1] for line in plan if line.startswith(("MATERIALIZE ", "CO-ROUTINE "))}
+    return [
+        line for line in plan
+        if line.startswith("SCAN ") and "INDEX" not in line and line != "SCAN CONSTANT ROW" and line.split()[1] not in ctes
+    ]
+
+
+class QueryTracer:
+    """
+    Per normalized statement [count, seconds, rows returned] and its query plan.
+    Counts come from the trace callback, so they cover every statement sqlite runs, including the
+    ones behind raw cursors handed out by SqliteDB.conn, conn.commit() and each executemany row.
+    Time and rows are measured by the ProfiledCursor the statement ran on.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.explain = True
+        self.stats: dict[str, list] = {}
+        self.plans: dict[str, list[str]] = {}
+        # key of the statement sqlite started most recently, read back by the cursor that ran it
+        self.last = None
+        self._explaining = False
+
+    def enable(self, explain: bool = True):
+        self.enabled = True
+        self.explain = explain
+        self.stats = {}
+        self.plans = {}
+
+    def disable(self):
+        self.enabled = False
+
+    def on_statement(self, sql: str):
+        """sqlite3 trace callback."""
+        if self._explaining:
+            return
+        key = normalize_sql(sql)
+        stat = self.stats.get(key)
+        if stat is None:
+            self.stats[key] = [1, 0.0, 0]
+        else:
+            stat[0] += 1
+        self.last = key
+
+    def add(self, key: str, seconds: float, rows: int = 0):
+        stat = self.stats.setdefault(key, [0, 0.0, 0])
+        stat[1] += seconds
+        stat[2] += rows
+
+    def explain_once(self, conn: sqlite3.Connection, key: str, sql: str, parameters):
+        if not self.explain or key in self.plans:
+            return
+        self.plans[key] = []
+        if sql.lstrip().split(None, 1)[0].upper() not in EXPLAINED_VERBS:
+            return
+        self._explaining = True
+        try:
+            # the base class execute uses a plain cursor, so the plan is not timed as a statement of its own
+            rows = sqlite3.Connection.execute(conn, f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+        except sqlite3.Error:
+            return
+        finally:
+            self._explaining = False
+        self.plans[key] = [row[3] for row in rows]
+
+    def merge(self, traced: tuple[dict, dict]):
+        """Fold in what drain() returned elsewhere, e.g. in a worker process."""
+        stats, plans = traced
+        for key, (count, seconds, rows) in stats.items():
+            stat = self.stats.setdefault(key, [0, 0.0, 0])
+            stat[0] += count
+            stat[1] += seconds
+            stat[2] += rows
+        for key, plan in plans.items():
+            self.plans.setdefault(key, plan)
+
+    def drain(self) -> tuple[dict, dict]:
+        traced = (self.stats, self.plans)
+        self.stats, self.plans = {}, {}
+        return traced
+
+    def report(self) -> list[dict]:
+        """One entry per statement, the most total time first."""
+        entries = [
+            {"sql": key, "count": count, "total_seconds": seconds, "rows": rows, "unindexed": unindexed_scans(self.plans.get(key, []))}
+            for key, (count, seconds, rows) in self.stats.items()
+        ]
+        return sorted(entries, key=lambda e: (-e["total_seconds"], -e["count"], e["sql"]))
+
+    def format_table(self, limit: int = 25, width: int = 100) -> str:
+        entries = self.report()
+        headers = ["count", "total ms", "mean ms", "rows", "scan", "statement"]
+        rows = [
+            [e["count"], f"{e['total_seconds'] * 1000:.1f}", f"{e['total_seconds'] / e['count'] * 1000:.3f}" if e["count"] else "",
+             e["rows"], "SCAN" if e["unindexed"] else "", e["sql"] if len(e["sql"]) <= width else e["sql"][:width - 3] + "..."]
+            for e in entries[:limit]
+        ]
+        widths = [max(len(str(x)) for x in col) for col in zip(headers, *rows)]
+        lines = [f"{len(entries)} distinct statements, {sum(e['count'] for e in entries)} run"]
+        lines.append("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+        lines.append("  ".join("-" * w for w in widths))
+        lines += ["  ".join(str(x).ljust(w) for x, w in zip(row, widths)) for row in rows]
+        unindexed = [e for e in entries if e["unindexed"]]
+        if unindexed:
+            lines.append("\nstatements reading whole tables:")
+            for e in unindexed:
+                lines.append(f"  {e['sql']}\n    {'; '.join(e['unindexed'])}")
+        return "\n".join(lines)
+
+    def print_report(self):
+        if self.stats:
+            print(self.format_table(), file=sys.stderr)
+
+
+tracer = QueryTracer()
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """
+    Times statements as sql.execute and reading their rows as sql.fetch for the profiler,
+    and credits time and rows to the traced statement for the tracer.
+    """
+    _trace_key = None
+
+    def _record(self, name: str, seconds: float, rows: int = 0):
+        if profiler.enabled:
+            profiler.add(name, seconds)
+        if tracer.enabled and self._trace_key is not None:
+            tracer.add(self._trace_key, seconds, rows)
+
+    def _start(self):
+        if tracer.enabled:
+            tracer.last = None
+
+    def _traced(self, sql: str, parameters):
+        if tracer.enabled:
+            # the trace callback has seen the statement by now, unless sqlite rejected it
+            self._trace_key = tracer.last or normalize_sql(sql)
+            tracer.explain_once(self.connection, self._trace_key, sql, parameters)
+
+    def execute(self, sql, parameters=()):
+        self._start()
+        t0 = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            seconds = time.perf_counter() - t0
+            self._traced(sql, parameters)
+            self._record("sql.execute", seconds)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._start()
+        t0 = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            seconds = time.perf_counter() - t0
+            if tracer.enabled:
+                self._trace_key = tracer.last or normalize_sql(sql)
+            self._record("sql.executemany", seconds)
+
+    def fetchone(self):
+        t0 = time.perf_counter()
+        row = super().fetchone()
+        self._record("sql.fetch", time.perf_counter() - t0, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        t0 = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._record("sql.fetch", time.perf_counter() - t0, len(rows))
+        return rows
+
+    def fetchall(self):
+        t0 = time.perf_counter()
+        rows = super().fetchall()
+        self._record("sql.fetch", time.perf_counter() - t0, len(rows))
+        return rows
+
+    def __next__(self):
+        t0 = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._record("sql.fetch", time.perf_counter() - t0)
+            raise
+        self._record("sql.fetch", time.perf_counter() - t0, 1)
+        return row
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """
+    sqlite3.connect(..., factory=ProfiledConnection) makes every cursor a ProfiledCursor.
+    Connection.execute does not go through cursor(), so the shortcuts are routed explicitly.
+    """
+    def cursor(self, factory=None):
+        return super().cursor(factory or ProfiledCursor)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def connect(database: str, **kwargs) -> sqlite3.Connection:
+    """sqlite3.connect, returning a ProfiledConnection while profiling or tracing is on."""
+    if not profiler.enabled and not tracer.enabled:
+        return sqlite3.connect(database, **kwargs)
+    kwargs.setdefault("factory", ProfiledConnection)
+    conn = sqlite3.connect(database, **kwargs)
+    if tracer.enabled:
+        conn.set_trace_callback(tracer.on_statement)
+    return conn
+
+
+def add_profile_argument(parser):
+    parser.add_argument(
+        '--profile', nargs='?', const='-', metavar='JSON',
+        help='Time the run and print a summary table, or write it as json to JSON',
+    )
+    parser.add_argument(
+        '--trace-sql', action='store_true',
+        help='Aggregate every SQL statement run (count, time, rows, table scans) and print them at exit',
+    )
+
+
+def start_tracing(explain: bool = True):
+    """Trace the connections SqliteDB opens from now on and print the report when the process exits."""
+    tracer.enable(explain=explain)
+    atexit.register(tracer.print_report)
+
+
+@contextmanager
+def profiled(destination: Optional[str], trace_sql: bool = False):
+    """
+    Profile the enclosed block when destination is set: "-" prints the table to stderr,
+    anything else is the path the json report is written to. trace_sql starts the query tracer.
+    """
+    if trace_sql:
+        start_tracing()
+    if not destination:
+        yield
+        return
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        if destination == "-":
+            print(profiler.format_table(), file=sys.stderr)
+        else:
+            with open(destination, "w", encoding="utf-8") as f:
+                json.dump(profiler.report(), f, indent=2)
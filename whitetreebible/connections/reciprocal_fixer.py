@@ -18,14 +18,15 @@ from whitetreebible.connections.sqlite_db import SqliteDB
 from whitetreebible.connections.models.edge_type import EdgeType, RECIPROCALS
 from whitetreebible.connections.models.edge_model import EdgeModel
 from whitetreebible.connections.models.node_model import NodeModelCollection
-from whitetreebible.connections.settings import DB_PATH, DATA_DIR
+from whitetreebible.connections.profiling import add_profile_argument, profiled, profiler
+from whitetreebible.connections.settings import DB_PATH, DATA_DIR, NODE_CACHE_PATH
 
 
 class ReciprocalFixer:
-    def __init__(self, db: SqliteDB, data_dir: str = DATA_DIR):
+    def __init__(self, db: SqliteDB, data_dir: str = DATA_DIR, cache_path: str = None):
         self.db = db
         self.data_dir = data_dir
-        self.nodes_collection = NodeModelCollection(data_dir)
+        self.nodes_collection = NodeModelCollection(data_dir, cache_path=cache_path)
         self.missing_reciprocals = []
         self.yaml_updates = defaultdict(list)  # filename -> list of edges to add
         
@@ -38,7 +39,8 @@ class ReciprocalFixer:
         
         # Get all edges from database
         cur = self.db.conn.cursor()
-        cur.execute("SELECT source, target, type FROM edges")
+        # edges_named gives the type as its value string
+        cur.execute("SELECT source, target, type FROM edges_named")
         all_edges = cur.fetchall()
         
         # Convert to set for fast lookup
@@ -97,7 +99,7 @@ class ReciprocalFixer:
                 # Add reciprocal edge to database
                 self.db.conn.execute(
                     "INSERT INTO edges (source, target, type) VALUES (?, ?, ?)",
-                    (target, source, reciprocal_type.value)
+                    (target, source, reciprocal_type.code)
                 )
                 added_count += 1
                 log.debug(f"Added to DB: {target} {reciprocal_type.value} {source}")
@@ -145,7 +147,7 @@ class ReciprocalFixer:
                 
             try:
                 # Load existing YAML
-                with open(yaml_file, 'r', encoding='utf-8') as f:
+                with profiler.timer("yaml.parse"), open(yaml_file, 'r', encoding='utf-8') as f:
                     data = yaml.safe_load(f)
                 
                 if 'edges' not in data:
@@ -165,7 +167,7 @@ class ReciprocalFixer:
                         log.info(f"Adding to {yaml_file}: {edge_to_add['type']} -> {edge_to_add['target']}")
                 
                 # Write back to file
-                with open(yaml_file, 'w', encoding='utf-8') as f:
+                with profiler.timer("write.yaml"), open(yaml_file, 'w', encoding='utf-8') as f:
                     yaml.dump(data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
                 
                 updated_files += 1
@@ -223,39 +225,41 @@ def main():
     parser.add_argument('--check-only', action='store_true', help='Only check for missing reciprocals, do not fix')
     parser.add_argument('--no-yaml', action='store_true', help='Do not update YAML files')
     parser.add_argument('--no-db', action='store_true', help='Do not update database')
+    add_profile_argument(parser)
     
     args = parser.parse_args()
     
-    # Initialize database
-    db = SqliteDB(args.db_path)
+    with profiled(args.profile, trace_sql=args.trace_sql):
+        # Initialize database
+        db = SqliteDB(args.db_path)
     
-    try:
-        # Create fixer
-        fixer = ReciprocalFixer(db, args.data_dir)
+        try:
+            # Create fixer
+            fixer = ReciprocalFixer(db, args.data_dir, cache_path=NODE_CACHE_PATH)
         
-        if args.check_only:
-            # Just check and report
-            missing = fixer.find_missing_reciprocals()
-            if missing:
-                print(f"\nFound {len(missing)} missing reciprocal relationships:")
-                for source, target, orig_type, recip_type, refs in missing:
-                    print(f"  {source} {orig_type.value} {target} -> missing {target} {recip_type.value} {source}")
+            if args.check_only:
+                # Just check and report
+                missing = fixer.find_missing_reciprocals()
+                if missing:
+                    print(f"\nFound {len(missing)} missing reciprocal relationships:")
+                    for source, target, orig_type, recip_type, refs in missing:
+                        print(f"  {source} {orig_type.value} {target} -> missing {target} {recip_type.value} {source}")
+                else:
+                    print("No missing reciprocals found!")
             else:
-                print("No missing reciprocals found!")
-        else:
-            # Run the full fix
-            results = fixer.run(
-                update_yaml=not args.no_yaml,
-                update_db=not args.no_db
-            )
+                # Run the full fix
+                results = fixer.run(
+                    update_yaml=not args.no_yaml,
+                    update_db=not args.no_db
+                )
             
-            print(f"\nReciprocal Fixer Results:")
-            print(f"  Missing reciprocals found: {results['missing_found']}")
-            print(f"  Database edges added: {results['db_updated']}")
-            print(f"  YAML files updated: {results['yaml_files_updated']}")
+                print(f"\nReciprocal Fixer Results:")
+                print(f"  Missing reciprocals found: {results['missing_found']}")
+                print(f"  Database edges added: {results['db_updated']}")
+                print(f"  YAML files updated: {results['yaml_files_updated']}")
             
-    finally:
-        db.close()
+        finally:
+            db.close()
 
 
 if __name__ == "__main__":
@@ -4,5 +4,9 @@
 SUPPORTED_LANGS = ["en"]
 DB_PATH = "tmp/atlas.db"
 DATA_DIR = "data"
+# parsed YAML sidecar, see models/node_cache.py
+NODE_CACHE_PATH = "tmp/nodes.cache"
+# per page input digests for md_generator --incremental
+MD_MANIFEST_PATH = "tmp/md_manifest.json"
 
 # Add other global settings here as needed
@@ -1,13 +1,130 @@
 
-import sqlite3
 import os
-from typing import Optional, Callable, Any
+import sqlite3
+from contextlib import contextmanager
+from typing import Optional, Callable, Any, Iterable
+from whitetreebible.connections.logger import log
+from whitetreebible.connections.profiling import connect
 from whitetreebible.connections.models.node_model import NodeModel, NodeModelCollection
 from whitetreebible.connections.models.edge_model import EdgeModel
-from whitetreebible.connections.models.edge_type import EdgeType
+from whitetreebible.connections.models.edge_type import EdgeType, EDGE_TYPE_CODES, edge_type_of
+from whitetreebible.connections.node_search import EXACT_SCORE, PREFIX_SCORE, CONTAINS_SCORE
 from whitetreebible.connections.settings import SUPPORTED_LANGS, DB_PATH, DATA_DIR
 
 
+INDEXES = {
+    # covering indexes for traversals: lookups by node and optional type never touch the table
+    "idx_edges_source_type_target": "CREATE INDEX IF NOT EXISTS idx_edges_source_type_target ON edges (source, type, target)",
+    "idx_edges_target_type_source": "CREATE INDEX IF NOT EXISTS idx_edges_target_type_source ON edges (target, type, source)",
+}
+
+# keep node_search (the FTS5 name index over nodes) in step with every write to nodes; INSERT OR REPLACE
+# only fires the delete trigger with recursive_triggers on, which SqliteDB sets on every connection
+NODE_SEARCH_TRIGGERS = {
+    "nodes_search_insert": """
+        CREATE TRIGGER IF NOT EXISTS nodes_search_insert AFTER INSERT ON nodes BEGIN
+            INSERT INTO node_search (rowid, id, name, name_disambiguous) VALUES (new.rowid, new.id, new.name, new.name_disambiguous);
+        END
+    """,
+    "nodes_search_delete": """
+        CREATE TRIGGER IF NOT EXISTS nodes_search_delete AFTER DELETE ON nodes BEGIN
+            INSERT INTO node_search (node_search, rowid, id, name, name_disambiguous) VALUES ('delete', old.rowid, old.id, old.name, old.name_disambiguous);
+        END
+    """,
+    "nodes_search_update": """
+        CREATE TRIGGER IF NOT EXISTS nodes_search_update AFTER UPDATE ON nodes BEGIN
+            INSERT INTO node_search (node_search, rowid, id, name, name_disambiguous) VALUES ('delete', old.rowid, old.id, old.name, old.name_disambiguous);
+            INSERT INTO node_search (rowid, id, name, name_disambiguous) VALUES (new.rowid, new.id, new.name, new.name_disambiguous);
+        END
+    """,
+}
+# reindex node_search from the nodes table; also needed after a VACUUM, which may renumber the rowids of nodes
+NODE_SEARCH_REBUILD = "INSERT INTO node_search (node_search) VALUES ('rebuild')"
+
+
+def _check_edge_types_mapped(cur):
+    """Stop the v3 migration before it copies edges whose type string has no code, they would become NULL."""
+    unmapped = cur.execute(
+        "SELECT e.type, COUNT(*) FROM edges e LEFT JOIN edge_types t ON t.value = e.type WHERE t.code IS NULL GROUP BY e.type"
+    ).fetchall()
+    if unmapped:
+        cur.connection.rollback()
+        counts = ", ".join(f"{edge_type!r} ({count} edges)" for edge_type, count in unmapped)
+        raise ValueError(f"Cannot migrate edges to type codes, unknown edge types: {counts}. Fix or delete these edges first.")
+
+
+# (version, statements) applied in order; PRAGMA user_version records the last one applied.
+# A statement is SQL or a callable run with the cursor, e.g. a check that raises before data is lost.
+# Databases created before versioning report version 0 and are upgraded in place.
+SCHEMA_MIGRATIONS = [
+    (1, [
+        '''
+            CREATE TABLE IF NOT EXISTS nodes (
+                id TEXT,
+                type TEXT,
+                lang TEXT,
+                name TEXT,
+                name_disambiguous TEXT,
+                PRIMARY KEY (id, type, lang)
+            )
+        ''',
+        '''
+            CREATE TABLE IF NOT EXISTS edges (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT,
+                target TEXT,
+                type TEXT
+            )
+        ''',
+    ]),
+    (2, list(INDEXES.values())),
+    # edge types move to a lookup table and edges.type holds their integer code (EDGE_TYPE_CODES)
+    (3, [
+        '''
+            CREATE TABLE IF NOT EXISTS edge_types (
+                code INTEGER PRIMARY KEY,
+                value TEXT NOT NULL UNIQUE
+            )
+        ''',
+        *[
+            f"INSERT OR REPLACE INTO edge_types (code, value) VALUES ({int(code)}, '{edge_type.value}')"
+            for edge_type, code in EDGE_TYPE_CODES.items()
+        ],
+        _check_edge_types_mapped,
+        '''
+            CREATE TABLE edges_v3 (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT,
+                target TEXT,
+                type INTEGER REFERENCES edge_types (code)
+            )
+        ''',
+        "INSERT INTO edges_v3 (id, source, target, type) SELECT e.id, e.source, e.target, t.code FROM edges e JOIN edge_types t ON t.value = e.type",
+        "DROP TABLE edges",
+        "ALTER TABLE edges_v3 RENAME TO edges",
+        *INDEXES.values(),
+        # the edges as they read before, for ad hoc queries from the sqlite shell
+        '''
+            CREATE VIEW IF NOT EXISTS edges_named AS
+            SELECT e.id, e.source, e.target, t.value AS type FROM edges e JOIN edge_types t ON t.code = e.type
+        ''',
+    ]),
+    # trigram full text index over node ids and names for search_nodes, its content is read from nodes
+    (4, [
+        '''
+            CREATE VIRTUAL TABLE IF NOT EXISTS node_search USING fts5 (
+                id, name, name_disambiguous,
+                content = 'nodes',
+                tokenize = 'trigram'
+            )
+        ''',
+        *NODE_SEARCH_TRIGGERS.values(),
+        NODE_SEARCH_REBUILD,
+    ]),
+]
+SCHEMA_VERSION = SCHEMA_MIGRATIONS[-1][0]
+
+
 class SqliteDB:
     def __init__(
         self,
@@ -21,6 +138,9 @@ class SqliteDB:
         connection_factory: Optionally provide a factory to create a connection (for testing/mocking).
         """
         self.db_path = db_path or DB_PATH
+        self._in_bulk_load = False
+        self._name_cache = None
+        self._name_cache_changes = None
         if connection is not None:
             self.conn = connection
         else:
@@ -29,17 +149,125 @@ class SqliteDB:
             if connection_factory is not None:
                 self.conn = connection_factory(self.db_path)
             else:
-                self.conn = sqlite3.connect(self.db_path)
+                self.conn = connect(self.db_path)
+        self.conn.execute("PRAGMA recursive_triggers = ON")
         self._create_tables()
 
-    def traverse_edges(self, start_node_link: str, direction: str = "both", types: Optional[list[EdgeType]] = None, max_depth: Optional[int] = None) -> set[EdgeModel]:
+    @classmethod
+    def open_readonly(cls, db_path: Optional[str] = None) -> "SqliteDB":
+        """Open an existing, already migrated database without write access (e.g. for page generation)."""
+        db_path = db_path or DB_PATH
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"No database at {db_path}, run import_yml_to_db first")
+        conn = connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True)
+        return cls(db_path, connection=conn)
+
+    @classmethod
+    def open_in_memory(cls, db_path: Optional[str] = None) -> "SqliteDB":
+        """Copy an existing database into a private in-memory connection; writes are not persisted."""
+        db_path = db_path or DB_PATH
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"No database at {db_path}, run import_yml_to_db first")
+        source = connect(db_path)
+        conn = connect(":memory:")
+        try:
+            source.backup(conn)
+        finally:
+            source.close()
+        return cls(db_path, connection=conn)
+
+    @classmethod
+    def open_serialized(cls, data: bytes, db_path: Optional[str] = None) -> "SqliteDB":
+        """Private in-memory database holding a serialize() image, e.g. an in-memory db handed to another process."""
+        conn = connect(":memory:")
+        conn.deserialize(data)
+        return cls(db_path, connection=conn)
+
+    def database_file(self) -> Optional[str]:
+        """Path of the file behind the connection, None when the database only lives in memory."""
+        return self.conn.execute("PRAGMA database_list").fetchone()[2] or None
+
+    def serialize(self) -> bytes:
+        return self.conn.serialize()
+
+    def traverse_edges(self, start_node_link: str, direction: str = "both", types: Optional[list[EdgeType]] = None, max_depth: Optional[int] = None, mode: Optional[str] = None) -> set[EdgeModel]:
         """
         Recursively get all edges from or to start_id within a list of types up to max_depth.
         direction: 'out', 'in', or 'both'
         types: list of edge types to include (None or ['*'] for all)
         max_depth: int or None for infinite
+        mode: 'recursive' runs a single WITH RECURSIVE query, 'bfs' walks the graph in python one node at a time.
+            By default 'bfs' for max_depth 1 or less and 'recursive' otherwise: a depth 1 bfs issues 2 * (1 + degree)
+            indexed SELECTs for 'both', which still beat planning and running the CTE.
         Returns a set of (source, target, type)
         """
+        if types and "*" in types:
+            types = None
+        if mode is None:
+            mode = "bfs" if max_depth is not None and max_depth <= 1 else "recursive"
+        if mode == "bfs":
+            return self._traverse_edges_bfs(start_node_link, direction=direction, types=types, max_depth=max_depth)
+        return self._traverse_edges_recursive(start_node_link, direction=direction, types=types, max_depth=max_depth)
+
+    def _traverse_edges_recursive(self, start_node_link: str, direction: str = "both", types: Optional[list[EdgeType]] = None, max_depth: Optional[int] = None) -> set[EdgeModel]:
+        """
+        Same result as _traverse_edges_bfs, but the reachable node set and the edges around it
+        are resolved by sqlite in one statement instead of one or two SELECTs per visited node.
+        """
+        if max_depth is not None and max_depth < 0:
+            return set()
+        follow_out = direction in ("out", "both")
+        follow_in = direction in ("in", "both")
+        if not follow_out and not follow_in:
+            # nothing is traversed, matches the bfs which only marks the start node as visited
+            return set()
+
+        params: dict[str, Any] = {"start": start_node_link, "max_depth": max_depth}
+        type_filter = ""
+        if types:
+            types_arr = self._type_codes(types)
+            names = [f"t{i}" for i in range(len(types_arr))]
+            params.update(zip(names, types_arr))
+            type_filter = "AND e.type IN ({})".format(",".join(f":{n}" for n in names))
+
+        # one recursive step per followed direction, joined on the (source, type) / (target, type) indexes
+        if max_depth is None:
+            # without a depth the node alone is the recursion key, UNION stops at cycles
+            columns, seed, next_depth, depth_limit = "node", ":start", "", ""
+        else:
+            columns, seed, next_depth, depth_limit = "node, depth", ":start, 0", ", reach.depth + 1", "AND reach.depth < :max_depth"
+        steps = []
+        collect = []
+        if follow_out:
+            steps.append(f"SELECT e.target{next_depth} FROM reach JOIN edges e ON e.source = reach.node WHERE 1 {type_filter} {depth_limit}")
+            collect.append(f"SELECT e.source, e.target, e.type FROM edges e WHERE e.source IN (SELECT node FROM reach) {type_filter}")
+        if follow_in:
+            steps.append(f"SELECT e.source{next_depth} FROM reach JOIN edges e ON e.target = reach.node WHERE 1 {type_filter} {depth_limit}")
+            collect.append(f"SELECT e.source, e.target, e.type FROM edges e WHERE e.target IN (SELECT node FROM reach) {type_filter}")
+
+        # every edge touching a reached node in a followed direction, like the bfs collects them
+        q = """
+            WITH RECURSIVE reach({columns}) AS (
+                SELECT {seed}
+                UNION
+                {steps}
+            )
+            {collect}
+        """.format(
+            columns=columns,
+            seed=seed,
+            steps=" UNION ".join(steps),
+            collect=" UNION ".join(collect),
+        )
+        cur = self.conn.cursor()
+        cur.execute(q, params)
+        return {EdgeModel.from_row(row) for row in cur.fetchall()}
+
+    def _traverse_edges_bfs(self, start_node_link: str, direction: str = "both", types: Optional[list[EdgeType]] = None, max_depth: Optional[int] = None) -> set[EdgeModel]:
+        """
+        Breadth first walk issuing one query per visited node and direction.
+        Kept as the reference implementation for the recursive query.
+        """
         visited_edges = set()
         visited_nodes = set()
         collected_edges = set()
@@ -54,7 +282,7 @@ class SqliteDB:
             if direction in ("out", "both"):
                 cur = self.conn.cursor()
                 if types:
-                    types_arr = [t.value if isinstance(t, EdgeType) else t for t in types]
+                    types_arr = self._type_codes(types)
                     q = "SELECT source, target, type FROM edges WHERE source = ? AND type IN ({})".format(
                         ",".join(["?" for _ in types])
                     )
@@ -71,7 +299,7 @@ class SqliteDB:
             if direction in ("in", "both"):
                 cur = self.conn.cursor()
                 if types:
-                    types_arr = [t.value if isinstance(t, EdgeType) else t for t in types]
+                    types_arr = self._type_codes(types)
                     q = "SELECT source, target, type FROM edges WHERE target = ? AND type IN ({})".format(
                         ",".join(["?" for _ in types])
                     )
@@ -90,22 +318,82 @@ class SqliteDB:
     
     
     def select_name(self, node_type: str, node_id: str, lang: str = "en") -> Optional[str]:
-        cur = self.conn.cursor()
-        cur.execute(
-            "SELECT name FROM nodes WHERE id = ? AND type = ? AND lang = ?",
-            (node_id, node_type, lang)
-        )
-        row = cur.fetchone()
-        return row[0] if row else None
+        return self._names().get((node_type, node_id, lang), (None, None))[0]
     
     def select_name_disambiguous(self, node_type: str, node_id: str, lang: str = "en") -> Optional[str]:
+        return self._names().get((node_type, node_id, lang), (None, None))[1]
+
+    def select_names(self, links: Iterable[str], lang: str = "en") -> dict[str, tuple[Optional[str], Optional[str]]]:
+        """
+        Batched name lookup. links are 'type/id' strings; returns link -> (name, name_disambiguous),
+        with (None, None) for unknown nodes.
+        """
+        names = self._names()
+        result = {}
+        for link in links:
+            node_type, _, node_id = link.partition('/')
+            result[link] = names.get((node_type, node_id, lang), (None, None))
+        return result
+
+    def select_nodes(self, lang: str = "en") -> list[tuple[str, str, Optional[str], Optional[str]]]:
+        """Every node as (type, id, name, name_disambiguous) in lang, in one query."""
         cur = self.conn.cursor()
-        cur.execute(
-            "SELECT name_disambiguous FROM nodes WHERE id = ? AND type = ? AND lang = ?",
-            (node_id, node_type, lang)
-        )
-        row = cur.fetchone()
-        return row[0] if row else None
+        cur.execute("SELECT type, id, name, name_disambiguous FROM nodes WHERE lang = ?", (lang,))
+        return cur.fetchall()
+
+    def invalidate_name_cache(self):
+        self._name_cache = None
+
+    def _names(self) -> dict[tuple[str, str, str], tuple[Optional[str], Optional[str]]]:
+        """
+        Every (type, id, lang) -> (name, name_disambiguous), loaded with one query and kept until
+        something writes through this connection (total_changes moves) or invalidate_name_cache is called.
+        """
+        changes = getattr(self.conn, "total_changes", None)
+        if self._name_cache is None or changes != self._name_cache_changes:
+            cur = self.conn.cursor()
+            cur.execute("SELECT type, id, lang, name, name_disambiguous FROM nodes")
+            self._name_cache = {(t, i, l): (n, nd) for t, i, l, n, nd in cur.fetchall()}
+            self._name_cache_changes = changes
+        return self._name_cache
+
+    def search_nodes(self, query: str, type: Optional[str] = None, limit: int = 10, lang: str = "en") -> list[dict]:
+        """
+        Nodes whose id, name or name_disambiguous contain query (case insensitive), best first, as dicts
+        of id, type, name, name_disambiguous and score. Scores and order follow node_search.linear_search:
+        EXACT_SCORE for an exact id or name, PREFIX_SCORE when a field starts with query, CONTAINS_SCORE otherwise,
+        ties by name. Queries of three or more characters go through the node_search trigram index,
+        shorter ones (which have no trigram) scan the nodes table.
+        type: only nodes of this type
+        """
+        # blank queries find nothing, other spaces count like any character, as in linear_search
+        if not query.strip() or limit <= 0:
+            return []
+        params = {"query": query.lower(), "type": type, "lang": lang, "limit": limit}
+        if len(query) >= 3:
+            # a quoted FTS5 string matches the query as a substring of any column, whatever it contains
+            params["match"] = '"' + query.replace('"', '""') + '"'
+            source = "node_search s JOIN nodes n ON n.rowid = s.rowid WHERE node_search MATCH :match"
+        else:
+            source = """nodes n WHERE (instr(lower(n.id), :query) OR instr(lower(n.name), :query)
+                OR instr(lower(n.name_disambiguous), :query))"""
+        cur = self.conn.cursor()
+        cur.execute(f"""
+            SELECT n.id, n.type, n.name, n.name_disambiguous,
+                CASE
+                    WHEN lower(n.id) = :query OR lower(n.name) = :query THEN {EXACT_SCORE}
+                    WHEN substr(lower(n.id), 1, length(:query)) = :query
+                        OR substr(lower(n.name), 1, length(:query)) = :query
+                        OR substr(lower(n.name_disambiguous), 1, length(:query)) = :query THEN {PREFIX_SCORE}
+                    ELSE {CONTAINS_SCORE}
+                END AS score
+            FROM {source}
+                AND n.lang = :lang AND (:type IS NULL OR n.type = :type)
+            ORDER BY score DESC, lower(n.name), n.rowid
+            LIMIT :limit
+        """, params)
+        columns = [d[0] for d in cur.description]
+        return [dict(zip(columns, row)) for row in cur.fetchall()]
 
     def select_edges(self, node_id: str) -> list:
         cur = self.conn.cursor()
@@ -116,41 +404,151 @@ class SqliteDB:
         return cur.fetchall()
 
     def _create_tables(self):
+        """Bring the schema up to SCHEMA_VERSION, running only the migrations this db has not seen yet."""
         cur = self.conn.cursor()
-        cur.execute('''
-            CREATE TABLE IF NOT EXISTS nodes (
-                id TEXT,
-                type TEXT,
-                lang TEXT,
-                name TEXT,
-                name_disambiguous TEXT,
-                PRIMARY KEY (id, type, lang)
-            )
-        ''')
-        cur.execute('''
-            CREATE TABLE IF NOT EXISTS edges (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                source TEXT,
-                target TEXT,
-                type TEXT
-            )
-        ''')
+        version = cur.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            self._sync_edge_types(cur)
+            self._restore_bulk_load_drops(cur)
+            return
+        for target_version, statements in SCHEMA_MIGRATIONS:
+            if target_version <= version:
+                continue
+            for statement in statements:
+                if callable(statement):
+                    statement(cur)
+                else:
+                    cur.execute(statement)
+            # PRAGMA does not accept bound parameters
+            cur.execute(f"PRAGMA user_version = {int(target_version)}")
         self.conn.commit()
+        log.debug(f"Migrated {self.db_path} from schema version {version} to {SCHEMA_VERSION}.")
+
+    def _restore_bulk_load_drops(self, cur):
+        """
+        Recreate the indexes and node_search triggers a bulk_load drops, when a killed import left them dropped;
+        without its triggers node_search would silently stop following the nodes table.
+        """
+        present = {name for (name,) in cur.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')")}
+        missing = {name: statement for name, statement in {**INDEXES, **NODE_SEARCH_TRIGGERS}.items() if name not in present}
+        if not missing:
+            return
+        log.warning(f"Restoring {sorted(missing)} in {self.db_path}, an import did not finish.")
+        try:
+            for statement in missing.values():
+                cur.execute(statement)
+            if missing.keys() & NODE_SEARCH_TRIGGERS.keys():
+                cur.execute(NODE_SEARCH_REBUILD)
+            self.conn.commit()
+        except sqlite3.OperationalError as e:
+            log.warning(f"Cannot restore them on this connection: {e}")
+
+    def _sync_edge_types(self, cur):
+        """
+        Add the edge_types rows of EdgeType members added since the db was migrated, the v3 migration only
+        wrote the codes known then and edges_named would drop the edges of a type without a row.
+        """
+        known = {code for (code,) in cur.execute("SELECT code FROM edge_types")}
+        missing = [(code, edge_type.value) for edge_type, code in EDGE_TYPE_CODES.items() if code not in known]
+        if not missing:
+            return
+        try:
+            cur.executemany("INSERT OR IGNORE INTO edge_types (code, value) VALUES (?, ?)", missing)
+            self.conn.commit()
+        except sqlite3.OperationalError as e:
+            # a read only connection cannot add them, its edges_named view misses the edges of these types
+            log.warning(f"Cannot add edge types {[value for _, value in missing]} to {self.db_path}: {e}")
 
     def insert_node(self, node: NodeModel, lang="en"):
-        name = node.name.get(lang, next(iter(node.name.values()), node.id))
         self.conn.execute(
             "INSERT OR REPLACE INTO nodes (id, type, lang, name, name_disambiguous) VALUES (?, ?, ?, ?, ?)",
-            (node.id, node.type, lang, name, node.name_disambiguous.get(lang))
+            self._node_row(node, lang)
         )
-        self.conn.commit()
+        self.invalidate_name_cache()
+        self._commit()
 
     def insert_edge(self, source_type: str, source_id: str, edge: EdgeModel):
         self.conn.execute(
             "INSERT INTO edges (source, target, type) VALUES (?, ?, ?)",
-            (f"{source_type}/{source_id}", edge.target, edge.type.value)
+            self._edge_row(source_type, source_id, edge)
         )
-        self.conn.commit()
+        self._commit()
+
+    def insert_nodes_many(self, nodes: Iterable[NodeModel], lang="en") -> int:
+        """Insert many nodes with one executemany, committed once. Returns the number of rows written."""
+        cur = self.conn.executemany(
+            "INSERT OR REPLACE INTO nodes (id, type, lang, name, name_disambiguous) VALUES (?, ?, ?, ?, ?)",
+            (self._node_row(node, lang) for node in nodes)
+        )
+        self.invalidate_name_cache()
+        self._commit()
+        return cur.rowcount
+
+    def insert_edges_many(self, edges: Iterable[tuple[str, str, EdgeModel]]) -> int:
+        """
+        Insert many edges with one executemany, committed once. Returns the number of rows written.
+        edges: iterable of (source_type, source_id, edge), the same arguments insert_edge takes
+        """
+        cur = self.conn.executemany(
+            "INSERT INTO edges (source, target, type) VALUES (?, ?, ?)",
+            (self._edge_row(source_type, source_id, edge) for source_type, source_id, edge in edges)
+        )
+        self._commit()
+        return cur.rowcount
+
+    @contextmanager
+    def bulk_load(self):
+        """
+        Import mode for loading a whole corpus: relaxes durability PRAGMAs, drops the edge indexes and
+        the node_search triggers, and holds every insert inside a single transaction. On exit the transaction
+        is committed (or rolled back on error), the indexes and node_search are rebuilt once and the PRAGMAs are restored.
+        """
+        journal_mode = self.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        synchronous = self.conn.execute("PRAGMA synchronous").fetchone()[0]
+        self.conn.execute("PRAGMA journal_mode = MEMORY")
+        self.conn.execute("PRAGMA synchronous = OFF")
+        # the drops belong to the transaction, a rollback brings the indexes and triggers back
+        self.conn.execute("BEGIN")
+        for name in INDEXES:
+            self.conn.execute(f"DROP INDEX IF EXISTS {name}")
+        for name in NODE_SEARCH_TRIGGERS:
+            self.conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        self._in_bulk_load = True
+        try:
+            yield self
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        finally:
+            self._in_bulk_load = False
+            for statement in INDEXES.values():
+                self.conn.execute(statement)
+            for statement in NODE_SEARCH_TRIGGERS.values():
+                self.conn.execute(statement)
+            self.conn.execute(NODE_SEARCH_REBUILD)
+            self.conn.commit()
+            self.conn.execute(f"PRAGMA synchronous = {int(synchronous)}")
+            self.conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+
+    def _commit(self):
+        # inside bulk_load the single commit happens when the block exits
+        if not self._in_bulk_load:
+            self.conn.commit()
+
+    @staticmethod
+    def _node_row(node: NodeModel, lang: str) -> tuple:
+        name = node.name.get(lang, next(iter(node.name.values()), node.id))
+        return (node.id, node.type, lang, name, node.name_disambiguous.get(lang))
+
+    @staticmethod
+    def _edge_row(source_type: str, source_id: str, edge: EdgeModel) -> tuple:
+        return (f"{source_type}/{source_id}", edge.target, EDGE_TYPE_CODES[edge.type])
+
+    @staticmethod
+    def _type_codes(types) -> list[int]:
+        """edges.type codes for a list of EdgeType members or value strings."""
+        return [EDGE_TYPE_CODES[edge_type_of(t)] for t in types]
 
     def close(self):
         self.conn.close()
@@ -160,9 +558,9 @@ if __name__ == "__main__":
     # Example usage: collect all nodes/edges and insert into DB.. this is now done in import_yaml.py
     collector = NodeModelCollection(DATA_DIR)
     db = SqliteDB(DB_PATH)
-    for node in collector.get_nodes():
+    nodes = collector.get_nodes()
+    with db.bulk_load():
         for lang in SUPPORTED_LANGS:
-            db.insert_node(node, lang=lang)
-        for edge in node.edges:
-            db.insert_edge(node.type, node.id, edge)
+            db.insert_nodes_many(nodes, lang=lang)
+        db.insert_edges_many((node.type, node.id, edge) for node in nodes for edge in node.edges)
     db.close()